@@ -0,0 +1,13 @@
+"""Benchmarks for the Phase 1 task service.
+
+Run a benchmark module from the Phase 1 directory, for example::
+
+    python -m benchmarks.memory
+"""
+
+import os
+import sys
+
+# Benchmarks import the application the same way the tests do.
+_src_path = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.insert(0, os.path.abspath(_src_path))
@@ -0,0 +1,142 @@
+"""Multi-threaded throughput benchmark for ConcurrentTaskService.
+
+Each thread runs a mixed workload (adds, reads, updates, toggles and an
+occasional snapshot) against one shared service. Throughput is reported
+for 1 to N threads. On a free-threaded CPython build (``python3.13t`` with
+the GIL disabled) the sharded locks let it scale with cores; with the GIL
+it mostly shows the locking overhead.
+
+A second table runs write-only threads (updates and toggles) with and
+without one extra thread polling ``get_all`` in a loop, which shows what
+snapshots cost writers: each snapshot makes the next write to every shard
+copy it.
+
+Usage::
+
+    python -m benchmarks.concurrency [--threads 1 2 4 8] [--ops 50000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+from services.concurrent_task_service import ConcurrentTaskService
+
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+PRELOAD = 10_000
+
+
+def gil_status() -> str:
+    """Describe whether the running interpreter has the GIL enabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return "enabled (no free-threading support)"
+    return "enabled" if is_gil_enabled() else "disabled (free-threaded)"
+
+
+def worker(service: ConcurrentTaskService, ops: int, seed: int) -> None:
+    """Run ``ops`` mixed operations against the service."""
+    rng = random.Random(seed)
+    for i in range(ops):
+        roll = rng.random()
+        task_id = rng.randrange(1, PRELOAD + 1)
+        if roll < 0.30:
+            service.add(f"Task {seed}-{i}")
+        elif roll < 0.70:
+            service.get(task_id)
+        elif roll < 0.85:
+            service.update(task_id, description=f"Edit {i}")
+        elif roll < 0.9995:
+            service.toggle_complete(task_id)
+        else:
+            service.get_all()
+
+
+def writer(service: ConcurrentTaskService, ops: int, seed: int) -> None:
+    """Run ``ops`` updates and toggles against the service."""
+    rng = random.Random(seed)
+    for i in range(ops):
+        task_id = rng.randrange(1, PRELOAD + 1)
+        if i % 2:
+            service.update(task_id, description=f"Edit {i}")
+        else:
+            service.toggle_complete(task_id)
+
+
+def measure(
+    threads: int,
+    ops_per_thread: int,
+    shards: int,
+    work=worker,
+    polling_reader: bool = False
+) -> float:
+    """Return operations per second for ``threads`` concurrent workers.
+
+    With ``polling_reader``, one more thread calls ``get_all`` until the
+    workers finish; its reads are not counted.
+    """
+    service = ConcurrentTaskService(shards=shards)
+    for i in range(PRELOAD):
+        service.add(f"Preloaded {i}")
+
+    barrier = threading.Barrier(threads + 1 + polling_reader)
+    done = threading.Event()
+
+    def run(seed: int) -> None:
+        barrier.wait()
+        work(service, ops_per_thread, seed)
+
+    def poll() -> None:
+        barrier.wait()
+        while not done.is_set():
+            service.get_all()
+
+    pool = [threading.Thread(target=run, args=(seed,)) for seed in range(threads)]
+    reader = threading.Thread(target=poll) if polling_reader else None
+    for thread in pool + ([reader] if reader else []):
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    if reader:
+        reader.join()
+    return threads * ops_per_thread / elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print a scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=DEFAULT_THREADS)
+    parser.add_argument("--ops", type=int, default=50_000, help="Operations per thread")
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    print(f"Python {sys.version.split()[0]}, GIL {gil_status()}, {os.cpu_count()} CPUs")
+    print(f"{'Threads':>8} {'Ops/sec':>12} {'Speed-up':>9}")
+    print("-" * 31)
+    baseline = None
+    for threads in args.threads:
+        rate = measure(threads, args.ops, args.shards)
+        baseline = baseline or rate
+        print(f"{threads:>8} {rate:>12,.0f} {rate / baseline:>8.2f}x")
+
+    print()
+    print("Writers with a reader polling get_all")
+    print(f"{'Writers':>8} {'No reader':>12} {'Reader':>12} {'Ratio':>7}")
+    print("-" * 42)
+    for threads in args.threads:
+        alone = measure(threads, args.ops, args.shards, work=writer)
+        polled = measure(threads, args.ops, args.shards, work=writer, polling_reader=True)
+        print(f"{threads:>8} {alone:>12,.0f} {polled:>12,.0f} {polled / alone:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""Memory benchmark: dict-of-dataclasses store vs ColumnarTaskStore.
+
+Usage::
+
+    python -m benchmarks.memory [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable, MutableMapping
+
+from models.task import Task
+from services.task_service import TaskService
+from storage.columnar import ColumnarTaskStore
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+STORES: dict[str, Callable[[], MutableMapping[int, Task]]] = {
+    "dict": dict,
+    "columnar": ColumnarTaskStore,
+}
+
+
+def measure(store_factory: Callable[[], MutableMapping[int, Task]], count: int) -> int:
+    """Return the bytes retained by a service holding ``count`` tasks."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        service = TaskService(store=store_factory())
+        for i in range(count):
+            # Every third task gets a description, like a typical list.
+            service.add(f"Task number {i}", "Some details" if i % 3 == 0 else "")
+        gc.collect()
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del service
+    return retained
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args(argv)
+
+    print(f"{'Tasks':>10} {'Store':<10} {'Total MiB':>10} {'Bytes/task':>11}")
+    print("-" * 44)
+    for count in args.sizes:
+        for name, factory in STORES.items():
+            retained = measure(factory, count)
+            print(
+                f"{count:>10,} {name:<10} {retained / 2**20:>10.1f} "
+                f"{retained / count:>11.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Start-up and per-command latency benchmark for the todo CLI.
+
+Compares three ways of running the same command many times:
+
+* ``cold`` - a fresh interpreter per command running the full CLI.
+* ``client`` - a fresh interpreter per command forwarding to a daemon
+  through the thin client (``$TODO_SOCKET``).
+* ``socket`` - one persistent DaemonClient connection; the cost of a
+  command is a socket round trip.
+
+It also reports ``-X importtime`` totals for the full CLI and for the thin
+client path.
+
+Usage::
+
+    python -m benchmarks.startup [--runs 20] [--round-trips 2000]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from cli.client import DaemonClient
+
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _env(socket_path: str | None = None) -> dict[str, str]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = SRC_DIR
+    env.pop("TODO_DATA_DIR", None)
+    env.pop("TODO_SOCKET", None)
+    if socket_path:
+        env["TODO_SOCKET"] = socket_path
+    return env
+
+
+def import_time_ms(module: str) -> float:
+    """Return the cumulative ``-X importtime`` cost of importing a module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=SRC_DIR, env=_env(), check=True
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(4) == module and not match.group(3).strip(" "):
+            return int(match.group(2)) / 1000
+    return 0.0
+
+
+def time_processes(argv: list[str], runs: int, socket_path: str | None = None) -> float:
+    """Return mean wall-clock milliseconds for ``todo <argv>`` in a new process."""
+    command = [sys.executable, "-m", "cli.main", *argv]
+    env = _env(socket_path)
+    started = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, capture_output=True, cwd=SRC_DIR, env=env, check=True)
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def time_round_trips(socket_path: str, argv: list[str], count: int) -> float:
+    """Return mean milliseconds per command over one persistent connection."""
+    with DaemonClient(socket_path) as client:
+        started = time.perf_counter()
+        for _ in range(count):
+            client.run(argv)
+        return (time.perf_counter() - started) / count * 1000
+
+
+def _start_daemon(socket_path: str) -> subprocess.Popen:
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "cli.main", "--daemon", "--socket", socket_path],
+        stdout=subprocess.PIPE, cwd=SRC_DIR, env=_env(), text=True
+    )
+    daemon.stdout.readline()  # "Todo daemon listening on ..."
+    return daemon
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Processes per mode")
+    parser.add_argument("--round-trips", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print("Import cost (-X importtime, cumulative):")
+    for module in ("cli.commands", "cli.client"):
+        print(f"  {module:<14} {import_time_ms(module):8.1f} ms")
+
+    command = ["list", "--status", "complete"]
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "todo.sock")
+        daemon = _start_daemon(socket_path)
+        try:
+            results = {
+                "cold": time_processes(command, args.runs),
+                "client": time_processes(command, args.runs, socket_path),
+                "socket": time_round_trips(socket_path, command, args.round_trips),
+            }
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"\nPer-command latency for 'todo {' '.join(command)}':")
+    for mode, millis in results.items():
+        print(f"  {mode:<14} {millis:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,284 @@
+"""Scaling benchmark for TaskService operations and CLI latency.
+
+For each task count the service is preloaded, then every operation is
+timed individually over a sample of calls, keeping the best of
+``--repeat`` rounds:
+
+* ``add``, ``get``, ``update``, ``toggle``, ``delete`` - single-task calls
+  on random IDs.
+* ``get_all`` - a full listing (fewer samples, since it is O(n)).
+* ``cli`` - ``todo --data-dir <dir> add ...`` in a fresh interpreter,
+  including journal recovery of the preloaded tasks.
+
+Results (ops/sec, p50/p99 latency, tracemalloc peak of the preload) are
+printed, optionally written as JSON, and compared with a baseline JSON file
+from an earlier run: ``benchmarks/baseline.json``, which is committed,
+unless ``--baseline`` names another or ``--no-baseline`` is given. Any
+operation whose ops/sec drops, or whose peak memory grows, by more than
+``--threshold`` percent counts as a regression and makes the command exit
+with status 1.
+
+Timings depend on the machine. When the baseline was recorded on another
+machine or Python version, a warning is printed; re-record it with
+``--output benchmarks/baseline.json`` before comparing changes.
+
+Usage::
+
+    python -m benchmarks.suite [--sizes 1000 10000 100000 1000000]
+        [--output results.json] [--baseline PATH | --no-baseline] [--threshold 10]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from services.task_service import TaskService
+from storage.journal import TaskJournal
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted samples."""
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples_ns: list[int]) -> dict[str, float]:
+    """Turn per-call timings into throughput and latency figures."""
+    samples = sorted(samples_ns)
+    total = sum(samples)
+    return {
+        "samples": len(samples),
+        "ops_per_sec": len(samples) / (total / 1e9) if total else 0.0,
+        "p50_us": percentile(samples, 0.50) / 1000,
+        "p99_us": percentile(samples, 0.99) / 1000,
+    }
+
+
+def preload(count: int) -> TaskService:
+    """Return a service holding ``count`` tasks."""
+    service = TaskService()
+    service.add_many(
+        (f"Task number {i}", "Some details" if i % 3 == 0 else "")
+        for i in range(count)
+    )
+    return service
+
+
+def preload_peak(count: int) -> int:
+    """Return the tracemalloc peak while building a ``count``-task service."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        service = preload(count)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del service
+    return peak
+
+
+def time_calls(call: Callable[[int], object], args: list[int]) -> list[int]:
+    """Time ``call(arg)`` once per argument, in nanoseconds.
+
+    The garbage collector is paused while timing, as ``timeit`` does, so
+    collection pauses triggered by earlier work do not land in the samples.
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for arg in args:
+            started = clock()
+            call(arg)
+            samples.append(clock() - started)
+    finally:
+        gc.enable()
+    return samples
+
+
+def bench_service(count: int, samples: int, seed: int) -> dict[str, dict]:
+    """Time every TaskService operation against ``count`` preloaded tasks."""
+    rng = random.Random(seed)
+    service = preload(count)
+    picks = min(samples, count)
+    ids = rng.sample(range(1, count + 1), picks)
+
+    results = {
+        "get": time_calls(service.get, ids),
+        "update": time_calls(lambda task_id: service.update(task_id, description="Edited"), ids),
+        "toggle": time_calls(service.toggle_complete, ids),
+        "get_all": time_calls(lambda _: service.get_all(), range(max(3, min(50, 1_000_000 // count)))),
+        "add": time_calls(lambda i: service.add(f"Added {i}"), range(picks)),
+        "delete": time_calls(service.delete, ids),
+    }
+    return {op: summarize(timings) for op, timings in results.items()}
+
+
+def bench_cli(count: int, runs: int) -> dict[str, float]:
+    """Time ``todo add`` in a fresh process against ``count`` persisted tasks."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = SRC_DIR
+    env.pop("TODO_DATA_DIR", None)
+    env.pop("TODO_SOCKET", None)
+    with tempfile.TemporaryDirectory() as data_dir:
+        journal = TaskJournal(data_dir)
+        service = TaskService(journal=journal)
+        service.add_many((f"Task number {i}", "") for i in range(count))
+        journal.snapshot(service.get_all(), count + 1)
+        service.close()
+        del service
+
+        command = [sys.executable, "-m", "cli.main", "--data-dir", data_dir, "add"]
+        samples = []
+        for run in range(runs):
+            started = time.perf_counter_ns()
+            subprocess.run(
+                [*command, f"CLI task {run}"],
+                capture_output=True, cwd=SRC_DIR, env=env, check=True
+            )
+            samples.append(time.perf_counter_ns() - started)
+    return summarize(samples)
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    """Run every benchmark and return the JSON-ready results."""
+    results: dict[str, dict] = {}
+    # An untimed pass warms up caches and the allocator so the first size
+    # is not penalised.
+    bench_service(1_000, 1_000, args.seed)
+    for count in args.sizes:
+        print(f"Benchmarking {count:,} tasks...", file=sys.stderr)
+        # Keep each operation's best round, as timeit does, to damp noise
+        # from other processes.
+        for round_no in range(args.repeat):
+            for op, figures in bench_service(count, args.samples, args.seed + round_no).items():
+                name = f"{op}@{count}"
+                if name not in results or figures["ops_per_sec"] > results[name]["ops_per_sec"]:
+                    results[name] = figures
+        if count <= args.cli_max_size:
+            results[f"cli@{count}"] = bench_cli(count, args.cli_runs)
+        if not args.no_memory:
+            results[f"memory@{count}"] = {"peak_bytes": preload_peak(count)}
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of each regression beyond ``threshold`` percent."""
+    regressions = []
+    limit = threshold / 100
+    for name, figures in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        if "ops_per_sec" in figures and before.get("ops_per_sec"):
+            change = figures["ops_per_sec"] / before["ops_per_sec"] - 1
+            if change < -limit:
+                regressions.append(f"{name}: ops/sec {change:+.1%}")
+        if "peak_bytes" in figures and before.get("peak_bytes"):
+            change = figures["peak_bytes"] / before["peak_bytes"] - 1
+            if change > limit:
+                regressions.append(f"{name}: peak memory {change:+.1%}")
+    return regressions
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    """Print the results as a table, with the change from the baseline."""
+    before_all = baseline["results"] if baseline else {}
+    print(f"{'Benchmark':<18} {'Ops/sec':>12} {'p50 us':>10} {'p99 us':>10} {'vs base':>9}")
+    print("-" * 63)
+    for name, figures in report["results"].items():
+        before = before_all.get(name, {})
+        if "peak_bytes" in figures:
+            delta = ""
+            if before.get("peak_bytes"):
+                delta = f"{figures['peak_bytes'] / before['peak_bytes'] - 1:+.1%}"
+            print(f"{name:<18} {figures['peak_bytes'] / 2**20:>10.1f} MiB peak {delta:>20}")
+            continue
+        delta = ""
+        if before.get("ops_per_sec"):
+            delta = f"{figures['ops_per_sec'] / before['ops_per_sec'] - 1:+.1%}"
+        print(
+            f"{name:<18} {figures['ops_per_sec']:>12,.0f} {figures['p50_us']:>10.1f} "
+            f"{figures['p99_us']:>10.1f} {delta:>9}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite, save and compare results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--samples", type=int, default=10_000, help="Timed calls per operation")
+    parser.add_argument("--repeat", type=int, default=3, help="Rounds per size; the best is kept")
+    parser.add_argument("--cli-runs", type=int, default=5)
+    parser.add_argument(
+        "--cli-max-size", type=int, default=100_000,
+        help="Skip CLI timing above this many tasks"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write results to this JSON file")
+    parser.add_argument(
+        "--baseline", "-b", default=DEFAULT_BASELINE,
+        help="Compare with this earlier JSON output (default: benchmarks/baseline.json)"
+    )
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the comparison")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0,
+        help="Percent change that counts as a regression"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if not args.no_baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        recorded_on = (baseline.get("python"), baseline.get("platform"))
+        if recorded_on != (sys.version.split()[0], platform.platform()):
+            print(
+                f"Warning: the baseline was recorded with Python {recorded_on[0]} on "
+                f"{recorded_on[1]}; re-record it on this machine for a fair comparison",
+                file=sys.stderr
+            )
+
+    report = run_suite(args)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+            stream.write("\n")
+
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions over {args.threshold:g}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""Thin client for the todo daemon.
+
+Only the standard library modules needed to talk to the socket are
+imported, so forwarding a command costs little more than interpreter
+start-up plus one socket round trip.
+
+The wire protocol is one JSON object per line in each direction::
+
+    -> {"argv": ["add", "Buy milk"], "cwd": "/home/me"}
+    <- {"code": 0, "stdout": "Created task #1: ...", "stderr": ""}
+"""
+
+import json
+import os
+import socket
+import sys
+
+
+class DaemonClient:
+    """A connection to a todo daemon that can run many commands.
+
+    Scripts that issue many commands should keep one client open; each
+    command then costs a single socket round trip.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        """Connect to the daemon listening on ``socket_path``.
+
+        Raises:
+            OSError: If no daemon is listening there.
+        """
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(socket_path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("r", encoding="utf-8")
+
+    def run(self, argv: list[str]) -> tuple[int, str, str]:
+        """Run one command in the daemon.
+
+        Returns:
+            A tuple of (exit code, stdout text, stderr text).
+
+        Raises:
+            ConnectionError: If the daemon closed the connection or sent
+                a reply that is not a valid response.
+            OSError: If the socket failed otherwise.
+        """
+        request = {"argv": argv, "cwd": os.getcwd()}
+        self._sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        try:
+            response = json.loads(line)
+            return response["code"], response["stdout"], response["stderr"]
+        except (ValueError, TypeError, KeyError):
+            raise ConnectionError("Daemon sent an invalid reply") from None
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def forward(socket_path: str, argv: list[str]) -> int | None:
+    """Run a command in the daemon and relay its output.
+
+    If the connection is lost once the command has been sent, it is
+    reported as an error rather than run again in-process: the daemon may
+    already have run it.
+
+    Returns:
+        The command's exit code, or None if no daemon is reachable (the
+        caller should then run the command in-process).
+    """
+    try:
+        client = DaemonClient(socket_path)
+    except OSError:
+        return None
+
+    with client:
+        try:
+            code, stdout, stderr = client.run(argv)
+        except OSError as e:
+            sys.stderr.write(f"Error: daemon connection lost: {e}\n")
+            return 1
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return code
@@ -0,0 +1,376 @@
+"""Argument parsing and command handlers for the Todo CLI.
+
+``cli.main`` is the entry point; it loads this module only when a command
+runs in-process rather than being forwarded to a daemon.
+"""
+
+import argparse
+import os
+import shlex
+import sys
+import time
+from services.task_service import TaskService
+from models.task import Task, TaskStatus
+from storage.journal import TaskJournal
+from cli.main import global_options
+from cli.transfer import FORMATS, detect_format, read_records, to_items, write_records
+
+
+# Global service instance for CLI session
+_service = TaskService()
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="todo",
+        description="CLI In-Memory Todo Application"
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.environ.get("TODO_DATA_DIR"),
+        help="Persist tasks in this directory (default: $TODO_DATA_DIR, "
+             "or in-memory only)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep one task service alive and serve commands on --socket"
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("TODO_SOCKET"),
+        help="Unix socket for --daemon; when set in $TODO_SOCKET, commands "
+             "are forwarded to the running daemon"
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    # Add command
+    add_parser = subparsers.add_parser("add", help="Add a new task")
+    add_parser.add_argument("title", help="Task title")
+    add_parser.add_argument("--desc", "-d", default="", help="Task description")
+    
+    # List command
+    list_parser = subparsers.add_parser("list", help="List all tasks")
+    list_parser.add_argument(
+        "--status", "-s",
+        choices=[status.value for status in TaskStatus],
+        help="Only list tasks with this status"
+    )
+    
+    # Search command
+    search_parser = subparsers.add_parser(
+        "search", help="Search task titles and descriptions"
+    )
+    search_parser.add_argument("query", help="Words to search for")
+    search_parser.add_argument(
+        "--status", "-s",
+        choices=[status.value for status in TaskStatus],
+        help="Only search tasks with this status"
+    )
+    search_parser.add_argument(
+        "--limit", "-n", type=int, default=10, help="Maximum results"
+    )
+    
+    # Update command
+    update_parser = subparsers.add_parser("update", help="Update a task")
+    update_parser.add_argument("id", type=int, help="Task ID")
+    update_parser.add_argument("--title", "-t", help="New title")
+    update_parser.add_argument("--desc", "-d", help="New description")
+    
+    # Delete command
+    delete_parser = subparsers.add_parser("delete", help="Delete a task")
+    delete_parser.add_argument("id", type=int, help="Task ID")
+    
+    # Complete command
+    complete_parser = subparsers.add_parser("complete", help="Toggle task completion")
+    complete_parser.add_argument("id", type=int, help="Task ID")
+    
+    # Import command
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk import tasks from a JSONL or CSV file"
+    )
+    import_parser.add_argument("file", help="File to read ('-' for stdin)")
+    import_parser.add_argument(
+        "--format", "-f", choices=FORMATS,
+        help="Input format (default: csv for .csv files, else jsonl)"
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=1000,
+        help="Tasks validated and stored per batch"
+    )
+    
+    # Export command
+    export_parser = subparsers.add_parser(
+        "export", help="Export tasks as JSONL or CSV"
+    )
+    export_parser.add_argument(
+        "--output", "-o", default="-", help="File to write ('-' for stdout)"
+    )
+    export_parser.add_argument(
+        "--format", "-f", choices=FORMATS,
+        help="Output format (default: csv for .csv files, else jsonl)"
+    )
+    export_parser.add_argument(
+        "--status", "-s",
+        choices=[status.value for status in TaskStatus],
+        help="Only export tasks with this status"
+    )
+    
+    # Shell command
+    subparsers.add_parser(
+        "shell", help="Interactive prompt that keeps tasks between commands"
+    )
+    
+    return parser
+
+
+def format_status(status: TaskStatus) -> str:
+    """Format task status with visual indicator."""
+    if status == TaskStatus.COMPLETE:
+        return "[✓] complete"
+    return "[ ] pending"
+
+
+def print_tasks(tasks: list[Task]) -> None:
+    """Print tasks as a table."""
+    print(f"\n{'ID':<5} {'Status':<15} {'Title':<30} {'Description'}")
+    print("-" * 70)
+    
+    for task in tasks:
+        status = format_status(task.status)
+        desc = task.description[:20] + "..." if len(task.description) > 20 else task.description
+        print(f"{task.id:<5} {status:<15} {task.title:<30} {desc}")
+
+
+def cmd_add(args: argparse.Namespace) -> int:
+    """Handle add command."""
+    try:
+        task = _service.add(args.title, args.desc)
+        print(f"Created task #{task.id}: {task.title}")
+        print(f"Status: {format_status(task.status)}")
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """Handle list command."""
+    status = TaskStatus(args.status) if args.status else None
+    tasks = _service.get_all(status)
+    
+    if not tasks:
+        print("No tasks found. Use 'add' to create your first task.")
+        return 0
+    
+    print_tasks(tasks)
+    print(f"\nTotal: {len(tasks)} task(s)")
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    """Handle search command."""
+    status = TaskStatus(args.status) if args.status else None
+    try:
+        tasks = _service.search(args.query, status, args.limit)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    if not tasks:
+        print(f"No tasks match '{args.query}'.")
+        return 0
+    
+    print_tasks(tasks)
+    print(f"\nFound: {len(tasks)} task(s)")
+    return 0
+
+
+def cmd_update(args: argparse.Namespace) -> int:
+    """Handle update command."""
+    if args.title is None and args.desc is None:
+        print("Error: Provide --title and/or --desc to update", file=sys.stderr)
+        return 1
+    
+    try:
+        task = _service.update(args.id, args.title, args.desc)
+        if task is None:
+            print(f"Error: Task with ID {args.id} not found", file=sys.stderr)
+            return 1
+        print(f"Updated task #{task.id}: {task.title}")
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_delete(args: argparse.Namespace) -> int:
+    """Handle delete command."""
+    if _service.delete(args.id):
+        print(f"Deleted task #{args.id}")
+        return 0
+    else:
+        print(f"Error: Task with ID {args.id} not found", file=sys.stderr)
+        return 1
+
+
+def cmd_complete(args: argparse.Namespace) -> int:
+    """Handle complete command."""
+    task = _service.toggle_complete(args.id)
+    if task is None:
+        print(f"Error: Task with ID {args.id} not found", file=sys.stderr)
+        return 1
+    
+    status_text = "complete" if task.is_complete() else "pending"
+    print(f"Task #{task.id} marked as {status_text}")
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Handle import command."""
+    fmt = detect_format(args.file, args.format)
+    stream = sys.stdin if args.file == "-" else None
+    started = time.perf_counter()
+    try:
+        if stream is None:
+            stream = open(args.file, newline="", encoding="utf-8")
+        with stream:
+            items = to_items(read_records(stream, fmt))
+            count = _service.add_many(items, batch_size=args.batch_size)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Imported {count} task(s) in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Handle export command."""
+    fmt = detect_format(args.output, args.format)
+    status = TaskStatus(args.status) if args.status else None
+    started = time.perf_counter()
+    try:
+        if args.output == "-":
+            count = write_records(sys.stdout, _service.iter_tasks(status), fmt)
+        else:
+            with open(args.output, "w", newline="", encoding="utf-8") as stream:
+                count = write_records(stream, _service.iter_tasks(status), fmt)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    # Report on stderr so it never mixes with exported data on stdout.
+    print(
+        f"Exported {count} task(s) in {elapsed:.2f}s ({rate:,.0f} rows/sec)",
+        file=sys.stderr
+    )
+    return 0
+
+
+def cmd_shell(args: argparse.Namespace) -> int:
+    """Handle shell command: read commands from stdin until EOF or 'exit'."""
+    parser = create_parser()
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print("Todo shell. Type 'help' for commands, 'exit' to quit.")
+    
+    while True:
+        try:
+            line = input("todo> " if interactive else "")
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            print()
+            continue
+        
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line in ("exit", "quit"):
+            break
+        if line == "help":
+            parser.print_help()
+            continue
+        
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            continue
+        execute(parser, argv)
+    
+    if interactive:
+        print()
+    return 0
+
+
+COMMANDS = {
+    "add": cmd_add,
+    "list": cmd_list,
+    "search": cmd_search,
+    "update": cmd_update,
+    "delete": cmd_delete,
+    "complete": cmd_complete,
+    "import": cmd_import,
+    "export": cmd_export,
+    "shell": cmd_shell,
+}
+
+
+def execute(parser: argparse.ArgumentParser, argv: list[str]) -> int:
+    """Run one command against the current session's service.
+    
+    Used by the shell and the daemon, which keep the service alive between
+    commands. Options that pick a data directory or start another session
+    are rejected rather than ignored.
+    
+    Returns:
+        The command's exit code.
+    """
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    
+    if args.daemon or args.command == "shell":
+        print("Error: Already running a todo session", file=sys.stderr)
+        return 1
+    if "--data-dir" in global_options(argv)[0]:
+        print("Error: --data-dir cannot be changed in a running session", file=sys.stderr)
+        return 1
+    if args.command is None:
+        parser.print_help()
+        return 0
+    return COMMANDS[args.command](args)
+
+
+def run(argv: list[str] | None = None) -> int:
+    """Parse arguments and run a command in-process."""
+    global _service
+    
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    
+    if args.daemon:
+        if not args.socket:
+            print("Error: --daemon needs --socket or $TODO_SOCKET", file=sys.stderr)
+            return 1
+    elif args.command is None:
+        parser.print_help()
+        return 0
+    
+    if args.data_dir:
+        _service = TaskService(journal=TaskJournal(args.data_dir))
+    try:
+        if args.daemon:
+            from cli.daemon import serve
+            return serve(args.socket, parser)
+        return COMMANDS[args.command](args)
+    finally:
+        _service.close()
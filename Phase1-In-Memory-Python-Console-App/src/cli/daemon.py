@@ -0,0 +1,129 @@
+"""Unix-socket daemon that keeps one TaskService alive between commands.
+
+Each client connection gets its own thread, but commands run one at a time
+under a lock, so the single service instance never sees concurrent access.
+Each command's stdout and stderr are captured and sent back to the client
+(see ``cli.client`` for the protocol).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from cli import commands
+
+
+class _NoStdin(io.TextIOBase):
+    """Stand-in stdin for commands run on behalf of a remote client."""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        raise OSError("stdin is not available to commands run by the daemon")
+
+    readline = read
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Serve every request line sent on one client connection."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                argv = [str(arg) for arg in request["argv"]]
+                cwd = request.get("cwd")
+            except (ValueError, KeyError, TypeError):
+                response = {"code": 2, "stdout": "", "stderr": "Error: Malformed request\n"}
+            else:
+                response = self.server.run_command(argv, cwd)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class TodoDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Socket server running CLI commands against the session service."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, parser: argparse.ArgumentParser) -> None:
+        """Bind to ``socket_path``, replacing a stale socket file.
+
+        Raises:
+            OSError: If another daemon is already listening on the path.
+        """
+        if os.path.exists(socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)
+            else:
+                raise OSError(f"A daemon is already listening on {socket_path}")
+            finally:
+                probe.close()
+        self.parser = parser
+        self._command_lock = threading.Lock()
+        super().__init__(socket_path, _CommandHandler)
+
+    def run_command(self, argv: list[str], cwd: str | None) -> dict:
+        """Run one command with captured output, relative to ``cwd``."""
+        with self._command_lock:
+            return self._run_locked(argv, cwd)
+
+    def _run_locked(self, argv: list[str], cwd: str | None) -> dict:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        previous_cwd = os.getcwd()
+        previous_stdin = sys.stdin
+        sys.stdin = _NoStdin()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    code = commands.execute(self.parser, argv)
+                except Exception as e:  # keep serving other clients
+                    print(f"Error: {e}", file=sys.stderr)
+                    code = 1
+        except OSError as e:
+            stderr.write(f"Error: {e}\n")
+            code = 1
+        finally:
+            sys.stdin = previous_stdin
+            os.chdir(previous_cwd)
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)
+
+
+def serve(socket_path: str, parser: argparse.ArgumentParser) -> int:
+    """Serve commands on ``socket_path`` until interrupted or terminated."""
+    try:
+        server = TodoDaemon(socket_path, parser)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    def _stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Todo daemon listening on {socket_path}", flush=True)
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
@@ -0,0 +1,110 @@
+"""Streaming JSONL/CSV readers and writers for bulk import and export.
+
+Every function here works one record at a time, so files far larger than
+memory can be piped through ``TaskService.add_many`` or written from
+``TaskService.iter_tasks``.
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from models.task import Task, TaskStatus
+
+
+FORMATS = ("jsonl", "csv")
+FIELDS = ("id", "title", "description", "status")
+
+_STATUSES = {status.value: status for status in TaskStatus}
+
+
+def detect_format(path: str, explicit: str | None = None) -> str:
+    """Pick a file format from an explicit choice or the file extension.
+
+    Args:
+        path: File path ("-" means stdin/stdout).
+        explicit: Format requested by the user, if any.
+
+    Returns:
+        "csv" for ``.csv`` files, otherwise "jsonl".
+    """
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[dict]:
+    """Yield one dict per JSONL line or CSV row.
+
+    Raises:
+        ValueError: If a JSONL line is not a JSON object or a CSV row is
+            malformed.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        try:
+            yield from reader
+        except csv.Error as e:
+            raise ValueError(f"Line {reader.line_num}: {e}") from None
+        return
+
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_no}: invalid JSON ({e.msg})") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_no}: expected a JSON object")
+        yield record
+
+
+def to_items(records: Iterable[dict]) -> Iterator[tuple[str, str, TaskStatus]]:
+    """Turn raw records into ``TaskService.add_many`` items.
+
+    Any ``id`` field is ignored; imported tasks receive new IDs.
+
+    Raises:
+        ValueError: If a record's status is not a string or is unknown.
+    """
+    for row_no, record in enumerate(records, 1):
+        status_value = record.get("status") or TaskStatus.PENDING.value
+        if not isinstance(status_value, str):
+            raise ValueError(f"Item {row_no}: Status must be a string")
+        status = _STATUSES.get(status_value)
+        if status is None:
+            raise ValueError(f"Item {row_no}: Unknown status '{status_value}'")
+        yield (
+            str(record.get("title") or ""),
+            str(record.get("description") or ""),
+            status,
+        )
+
+
+def write_records(stream: TextIO, tasks: Iterable[Task], fmt: str) -> int:
+    """Write tasks as JSONL or CSV.
+
+    Returns:
+        The number of tasks written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        for task in tasks:
+            writer.writerow((task.id, task.title, task.description, task.status.value))
+            count += 1
+        return count
+
+    for task in tasks:
+        stream.write(json.dumps({
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status.value,
+        }, ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
@@ -11,10 +11,13 @@ class TaskStatus(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single todo item.
     
+    Uses ``__slots__`` so that large task collections do not pay for a
+    per-instance ``__dict__``.
+    
     Attributes:
         id: Unique identifier for the task (auto-generated).
         title: Brief description of the task (required).
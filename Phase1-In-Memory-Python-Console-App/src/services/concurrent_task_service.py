@@ -0,0 +1,271 @@
+"""Thread-safe task service for embedding in multi-threaded programs."""
+
+import threading
+from contextlib import ExitStack
+from dataclasses import replace
+
+from models.task import Task, TaskStatus
+
+
+# Lock-free snapshot passes before one pass takes every shard lock.
+_SNAPSHOT_ATTEMPTS = 3
+
+
+class _Shard:
+    """One lock-protected partition of the task map.
+
+    ``tasks`` is changed in place until a snapshot takes a reference to it
+    (``shared``). The next write then replaces it with a copy, so a dict
+    handed to a snapshot never changes again.
+    """
+
+    __slots__ = ("lock", "tasks", "shared")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.tasks: dict[int, Task] = {}
+        self.shared = False
+
+    def writable(self) -> dict[int, Task]:
+        """Return ``tasks`` ready to be changed; call with ``lock`` held."""
+        if self.shared:
+            self.tasks = dict(self.tasks)
+            self.shared = False
+        return self.tasks
+
+
+class ConcurrentTaskService:
+    """Task service that can be shared between threads.
+
+    Offers the same CRUD operations as ``TaskService`` (in memory only, no
+    journal or search). Tasks are spread over ``shards`` partitions by ID,
+    each guarded by its own lock, so threads working on different tasks
+    rarely contend.
+
+    IDs are handed out in blocks: each thread reserves ``id_block_size``
+    IDs at a time from a shared counter and then allocates from its block
+    without locking. IDs are therefore unique but, across threads, not
+    assigned in call order.
+
+    Tasks returned by the service are never modified afterwards; updates
+    and toggles store a new Task instead. ``get_all`` and ``count`` read a
+    consistent point-in-time snapshot, normally holding one shard lock at a
+    time; only a snapshot overtaken by writes on every attempt holds them
+    all (see ``_snapshot``). Shards are copied on write while a snapshot
+    references them, so the first write to each shard after a snapshot
+    costs a copy of that shard.
+    """
+
+    def __init__(self, shards: int = 16, id_block_size: int = 64) -> None:
+        """Initialize the service.
+
+        Args:
+            shards: Number of lock-striped partitions.
+            id_block_size: IDs reserved by a thread at a time.
+
+        Raises:
+            ValueError: If shards or id_block_size is less than 1.
+        """
+        if shards < 1:
+            raise ValueError("Shard count must be at least 1")
+        if id_block_size < 1:
+            raise ValueError("ID block size must be at least 1")
+
+        self._shards = tuple(_Shard() for _ in range(shards))
+        self._id_block_size = id_block_size
+        self._id_lock = threading.Lock()
+        self._next_block = 1
+        self._local = threading.local()
+
+    def add(self, title: str, description: str = "") -> Task:
+        """Add a new task.
+
+        Args:
+            title: The task title (required).
+            description: Optional task description.
+
+        Returns:
+            The created Task with assigned ID.
+
+        Raises:
+            ValueError: If title is empty or whitespace only.
+        """
+        if not title or not title.strip():
+            raise ValueError("Title is required")
+
+        task = Task(
+            id=self._allocate_id(),
+            title=title.strip(),
+            description=description.strip() if description else ""
+        )
+        shard = self._shard(task.id)
+        with shard.lock:
+            shard.writable()[task.id] = task
+        return task
+
+    def get_all(self, status: TaskStatus | None = None) -> list[Task]:
+        """Get a consistent snapshot of all tasks.
+
+        Args:
+            status: Only return tasks with this status (default: all).
+
+        Returns:
+            List of matching tasks, ordered by ID.
+        """
+        tasks: list[Task] = []
+        for shard_tasks in self._snapshot():
+            tasks.extend(shard_tasks.values())
+
+        if status is not None:
+            tasks = [task for task in tasks if task.status == status]
+        tasks.sort(key=lambda task: task.id)
+        return tasks
+
+    def count(self, status: TaskStatus | None = None) -> int:
+        """Count tasks, optionally only those with a given status.
+
+        Args:
+            status: Only count tasks with this status (default: all).
+
+        Returns:
+            The number of matching tasks.
+        """
+        snapshot = self._snapshot()
+        if status is None:
+            return sum(len(shard_tasks) for shard_tasks in snapshot)
+        return sum(
+            task.status == status
+            for shard_tasks in snapshot
+            for task in shard_tasks.values()
+        )
+
+    def get(self, task_id: int) -> Task | None:
+        """Get a task by ID.
+
+        Args:
+            task_id: The ID of the task to retrieve.
+
+        Returns:
+            The Task if found, None otherwise.
+        """
+        shard = self._shard(task_id)
+        with shard.lock:
+            return shard.tasks.get(task_id)
+
+    def update(
+        self,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None
+    ) -> Task | None:
+        """Update an existing task.
+
+        Args:
+            task_id: The ID of the task to update.
+            title: New title (optional, if None keeps existing).
+            description: New description (optional, if None keeps existing).
+
+        Returns:
+            The updated Task if found, None if task doesn't exist.
+
+        Raises:
+            ValueError: If title is provided but empty.
+        """
+        if title is not None and not title.strip():
+            raise ValueError("Title cannot be empty")
+
+        changes = {}
+        if title is not None:
+            changes["title"] = title.strip()
+        if description is not None:
+            changes["description"] = description.strip()
+
+        shard = self._shard(task_id)
+        with shard.lock:
+            task = shard.tasks.get(task_id)
+            if task is None:
+                return None
+            task = shard.writable()[task_id] = replace(task, **changes)
+        return task
+
+    def delete(self, task_id: int) -> bool:
+        """Delete a task by ID.
+
+        Args:
+            task_id: The ID of the task to delete.
+
+        Returns:
+            True if task was deleted, False if not found.
+        """
+        shard = self._shard(task_id)
+        with shard.lock:
+            if task_id not in shard.tasks:
+                return False
+            del shard.writable()[task_id]
+            return True
+
+    def toggle_complete(self, task_id: int) -> Task | None:
+        """Toggle the completion status of a task.
+
+        Args:
+            task_id: The ID of the task to toggle.
+
+        Returns:
+            The updated Task if found, None if task doesn't exist.
+        """
+        shard = self._shard(task_id)
+        with shard.lock:
+            task = shard.tasks.get(task_id)
+            if task is None:
+                return None
+            status = TaskStatus.PENDING if task.is_complete() else TaskStatus.COMPLETE
+            task = shard.writable()[task_id] = replace(task, status=status)
+        return task
+
+    def _snapshot(self) -> list[dict[int, Task]]:
+        """Return every shard's task map as of a single instant.
+
+        Each shard's lock is held just long enough to mark its map shared,
+        one shard at a time. A shared map is never changed, and a shard that
+        is written to gets a new map. So if every shard still holds the map
+        that was taken, no shard was written to between taking its map and
+        the check, and all the maps were current together when the last one
+        was taken. Otherwise the pass is repeated; maps that were not
+        replaced are still shared, so a retry costs no copying.
+
+        Under steady writes every pass can be overtaken, so after
+        ``_SNAPSHOT_ATTEMPTS`` passes the last one takes every shard lock,
+        in index order, and cannot fail.
+        """
+        shards = self._shards
+        for _ in range(_SNAPSHOT_ATTEMPTS):
+            maps = []
+            for shard in shards:
+                with shard.lock:
+                    shard.shared = True
+                    maps.append(shard.tasks)
+            if all(shard.tasks is tasks for shard, tasks in zip(shards, maps)):
+                return maps
+
+        with ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(shard.lock)
+            for shard in shards:
+                shard.shared = True
+            return [shard.tasks for shard in shards]
+
+    def _shard(self, task_id: int) -> _Shard:
+        """Return the partition that owns a task ID."""
+        return self._shards[task_id % len(self._shards)]
+
+    def _allocate_id(self) -> int:
+        """Take the next ID from this thread's block, reserving a new block if needed."""
+        local = self._local
+        next_id = getattr(local, "next_id", 0)
+        if next_id >= getattr(local, "block_end", 0):
+            with self._id_lock:
+                next_id = self._next_block
+                self._next_block += self._id_block_size
+            local.block_end = next_id + self._id_block_size
+        local.next_id = next_id + 1
+        return next_id
@@ -0,0 +1,115 @@
+"""Inverted index for full-text search over task titles and descriptions."""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Callable
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    """Token -> posting list index maintained as tasks change.
+
+    Each posting list maps a task ID to the number of times the token occurs
+    in that task's title and description. A sorted vocabulary of every
+    indexed token supports prefix matching with a binary search.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] = []
+
+    def add(self, task_id: int, title: str, description: str) -> None:
+        """Index a task's text."""
+        for token, count in Counter(tokenize(f"{title} {description}")).items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[task_id] = count
+
+    def remove(self, task_id: int, title: str, description: str) -> None:
+        """Remove a task's previously indexed text."""
+        for token in set(tokenize(f"{title} {description}")):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(task_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        accept: Callable[[int], bool] | None = None
+    ) -> list[int]:
+        """Find task IDs matching every query token, best first.
+
+        Each query token matches indexed tokens it is a prefix of, so
+        "gro" finds "groceries". A task's score is the total frequency of
+        the tokens it matched; ties go to the lower ID.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of IDs to return.
+            accept: Optional predicate a task ID must satisfy.
+
+        Returns:
+            Matching task IDs ordered by descending score.
+        """
+        terms = set(tokenize(query))
+        if not terms or limit <= 0:
+            return []
+
+        matches = []
+        for term in terms:
+            scores = self._prefix_scores(term)
+            if not scores:
+                return []
+            matches.append(scores)
+
+        # Intersect starting from the rarest term to keep the work small.
+        matches.sort(key=len)
+        totals = matches[0]
+        for scores in matches[1:]:
+            totals = {
+                task_id: score + scores[task_id]
+                for task_id, score in totals.items()
+                if task_id in scores
+            }
+            if not totals:
+                return []
+
+        candidates = totals.items()
+        if accept is not None:
+            candidates = [(task_id, score) for task_id, score in candidates if accept(task_id)]
+        best = heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+        return [task_id for task_id, _score in best]
+
+    def _prefix_scores(self, prefix: str) -> dict[int, int]:
+        """Sum the postings of every indexed token starting with ``prefix``."""
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, prefix)
+        expansions = []
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            expansions.append(self._postings[vocabulary[position]])
+            position += 1
+
+        if len(expansions) == 1:
+            return expansions[0]
+        scores: dict[int, int] = {}
+        for postings in expansions:
+            for task_id, count in postings.items():
+                scores[task_id] = scores.get(task_id, 0) + count
+        return scores
@@ -1,19 +1,90 @@
 """Task service for CRUD operations on tasks."""
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, MutableMapping
+from functools import partial
+from itertools import islice
+
 from models.task import Task, TaskStatus
+from services.search_index import SearchIndex
+from storage.journal import TaskJournal
+
+
+def _index_insert(ids: array, task_id: int) -> None:
+    """Insert an ID into a sorted ID array (an append in the common case)."""
+    if not ids or task_id > ids[-1]:
+        ids.append(task_id)
+    else:
+        ids.insert(bisect_left(ids, task_id), task_id)
+
+
+def _index_remove(ids: array, task_id: int) -> None:
+    """Remove an ID from a sorted ID array."""
+    position = bisect_left(ids, task_id)
+    if position < len(ids) and ids[position] == task_id:
+        del ids[position]
+
+
+def _index_contains(ids: array, task_id: int) -> bool:
+    """Whether a sorted ID array holds an ID."""
+    position = bisect_left(ids, task_id)
+    return position < len(ids) and ids[position] == task_id
 
 
 class TaskService:
     """Service for managing tasks in-memory.
     
     Provides CRUD operations for tasks with auto-incrementing IDs.
-    All data is stored in memory and lost when the application exits.
+    By default all data is stored in memory and lost when the application
+    exits. When a TaskJournal is supplied, every mutation is also appended
+    to its log and state is recovered from it on construction.
+    
+    Tasks are kept in a ``dict[int, Task]`` unless another store is given,
+    such as ``storage.columnar.ColumnarTaskStore`` for very large task
+    counts.
+    
+    Alongside the store the service maintains sorted ID indexes, one over
+    all tasks and one per TaskStatus, so listing, filtering by status and
+    counting cost O(k) in the size of the result rather than a sort of
+    every task. Tasks must therefore only be modified through the service.
+    
+    A full-text SearchIndex is built the first time ``search`` is called and
+    kept up to date by every mutation from then on.
     """
     
-    def __init__(self) -> None:
-        """Initialize the task service with empty storage."""
-        self._tasks: dict[int, Task] = {}
+    def __init__(
+        self,
+        journal: TaskJournal | None = None,
+        store: MutableMapping[int, Task] | None = None
+    ) -> None:
+        """Initialize the task service.
+        
+        Args:
+            journal: Optional journal to recover from and log mutations to.
+            store: Optional empty mapping to hold tasks (default: a dict).
+        """
+        self._journal = journal
+        self._tasks: MutableMapping[int, Task] = {} if store is None else store
         self._next_id: int = 1
+        if journal is not None:
+            self._tasks, self._next_id = journal.load(self._tasks)
+        
+        self._order = array("q")
+        self._by_status: dict[TaskStatus, array] = {
+            status: array("q") for status in TaskStatus
+        }
+        # Stores that can list statuses without materializing tasks
+        # (ColumnarTaskStore) index a recovered journal much faster.
+        statuses = getattr(self._tasks, "statuses", None)
+        rows = (
+            statuses() if statuses is not None
+            else ((task.id, task.status) for task in self._tasks.values())
+        )
+        for task_id, status in rows:
+            _index_insert(self._order, task_id)
+            _index_insert(self._by_status[status], task_id)
+        self._search: SearchIndex | None = None
     
     def add(self, title: str, description: str = "") -> Task:
         """Add a new task.
@@ -37,16 +108,166 @@ class TaskService:
             description=description.strip() if description else ""
         )
         self._tasks[self._next_id] = task
+        self._order.append(task.id)
+        self._by_status[task.status].append(task.id)
         self._next_id += 1
-        return task
+        if self._search is not None:
+            self._search.add(task.id, task.title, task.description)
+        if self._journal is not None:
+            self._journal.append_add(task)
+            self._maybe_compact()
+        # Return what the store holds (a view for ColumnarTaskStore), so
+        # later updates show through it whatever the store.
+        return self._tasks[task.id]
+    
+    def add_many(
+        self,
+        items: Iterable[tuple[str, str] | tuple[str, str, TaskStatus]],
+        batch_size: int = 1000
+    ) -> int:
+        """Add many tasks from an iterable, a batch at a time.
+        
+        Each batch is validated as a whole before any of it is stored, then
+        receives a contiguous block of IDs. Items are consumed lazily, so a
+        generator over a very large input keeps memory flat.
+        
+        Args:
+            items: ``(title, description)`` or ``(title, description,
+                status)`` tuples.
+            batch_size: Number of items validated and stored together.
+            
+        Returns:
+            The number of tasks added.
+            
+        Raises:
+            ValueError: If batch_size is less than 1, or an item has an
+                empty title. Batches before the failing one are kept; the
+                failing batch is not added.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        
+        added = 0
+        iterator = iter(items)
+        while batch := list(islice(iterator, batch_size)):
+            rows = []
+            for offset, item in enumerate(batch):
+                title, description = item[0], item[1]
+                status = item[2] if len(item) > 2 else TaskStatus.PENDING
+                if not title or not title.strip():
+                    raise ValueError(f"Item {added + offset + 1}: Title is required")
+                rows.append((title.strip(), description.strip() if description else "", status))
+            
+            first_id = self._next_id
+            self._next_id += len(rows)
+            tasks = [
+                Task(task_id, title, description, status)
+                for task_id, (title, description, status) in enumerate(rows, first_id)
+            ]
+            for task in tasks:
+                self._tasks[task.id] = task
+                self._by_status[task.status].append(task.id)
+                if self._search is not None:
+                    self._search.add(task.id, task.title, task.description)
+            self._order.extend(range(first_id, self._next_id))
+            if self._journal is not None:
+                self._journal.append_adds(tasks)
+            added += len(tasks)
+        
+        # Compact once at the end rather than repeatedly during a bulk load.
+        if self._journal is not None:
+            self._maybe_compact()
+        return added
+    
+    def get_all(self, status: TaskStatus | None = None) -> list[Task]:
+        """Get all tasks, optionally only those with a given status.
+        
+        Args:
+            status: Only return tasks with this status (default: all).
+            
+        Returns:
+            List of matching tasks, ordered by ID.
+        """
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._index(status)]
+    
+    def iter_tasks(
+        self,
+        status: TaskStatus | None = None,
+        start_after: int | None = None,
+        limit: int | None = None
+    ) -> Iterator[Task]:
+        """Lazily iterate over tasks in ID order, one page at a time.
+        
+        Args:
+            status: Only yield tasks with this status (default: all).
+            start_after: Only yield tasks with an ID greater than this, e.g.
+                the last ID of the previous page.
+            limit: Maximum number of tasks to yield (default: no limit).
+            
+        Yields:
+            Matching tasks, ordered by ID.
+            
+        Raises:
+            ValueError: If limit is negative.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative")
+        
+        ids = self._index(status)
+        start = 0 if start_after is None else bisect_right(ids, start_after)
+        stop = len(ids) if limit is None else min(len(ids), start + limit)
+        # Copy the page of IDs so mutations while iterating cannot shift it.
+        for task_id in ids[start:stop]:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                yield task
+    
+    def search(
+        self,
+        query: str,
+        status: TaskStatus | None = None,
+        limit: int = 10
+    ) -> list[Task]:
+        """Full-text search over task titles and descriptions.
+        
+        Every word in the query must match the start of a word in the task
+        (case-insensitive), so "buy gro" finds "Buy groceries". Results are
+        ranked by how often the matched words occur.
+        
+        Args:
+            query: Words to search for.
+            status: Only return tasks with this status (default: all).
+            limit: Maximum number of tasks to return.
+            
+        Returns:
+            Matching tasks, best match first.
+            
+        Raises:
+            ValueError: If limit is negative.
+        """
+        if limit < 0:
+            raise ValueError("Limit cannot be negative")
+        
+        if self._search is None:
+            self._search = SearchIndex()
+            for task in self._tasks.values():
+                self._search.add(task.id, task.title, task.description)
+        
+        accept = None if status is None else partial(_index_contains, self._by_status[status])
+        
+        return [self._tasks[task_id] for task_id in self._search.search(query, limit, accept)]
     
-    def get_all(self) -> list[Task]:
-        """Get all tasks.
+    def count(self, status: TaskStatus | None = None) -> int:
+        """Count tasks, optionally only those with a given status.
         
+        Args:
+            status: Only count tasks with this status (default: all).
+            
         Returns:
-            List of all tasks, ordered by ID.
+            The number of matching tasks.
         """
-        return sorted(self._tasks.values(), key=lambda t: t.id)
+        return len(self._index(status))
     
     def get(self, task_id: int) -> Task | None:
         """Get a task by ID.
@@ -82,14 +303,21 @@ class TaskService:
         if task is None:
             return None
         
+        if title is not None and not title.strip():
+            raise ValueError("Title cannot be empty")
+        
+        if self._search is not None:
+            self._search.remove(task_id, task.title, task.description)
         if title is not None:
-            if not title.strip():
-                raise ValueError("Title cannot be empty")
             task.title = title.strip()
-        
         if description is not None:
             task.description = description.strip()
+        if self._search is not None:
+            self._search.add(task_id, task.title, task.description)
         
+        if self._journal is not None:
+            self._journal.append_update(task)
+            self._maybe_compact()
         return task
     
     def delete(self, task_id: int) -> bool:
@@ -101,8 +329,16 @@ class TaskService:
         Returns:
             True if task was deleted, False if not found.
         """
-        if task_id in self._tasks:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            _index_remove(self._by_status[task.status], task_id)
+            _index_remove(self._order, task_id)
+            if self._search is not None:
+                self._search.remove(task_id, task.title, task.description)
             del self._tasks[task_id]
+            if self._journal is not None:
+                self._journal.append_delete(task_id)
+                self._maybe_compact()
             return True
         return False
     
@@ -119,5 +355,29 @@ class TaskService:
         if task is None:
             return None
         
+        _index_remove(self._by_status[task.status], task_id)
         task.toggle_status()
+        _index_insert(self._by_status[task.status], task_id)
+        if self._journal is not None:
+            self._journal.append_toggle(task)
+            self._maybe_compact()
         return task
+    
+    def close(self) -> None:
+        """Flush and close the journal, if any.
+        
+        Safe to call on a purely in-memory service.
+        """
+        if self._journal is not None:
+            self._journal.close()
+    
+    def _index(self, status: TaskStatus | None) -> array:
+        """Return the sorted ID index for a status, or for all tasks."""
+        if status is None:
+            return self._order
+        return self._by_status[status]
+    
+    def _maybe_compact(self) -> None:
+        """Snapshot the journal once its log has grown long enough."""
+        if self._journal.needs_snapshot:
+            self._journal.snapshot(self.get_all(), self._next_id)
@@ -0,0 +1,5 @@
+"""Optional persistent storage backends for the task service."""
+
+from .journal import TaskJournal
+
+__all__ = ["TaskJournal"]
@@ -0,0 +1,299 @@
+"""Array-backed columnar task store for large in-memory workloads.
+
+``ColumnarTaskStore`` is a drop-in replacement for the ``dict[int, Task]``
+used by TaskService. Instead of one Python object per task it keeps:
+
+* ``_ids`` - task IDs in ascending order (``array('q')``), searched with
+  bisect.
+* ``_states`` - one status byte per row (pending, complete or deleted).
+* ``_arena`` - a single UTF-8 ``bytearray`` holding every title followed
+  directly by its description, addressed by per-row offset and byte length
+  arrays.
+
+That is roughly 25 bytes of bookkeeping per task plus the text itself.
+``Task`` objects are only materialized when a row is read, as lightweight
+``TaskView`` instances that read and write through to the columns.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, MutableMapping, ValuesView
+
+from models.task import Task, TaskStatus
+
+
+_PENDING = 0
+_COMPLETE = 1
+_DELETED = 2
+
+_STATUS_CODES = {TaskStatus.PENDING: _PENDING, TaskStatus.COMPLETE: _COMPLETE}
+_CODE_STATUSES = {code: status for status, code in _STATUS_CODES.items()}
+
+# Deleted rows and overwritten text are reclaimed once they exceed both this
+# floor and the amount of live data.
+_COMPACT_MIN_ROWS = 1024
+_COMPACT_MIN_BYTES = 64 * 1024
+
+
+class TaskView(Task):
+    """A Task whose fields live in a ColumnarTaskStore row.
+
+    Reading a field decodes it from the store; assigning a field writes it
+    back. Views stay valid across store compaction because they re-resolve
+    their row from the task ID when the cached row no longer matches.
+    """
+
+    __slots__ = ("_store", "_task_id", "_row")
+
+    def __init__(self, store: "ColumnarTaskStore", task_id: int, row: int) -> None:
+        """Create a view of the row holding ``task_id``."""
+        self._store = store
+        self._task_id = task_id
+        self._row = row
+
+    def _resolve(self) -> int:
+        """Return the current row index for this view's task."""
+        row = self._row
+        ids = self._store._ids
+        if row >= len(ids) or ids[row] != self._task_id:
+            row = self._row = self._store._find_row(self._task_id)
+        if row < 0:
+            raise KeyError(f"Task {self._task_id} is no longer in the store")
+        return row
+
+    @property
+    def id(self) -> int:
+        """Unique identifier for the task."""
+        return self._task_id
+
+    @id.setter
+    def id(self, value: int) -> None:
+        raise AttributeError("Task ID cannot be changed through a view")
+
+    @property
+    def title(self) -> str:
+        """Brief description of the task."""
+        return self._store._title_at(self._resolve())
+
+    @title.setter
+    def title(self, value: str) -> None:
+        row = self._resolve()
+        self._store._write_text(row, value, self._store._description_at(row))
+
+    @property
+    def description(self) -> str:
+        """Detailed information about the task."""
+        return self._store._description_at(self._resolve())
+
+    @description.setter
+    def description(self, value: str) -> None:
+        row = self._resolve()
+        self._store._write_text(row, self._store._title_at(row), value)
+
+    @property
+    def status(self) -> TaskStatus:
+        """Current completion status."""
+        return _CODE_STATUSES[self._store._states[self._resolve()]]
+
+    @status.setter
+    def status(self, value: TaskStatus) -> None:
+        self._store._states[self._resolve()] = _STATUS_CODES[value]
+
+
+class _ColumnValues(ValuesView):
+    """Values view that walks the rows directly instead of looking up keys."""
+
+    def __iter__(self) -> Iterator[Task]:
+        return self._mapping._iter_views()
+
+
+class ColumnarTaskStore(MutableMapping[int, Task]):
+    """Mapping of task ID to Task backed by typed arrays and a text arena.
+
+    IDs are expected to arrive mostly in ascending order (as TaskService
+    allocates them), which makes inserts an append. Out-of-order inserts
+    are supported but cost a shift of the columns.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self._ids = array("q")
+        self._states = bytearray()
+        self._offsets = array("Q")
+        self._title_lens = array("I")
+        self._desc_lens = array("I")
+        self._arena = bytearray()
+        self._live = 0
+        self._garbage_bytes = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, int) and self._find_row(task_id) >= 0
+
+    def __getitem__(self, task_id: int) -> Task:
+        row = self._find_row(task_id)
+        if row < 0:
+            raise KeyError(task_id)
+        return TaskView(self, task_id, row)
+
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        self.put(task_id, task.title, task.description, task.status)
+
+    def put(self, task_id: int, title: str, description: str, status: TaskStatus) -> None:
+        """Store a task from its field values, without building a Task.
+
+        Equivalent to ``store[task_id] = Task(task_id, title, description,
+        status)``; loaders use it to fill the columns directly.
+        """
+        code = _STATUS_CODES[status]
+
+        ids = self._ids
+        if not ids or task_id > ids[-1]:
+            # A new highest ID (every row of a load): append the row and its
+            # text in place. Appending creates no garbage to compact.
+            encoded_title = title.encode("utf-8")
+            encoded_desc = description.encode("utf-8")
+            arena = self._arena
+            ids.append(task_id)
+            self._states.append(code)
+            self._offsets.append(len(arena))
+            self._title_lens.append(len(encoded_title))
+            self._desc_lens.append(len(encoded_desc))
+            arena += encoded_title
+            arena += encoded_desc
+            self._live += 1
+            return
+
+        row = bisect_left(ids, task_id)
+        if ids[row] == task_id:
+            if self._states[row] == _DELETED:
+                self._live += 1
+            self._states[row] = code
+        else:
+            ids.insert(row, task_id)
+            self._states.insert(row, code)
+            self._offsets.insert(row, 0)
+            self._title_lens.insert(row, 0)
+            self._desc_lens.insert(row, 0)
+            self._live += 1
+        self._write_text(row, title, description)
+
+    def __delitem__(self, task_id: int) -> None:
+        row = self._find_row(task_id)
+        if row < 0:
+            raise KeyError(task_id)
+        self._states[row] = _DELETED
+        self._garbage_bytes += self._title_lens[row] + self._desc_lens[row]
+        self._title_lens[row] = self._desc_lens[row] = 0
+        self._live -= 1
+        self._maybe_compact()
+
+    def __iter__(self) -> Iterator[int]:
+        states = self._states
+        for row, task_id in enumerate(self._ids):
+            if states[row] != _DELETED:
+                yield task_id
+
+    def values(self) -> ValuesView:
+        """Return a view of the stored tasks in ascending ID order."""
+        return _ColumnValues(self)
+
+    def statuses(self) -> Iterator[tuple[int, TaskStatus]]:
+        """Yield ``(task_id, status)`` for every live row in ID order, without views."""
+        status_of = _CODE_STATUSES.__getitem__
+        for task_id, code in zip(self._ids, self._states):
+            if code != _DELETED:
+                yield task_id, status_of(code)
+
+    def memory_usage(self) -> int:
+        """Return the bytes reserved by the columns and the text arena."""
+        return (
+            self._ids.buffer_info()[1] * self._ids.itemsize
+            + len(self._states)
+            + self._offsets.buffer_info()[1] * self._offsets.itemsize
+            + self._title_lens.buffer_info()[1] * self._title_lens.itemsize
+            + self._desc_lens.buffer_info()[1] * self._desc_lens.itemsize
+            + len(self._arena)
+        )
+
+    def _iter_views(self) -> Iterator[Task]:
+        """Yield a view per live row, in ID order."""
+        states = self._states
+        for row, task_id in enumerate(self._ids):
+            if states[row] != _DELETED:
+                yield TaskView(self, task_id, row)
+
+    def _find_row(self, task_id: int) -> int:
+        """Return the live row holding ``task_id``, or -1."""
+        ids = self._ids
+        row = bisect_left(ids, task_id)
+        if row < len(ids) and ids[row] == task_id and self._states[row] != _DELETED:
+            return row
+        return -1
+
+    def _title_at(self, row: int) -> str:
+        start = self._offsets[row]
+        return self._arena[start:start + self._title_lens[row]].decode("utf-8")
+
+    def _description_at(self, row: int) -> str:
+        length = self._desc_lens[row]
+        if not length:
+            return ""
+        start = self._offsets[row] + self._title_lens[row]
+        return self._arena[start:start + length].decode("utf-8")
+
+    def _write_text(self, row: int, title: str, description: str) -> None:
+        """Append a row's title and description to the arena."""
+        encoded_title = title.encode("utf-8")
+        encoded_desc = description.encode("utf-8")
+        self._garbage_bytes += self._title_lens[row] + self._desc_lens[row]
+        self._offsets[row] = len(self._arena)
+        self._title_lens[row] = len(encoded_title)
+        self._desc_lens[row] = len(encoded_desc)
+        self._arena += encoded_title
+        self._arena += encoded_desc
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        """Reclaim deleted rows and overwritten text once they dominate."""
+        dead_rows = len(self._ids) - self._live
+        if dead_rows > _COMPACT_MIN_ROWS and dead_rows > self._live:
+            self._compact()
+        elif (
+            self._garbage_bytes > _COMPACT_MIN_BYTES
+            and self._garbage_bytes > len(self._arena) - self._garbage_bytes
+        ):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the columns keeping only live rows and their text."""
+        ids = array("q")
+        states = bytearray()
+        offsets = array("Q")
+        title_lens = array("I")
+        desc_lens = array("I")
+        arena = bytearray()
+        old_arena = self._arena
+
+        for row, task_id in enumerate(self._ids):
+            code = self._states[row]
+            if code == _DELETED:
+                continue
+            start = self._offsets[row]
+            end = start + self._title_lens[row] + self._desc_lens[row]
+            ids.append(task_id)
+            states.append(code)
+            offsets.append(len(arena))
+            title_lens.append(self._title_lens[row])
+            desc_lens.append(self._desc_lens[row])
+            arena += old_arena[start:end]
+
+        self._ids = ids
+        self._states = states
+        self._offsets = offsets
+        self._title_lens = title_lens
+        self._desc_lens = desc_lens
+        self._arena = arena
+        self._garbage_bytes = 0
@@ -0,0 +1,412 @@
+"""Append-only operation log with compacted binary snapshots.
+
+A journal directory holds two files:
+
+* ``tasks.snap`` - a columnar snapshot of every task at some point in time.
+* ``tasks.log`` - the operations applied since that snapshot.
+
+Every log record is a full "set state" operation (the toggle record carries
+the resulting status rather than "flip it"), so replaying a record twice is
+harmless. That keeps compaction simple: the snapshot is atomically renamed
+into place first and the log is truncated afterwards, and a crash between
+the two steps only means some records are replayed over a snapshot that
+already contains them.
+"""
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import MutableMapping
+from itertools import accumulate
+from pathlib import Path
+
+from models.task import Task, TaskStatus
+
+
+SNAPSHOT_FILE = "tasks.snap"
+LOG_FILE = "tasks.log"
+
+OP_ADD = 1
+OP_UPDATE = 2
+OP_DELETE = 3
+OP_TOGGLE = 4
+
+_SNAPSHOT_MAGIC = b"TSNP"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<4sHHQQ")
+_CRC = struct.Struct("<I")
+_BLOB_SIZE = struct.Struct("<Q")
+
+# Log record framing: crc32 of the payload, then the payload length.
+_RECORD_HEADER = struct.Struct("<II")
+_OP_HEADER = struct.Struct("<BQ")
+_ROW_BODY = struct.Struct("<BII")
+_STATUS_BODY = struct.Struct("<B")
+
+_STATUS_CODES = {TaskStatus.PENDING: 0, TaskStatus.COMPLETE: 1}
+_CODE_STATUSES = {code: status for status, code in _STATUS_CODES.items()}
+
+
+class JournalCorruptError(Exception):
+    """Raised when the snapshot file fails its integrity check."""
+
+
+def _encode_row(op: int, task: Task) -> bytes:
+    """Encode an add/update record carrying the full task row."""
+    title = task.title.encode("utf-8")
+    description = task.description.encode("utf-8")
+    return (
+        _OP_HEADER.pack(op, task.id)
+        + _ROW_BODY.pack(_STATUS_CODES[task.status], len(title), len(description))
+        + title
+        + description
+    )
+
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix a payload with its checksum and length."""
+    return _RECORD_HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+
+def _native(values: array) -> array:
+    """Swap an array between native and little-endian (on-disk) byte order."""
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class TaskJournal:
+    """Durable append-only log plus periodic snapshot for a task store.
+
+    Records are written to the operating system as soon as they are
+    appended, so they survive a process crash. ``fsync`` is batched: the log
+    is only forced to disk every ``sync_every`` records (and on ``flush`` or
+    ``close``), trading a bounded window of operations on power loss for far
+    fewer disk flushes.
+
+    Attributes:
+        directory: Directory holding the snapshot and log files.
+        sync_every: Number of appended records between fsync calls.
+        snapshot_every: Number of logged operations after which the owner
+            should write a fresh snapshot (see ``needs_snapshot``).
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        sync_every: int = 64,
+        snapshot_every: int = 10_000,
+    ) -> None:
+        """Open (creating if needed) a journal directory.
+
+        Args:
+            directory: Directory for the snapshot and log files.
+            sync_every: Records appended between fsync calls (1 syncs every
+                record).
+            snapshot_every: Logged operations that trigger compaction.
+
+        Raises:
+            ValueError: If sync_every or snapshot_every is less than 1.
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1")
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+
+        self._snapshot_path = self.directory / SNAPSHOT_FILE
+        self._log_path = self.directory / LOG_FILE
+        self._log = None
+        self._unsynced = 0
+        self._logged_ops = 0
+
+    @property
+    def needs_snapshot(self) -> bool:
+        """Whether enough operations were logged to warrant compaction."""
+        return self._logged_ops >= self.snapshot_every
+
+    def load(
+        self, into: MutableMapping[int, Task] | None = None
+    ) -> tuple[MutableMapping[int, Task], int]:
+        """Recover state from the snapshot and the log tail.
+
+        A torn or corrupt record at the end of the log (for example from a
+        crash mid-write) ends replay, and the log is truncated back to the
+        last complete record so new records are appended after valid data.
+
+        Args:
+            into: Empty task store to load into (default: a new dict).
+                Stores with a ``put(task_id, title, description, status)``
+                method, such as ColumnarTaskStore, are filled through it
+                without building a Task per row.
+
+        Returns:
+            A tuple of (tasks keyed by ID in ascending ID order, next ID).
+
+        Raises:
+            JournalCorruptError: If the snapshot fails its checksum.
+        """
+        tasks = {} if into is None else into
+        next_id = self._read_snapshot(tasks)
+        valid_size, replayed, max_added = self._replay_log(tasks)
+
+        if self._log_path.exists() and self._log_path.stat().st_size != valid_size:
+            with open(self._log_path, "r+b") as log:
+                log.truncate(valid_size)
+                os.fsync(log.fileno())
+
+        self._logged_ops = replayed
+        # IDs of tasks added and then deleted within the log must not be
+        # handed out again.
+        next_id = max(next_id, max_added + 1)
+        return tasks, next_id
+
+    def append_add(self, task: Task) -> None:
+        """Log the creation of a task."""
+        self._append(_encode_row(OP_ADD, task))
+
+    def append_adds(self, tasks: list[Task]) -> None:
+        """Log the creation of several tasks with a single write."""
+        self._append_many([_encode_row(OP_ADD, task) for task in tasks])
+
+    def append_update(self, task: Task) -> None:
+        """Log new title/description values for a task."""
+        self._append(_encode_row(OP_UPDATE, task))
+
+    def append_delete(self, task_id: int) -> None:
+        """Log the deletion of a task."""
+        self._append(_OP_HEADER.pack(OP_DELETE, task_id))
+
+    def append_toggle(self, task: Task) -> None:
+        """Log a status change, recording the resulting status."""
+        self._append(
+            _OP_HEADER.pack(OP_TOGGLE, task.id)
+            + _STATUS_BODY.pack(_STATUS_CODES[task.status])
+        )
+
+    def flush(self) -> None:
+        """Force every appended record to stable storage."""
+        if self._log is not None and self._unsynced:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    def snapshot(self, tasks: list[Task], next_id: int) -> None:
+        """Write a compacted snapshot and start a fresh log.
+
+        Args:
+            tasks: Every live task, in ascending ID order.
+            next_id: The next ID the owner will allocate.
+        """
+        self.flush()
+
+        count = len(tasks)
+        ids = array("Q", (task.id for task in tasks))
+        statuses = bytes(_STATUS_CODES[task.status] for task in tasks)
+        # Lengths are stored in code points so the loader can decode each
+        # blob with a single call and slice the resulting str.
+        title_lens = array("I", (len(task.title) for task in tasks))
+        desc_lens = array("I", (len(task.description) for task in tasks))
+        titles = "".join(task.title for task in tasks).encode("utf-8")
+        descriptions = "".join(task.description for task in tasks).encode("utf-8")
+        for values in (ids, title_lens, desc_lens):
+            _native(values)
+
+        body = b"".join((
+            _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, 0, next_id, count),
+            ids.tobytes(),
+            statuses,
+            title_lens.tobytes(),
+            desc_lens.tobytes(),
+            _BLOB_SIZE.pack(len(titles)),
+            titles,
+            descriptions,
+        ))
+
+        tmp_path = self._snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as snap:
+            snap.write(body)
+            snap.write(_CRC.pack(zlib.crc32(body)))
+            snap.flush()
+            os.fsync(snap.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        self._sync_directory()
+
+        # Only now is it safe to drop the log; see the module docstring.
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        with open(self._log_path, "wb") as log:
+            os.fsync(log.fileno())
+        self._logged_ops = 0
+
+    def close(self) -> None:
+        """Flush outstanding records and close the log file."""
+        if self._log is not None:
+            self.flush()
+            self._log.close()
+            self._log = None
+
+    def _append(self, payload: bytes) -> None:
+        """Append one framed record and fsync if the batch is full."""
+        self._append_many([payload])
+
+    def _append_many(self, payloads: list[bytes]) -> None:
+        """Append framed records in one write and fsync if the batch is full."""
+        if self._log is None:
+            self._log = open(self._log_path, "ab")
+        self._log.write(b"".join(_frame(payload) for payload in payloads))
+        self._log.flush()
+        self._unsynced += len(payloads)
+        self._logged_ops += len(payloads)
+        if self._unsynced >= self.sync_every:
+            self.flush()
+
+    def _sync_directory(self) -> None:
+        """Persist the directory entry after a rename (POSIX only)."""
+        if os.name != "posix":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _read_snapshot(self, tasks: MutableMapping[int, Task]) -> int:
+        """Load the snapshot file, if any, and return the stored next ID."""
+        if not self._snapshot_path.exists():
+            return 1
+
+        data = self._snapshot_path.read_bytes()
+        if len(data) < _SNAPSHOT_HEADER.size + _CRC.size:
+            raise JournalCorruptError(f"Snapshot {self._snapshot_path} is truncated")
+        (stored_crc,) = _CRC.unpack_from(data, len(data) - _CRC.size)
+        view = memoryview(data)[: len(data) - _CRC.size]
+        if zlib.crc32(view) != stored_crc:
+            raise JournalCorruptError(f"Snapshot {self._snapshot_path} failed its checksum")
+
+        magic, version, _flags, next_id, count = _SNAPSHOT_HEADER.unpack_from(view, 0)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise JournalCorruptError(f"Snapshot {self._snapshot_path} has an unknown format")
+
+        offset = _SNAPSHOT_HEADER.size
+        ids = array("Q")
+        ids.frombytes(view[offset:offset + 8 * count])
+        offset += 8 * count
+        statuses = view[offset:offset + count]
+        offset += count
+        title_lens = array("I")
+        title_lens.frombytes(view[offset:offset + 4 * count])
+        offset += 4 * count
+        desc_lens = array("I")
+        desc_lens.frombytes(view[offset:offset + 4 * count])
+        offset += 4 * count
+        (titles_size,) = _BLOB_SIZE.unpack_from(view, offset)
+        offset += _BLOB_SIZE.size
+        titles = str(view[offset:offset + titles_size], "utf-8")
+        descriptions = str(view[offset + titles_size:], "utf-8")
+
+        _native(ids)
+        _native(title_lens)
+        _native(desc_lens)
+
+        title_ends = accumulate(title_lens)
+        desc_ends = accumulate(desc_lens)
+        status_of = _CODE_STATUSES.__getitem__
+        rows = zip(ids, statuses, title_ends, desc_ends)
+        title_start = desc_start = 0
+        # Hot loops on cold start: positional arguments keep them tight.
+        put = getattr(tasks, "put", None)
+        if put is not None:
+            for task_id, code, title_end, desc_end in rows:
+                put(
+                    task_id,
+                    titles[title_start:title_end],
+                    descriptions[desc_start:desc_end],
+                    status_of(code),
+                )
+                title_start = title_end
+                desc_start = desc_end
+            return next_id
+        for task_id, code, title_end, desc_end in rows:
+            tasks[task_id] = Task(
+                task_id,
+                titles[title_start:title_end],
+                descriptions[desc_start:desc_end],
+                status_of(code),
+            )
+            title_start = title_end
+            desc_start = desc_end
+        return next_id
+
+    def _replay_log(self, tasks: MutableMapping[int, Task]) -> tuple[int, int, int]:
+        """Apply log records to ``tasks``.
+
+        Returns:
+            A tuple of (byte length of the valid log prefix, records applied,
+            highest task ID added by the log or 0).
+        """
+        if not self._log_path.exists():
+            return 0, 0, 0
+
+        data = memoryview(self._log_path.read_bytes())
+        offset = 0
+        applied = 0
+        max_added = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            crc, length = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            op, task_id = _OP_HEADER.unpack_from(payload, 0)
+            self._apply(tasks, op, task_id, payload)
+            if op == OP_ADD:
+                max_added = max(max_added, task_id)
+            offset = start + length
+            applied += 1
+        return offset, applied, max_added
+
+    @staticmethod
+    def _apply(tasks: MutableMapping[int, Task], op: int, task_id: int, payload: memoryview) -> None:
+        """Apply a single decoded log record."""
+        body = _OP_HEADER.size
+
+        if op == OP_DELETE:
+            tasks.pop(task_id, None)
+            return
+
+        if op == OP_TOGGLE:
+            (code,) = _STATUS_BODY.unpack_from(payload, body)
+            task = tasks.get(task_id)
+            if task is not None:
+                task.status = _CODE_STATUSES[code]
+            return
+
+        code, title_len, desc_len = _ROW_BODY.unpack_from(payload, body)
+        start = body + _ROW_BODY.size
+        title = str(payload[start:start + title_len], "utf-8")
+        description = str(payload[start + title_len:start + title_len + desc_len], "utf-8")
+
+        if op == OP_ADD:
+            put = getattr(tasks, "put", None)
+            if put is not None:
+                put(task_id, title, description, _CODE_STATUSES[code])
+            else:
+                tasks[task_id] = Task(
+                    id=task_id,
+                    title=title,
+                    description=description,
+                    status=_CODE_STATUSES[code],
+                )
+        elif op == OP_UPDATE:
+            task = tasks.get(task_id)
+            if task is not None:
+                task.title = title
+                task.description = description
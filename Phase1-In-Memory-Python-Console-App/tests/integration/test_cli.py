@@ -1,25 +1,46 @@
 """Integration tests for CLI commands."""
 
+import socket
 import subprocess
 import sys
 import os
+import threading
 
+import pytest
+from cli.client import DaemonClient
 
-def run_cli(*args: str) -> tuple[str, str, int]:
-    """Run CLI command and return stdout, stderr, return code."""
-    phase1_dir = os.path.join(os.path.dirname(__file__), "..", "..")
-    src_dir = os.path.join(phase1_dir, "src")
-    
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+
+
+def cli_env(data_dir: str | None = None, socket_path: str | None = None) -> dict[str, str]:
+    """Build the environment for running the CLI from the src directory."""
     # Set PYTHONPATH to include src directory
     env = os.environ.copy()
-    env["PYTHONPATH"] = src_dir
-    
+    env["PYTHONPATH"] = SRC_DIR
+    env.pop("TODO_DATA_DIR", None)
+    env.pop("TODO_SOCKET", None)
+    if data_dir is not None:
+        env["TODO_DATA_DIR"] = data_dir
+    if socket_path is not None:
+        env["TODO_SOCKET"] = socket_path
+    return env
+
+
+def run_cli(
+    *args: str,
+    data_dir: str | None = None,
+    socket_path: str | None = None,
+    stdin: str | None = None
+) -> tuple[str, str, int]:
+    """Run CLI command and return stdout, stderr, return code."""
     result = subprocess.run(
         [sys.executable, "-m", "cli.main", *args],
         capture_output=True,
         text=True,
-        cwd=src_dir,
-        env=env
+        input=stdin,
+        cwd=SRC_DIR,
+        env=cli_env(data_dir, socket_path)
     )
     return result.stdout, result.stderr, result.returncode
 
@@ -84,3 +105,268 @@ class TestCLIFlow:
         assert "add" in stdout
         assert "list" in stdout
         assert "delete" in stdout
+
+
+class TestCLISearch:
+    """Tests for search command."""
+    
+    def test_search_lists_matches(self, tmp_path):
+        """Test search prints matching tasks only."""
+        run_cli("add", "Buy groceries", data_dir=str(tmp_path))
+        run_cli("add", "Call mom", data_dir=str(tmp_path))
+        
+        stdout, stderr, code = run_cli("search", "groc", data_dir=str(tmp_path))
+        
+        assert code == 0
+        assert "Buy groceries" in stdout
+        assert "Call mom" not in stdout
+        assert "Found: 1 task(s)" in stdout
+    
+    def test_search_no_matches(self):
+        """Test search reports when nothing matches."""
+        stdout, stderr, code = run_cli("search", "anything")
+        
+        assert code == 0
+        assert "No tasks match" in stdout
+
+
+class TestCLIPersistence:
+    """Tests for the journal-backed --data-dir mode."""
+    
+    def test_tasks_persist_between_invocations(self, tmp_path):
+        """Test tasks added in one run are listed by the next."""
+        run_cli("add", "Persistent task", data_dir=str(tmp_path))
+        run_cli("complete", "1", data_dir=str(tmp_path))
+        
+        stdout, stderr, code = run_cli("list", data_dir=str(tmp_path))
+        
+        assert code == 0
+        assert "Persistent task" in stdout
+        assert "complete" in stdout
+    
+    def test_data_dir_flag(self, tmp_path):
+        """Test the --data-dir flag works without the environment variable."""
+        run_cli("--data-dir", str(tmp_path), "add", "Flag task")
+        
+        stdout, stderr, code = run_cli("--data-dir", str(tmp_path), "list")
+        
+        assert code == 0
+        assert "Flag task" in stdout
+
+    
+    def test_list_by_status(self, tmp_path):
+        """Test list --status only shows matching tasks."""
+        run_cli("add", "Done task", data_dir=str(tmp_path))
+        run_cli("add", "Open task", data_dir=str(tmp_path))
+        run_cli("complete", "1", data_dir=str(tmp_path))
+        
+        stdout, stderr, code = run_cli("list", "--status", "pending", data_dir=str(tmp_path))
+        
+        assert code == 0
+        assert "Open task" in stdout
+        assert "Done task" not in stdout
+
+
+class TestCLIImportExport:
+    """Tests for bulk import and export."""
+    
+    def test_import_jsonl_then_export_csv(self, tmp_path):
+        """Test a JSONL import round-trips through a CSV export."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text(
+            '{"title": "First", "description": "one"}\n'
+            '\n'
+            '{"title": "Second", "status": "complete"}\n',
+            encoding="utf-8"
+        )
+        data_dir = str(tmp_path / "data")
+        
+        stdout, stderr, code = run_cli("import", str(source), data_dir=data_dir)
+        
+        assert code == 0
+        assert "Imported 2 task(s)" in stdout
+        assert "rows/sec" in stdout
+        
+        stdout, stderr, code = run_cli("export", "--format", "csv", data_dir=data_dir)
+        
+        assert code == 0
+        assert stdout.splitlines() == [
+            "id,title,description,status",
+            "1,First,one,pending",
+            "2,Second,,complete",
+        ]
+        assert "Exported 2 task(s)" in stderr
+    
+    def test_import_csv_file(self, tmp_path):
+        """Test CSV input is detected from the file extension."""
+        source = tmp_path / "tasks.csv"
+        source.write_text("title,description\nFrom CSV,desc\n", encoding="utf-8")
+        data_dir = str(tmp_path / "data")
+        
+        run_cli("import", str(source), data_dir=data_dir)
+        stdout, stderr, code = run_cli("list", data_dir=data_dir)
+        
+        assert "From CSV" in stdout
+    
+    def test_import_invalid_row_reports_error(self, tmp_path):
+        """Test a bad row fails the import with its position."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text('{"title": "Ok"}\n{"title": ""}\n', encoding="utf-8")
+        
+        stdout, stderr, code = run_cli("import", str(source))
+        
+        assert code == 1
+        assert "Item 2: Title is required" in stderr
+    
+    def test_import_non_string_status_reports_error(self, tmp_path):
+        """Test a list or object status is an error, not a crash."""
+        source = tmp_path / "tasks.jsonl"
+        source.write_text('{"title": "a", "status": ["x"]}\n', encoding="utf-8")
+        
+        stdout, stderr, code = run_cli("import", str(source))
+        
+        assert code == 1
+        assert "Item 1: Status must be a string" in stderr
+        assert "Traceback" not in stderr
+    
+    def test_import_missing_file(self, tmp_path):
+        """Test a missing input file is reported as an error."""
+        stdout, stderr, code = run_cli("import", str(tmp_path / "missing.jsonl"))
+        
+        assert code == 1
+        assert "Error" in stderr
+
+
+class TestCLIShell:
+    """Tests for the shell command."""
+    
+    def test_shell_keeps_tasks_between_commands(self):
+        """Test commands piped to the shell share one service."""
+        script = 'add "First task"\nadd Second -d details\ncomplete 1\nlist\nexit\n'
+        
+        stdout, stderr, code = run_cli("shell", stdin=script)
+        
+        assert code == 0
+        assert "Created task #2: Second" in stdout
+        assert "Total: 2 task(s)" in stdout
+    
+    def test_shell_reports_errors_and_continues(self):
+        """Test a failing or unparseable line does not end the shell."""
+        script = 'add ""\nbogus\nadd "unterminated\nadd Fine\n'
+        
+        stdout, stderr, code = run_cli("shell", stdin=script)
+        
+        assert code == 0
+        assert "Title is required" in stderr
+        assert "invalid choice" in stderr
+        assert "Created task #1: Fine" in stdout
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestCLIDaemon:
+    """Tests for --daemon and forwarding through $TODO_SOCKET."""
+    
+    @pytest.fixture
+    def socket_path(self, tmp_path):
+        """Run a daemon for the duration of a test."""
+        path = str(tmp_path / "todo.sock")
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "cli.main", "--daemon", "--socket", path],
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=SRC_DIR,
+            env=cli_env()
+        )
+        assert "listening" in daemon.stdout.readline()
+        yield path
+        daemon.terminate()
+        daemon.wait(timeout=10)
+        assert not os.path.exists(path)
+    
+    def test_commands_share_daemon_state(self, socket_path):
+        """Test separate invocations see the daemon's single service."""
+        run_cli("add", "Daemon task", socket_path=socket_path)
+        
+        stdout, stderr, code = run_cli("list", socket_path=socket_path)
+        
+        assert code == 0
+        assert "Daemon task" in stdout
+    
+    def test_errors_are_relayed(self, socket_path):
+        """Test stderr and exit codes come back from the daemon."""
+        stdout, stderr, code = run_cli("delete", "42", socket_path=socket_path)
+        
+        assert code == 1
+        assert "Task with ID 42 not found" in stderr
+    
+    def test_persistent_client(self, socket_path):
+        """Test one DaemonClient connection can run many commands."""
+        with DaemonClient(socket_path) as client:
+            for i in range(20):
+                client.run(["add", f"Task {i}"])
+            code, stdout, stderr = client.run(["list"])
+        
+        assert code == 0
+        assert "Total: 20 task(s)" in stdout
+    
+    def test_falls_back_without_daemon(self, tmp_path):
+        """Test a stale $TODO_SOCKET runs the command in-process."""
+        stdout, stderr, code = run_cli(
+            "add", "Local task", socket_path=str(tmp_path / "missing.sock")
+        )
+        
+        assert code == 0
+        assert "Created task #1" in stdout
+    
+    @pytest.mark.parametrize("reply", [b"", b"not json\n", b"[1]\n"])
+    def test_lost_connection_is_an_error(self, tmp_path, reply):
+        """Test a daemon that hangs up or garbles its reply is reported."""
+        path = str(tmp_path / "broken.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        
+        def answer_once():
+            conn, _ = server.accept()
+            with conn:
+                conn.makefile("rb").readline()
+                conn.sendall(reply)
+        
+        thread = threading.Thread(target=answer_once)
+        thread.start()
+        try:
+            stdout, stderr, code = run_cli("add", "Lost task", socket_path=path)
+        finally:
+            thread.join(timeout=10)
+            server.close()
+        
+        assert code == 1
+        assert "daemon connection lost" in stderr
+        assert "Traceback" not in stderr
+        assert "Created task" not in stdout
+    
+    def test_explicit_data_dir_runs_locally(self, socket_path, tmp_path):
+        """Test --data-dir is not forwarded to the daemon's store."""
+        data_dir = str(tmp_path / "data")
+        run_cli("--data-dir", data_dir, "add", "Local task", socket_path=socket_path)
+        
+        local, _, _ = run_cli("--data-dir", data_dir, "list", socket_path=socket_path)
+        daemon, _, _ = run_cli("list", socket_path=socket_path)
+        
+        assert "Local task" in local
+        assert "Local task" not in daemon
+    
+    def test_session_rejects_data_dir(self, socket_path, tmp_path):
+        """Test a data directory cannot be picked inside a running daemon."""
+        with DaemonClient(socket_path) as client:
+            code, stdout, stderr = client.run(["--data-dir", str(tmp_path), "list"])
+        
+        assert code == 1
+        assert "--data-dir" in stderr
+    
+    def test_daemon_requires_socket(self):
+        """Test --daemon without a socket path is an error."""
+        stdout, stderr, code = run_cli("--daemon")
+        
+        assert code == 1
+        assert "--socket" in stderr
@@ -0,0 +1,162 @@
+"""Unit tests for ColumnarTaskStore."""
+
+import pytest
+from models.task import Task, TaskStatus
+from services.task_service import TaskService
+from storage.columnar import ColumnarTaskStore, TaskView
+from storage.journal import TaskJournal
+
+
+class TestColumnarStoreMapping:
+    """Tests for the mapping interface."""
+
+    def test_set_and_get(self):
+        """Test a stored task reads back as an equivalent view."""
+        store = ColumnarTaskStore()
+        store[1] = Task(id=1, title="Task", description="Desc")
+
+        task = store[1]
+
+        assert isinstance(task, TaskView)
+        assert isinstance(task, Task)
+        assert (task.id, task.title, task.description) == (1, "Task", "Desc")
+        assert task.status == TaskStatus.PENDING
+
+    def test_missing_key(self):
+        """Test missing IDs behave like a dict."""
+        store = ColumnarTaskStore()
+
+        assert store.get(1) is None
+        assert 1 not in store
+        with pytest.raises(KeyError):
+            store[1]
+        with pytest.raises(KeyError):
+            del store[1]
+
+    def test_out_of_order_insert_keeps_id_order(self):
+        """Test IDs are iterated in ascending order regardless of insert order."""
+        store = ColumnarTaskStore()
+        for task_id in (5, 1, 3):
+            store[task_id] = Task(id=task_id, title=f"Task {task_id}")
+
+        assert list(store) == [1, 3, 5]
+        assert [t.title for t in store.values()] == ["Task 1", "Task 3", "Task 5"]
+
+    def test_delete(self):
+        """Test deleted tasks disappear from lookups and iteration."""
+        store = ColumnarTaskStore()
+        store[1] = Task(id=1, title="One")
+        store[2] = Task(id=2, title="Two")
+
+        del store[1]
+
+        assert len(store) == 1
+        assert 1 not in store
+        assert list(store) == [2]
+
+    def test_view_writes_through(self):
+        """Test assigning view fields updates the store."""
+        store = ColumnarTaskStore()
+        store[1] = Task(id=1, title="Old", description="Old desc")
+
+        view = store[1]
+        view.title = "New"
+        view.toggle_status()
+
+        fresh = store[1]
+        assert fresh.title == "New"
+        assert fresh.description == "Old desc"
+        assert fresh.is_complete()
+
+    def test_view_id_is_read_only(self):
+        """Test a view cannot be re-keyed."""
+        store = ColumnarTaskStore()
+        store[1] = Task(id=1, title="Task")
+
+        with pytest.raises(AttributeError):
+            store[1].id = 2
+
+    def test_views_survive_compaction(self):
+        """Test views re-resolve their row after deleted rows are reclaimed."""
+        store = ColumnarTaskStore()
+        for task_id in range(1, 3001):
+            store[task_id] = Task(id=task_id, title=f"Task {task_id}")
+        survivor = store[3000]
+
+        for task_id in range(1, 2500):
+            del store[task_id]
+
+        assert len(store._ids) < 3000
+        assert survivor.title == "Task 3000"
+
+    def test_unicode_text(self):
+        """Test non-ASCII text round-trips through the arena."""
+        store = ColumnarTaskStore()
+        store[1] = Task(id=1, title="Café ☕", description="日本語")
+
+        assert store[1].title == "Café ☕"
+        assert store[1].description == "日本語"
+
+
+class TestColumnarTaskService:
+    """Tests for TaskService running on the columnar store."""
+
+    def test_crud_round_trip(self):
+        """Test the public API behaves the same on the columnar store."""
+        service = TaskService(store=ColumnarTaskStore())
+        service.add("Task 1", "Desc")
+        service.add("Task 2")
+        service.update(1, title="Renamed")
+        service.toggle_complete(2)
+
+        tasks = service.get_all()
+
+        assert [t.id for t in tasks] == [1, 2]
+        assert tasks[0].title == "Renamed"
+        assert tasks[1].status == TaskStatus.COMPLETE
+        assert service.delete(1) is True
+        assert service.get(1) is None
+
+    def test_loads_journal_into_store(self, tmp_path):
+        """Test journal recovery fills a columnar store directly."""
+        service = TaskService(journal=TaskJournal(tmp_path, snapshot_every=2))
+        for i in range(3):
+            service.add(f"Task {i + 1}")
+        service.toggle_complete(3)
+        service.close()
+
+        store = ColumnarTaskStore()
+        recovered = TaskService(journal=TaskJournal(tmp_path), store=store)
+
+        assert recovered._tasks is store
+        assert [t.title for t in recovered.get_all()] == ["Task 1", "Task 2", "Task 3"]
+        assert recovered.get(3).is_complete()
+
+    def test_added_task_sees_later_changes(self):
+        """Test the task returned by add reflects updates, as with a dict store."""
+        service = TaskService(store=ColumnarTaskStore())
+        task = service.add("Task")
+
+        service.update(task.id, title="Renamed")
+        service.toggle_complete(task.id)
+
+        assert isinstance(task, TaskView)
+        assert task.title == "Renamed"
+        assert task.is_complete()
+
+    def test_journal_fills_columns_without_tasks(self, tmp_path, monkeypatch):
+        """Test snapshot and log replay write rows through put, not Task objects."""
+        service = TaskService(journal=TaskJournal(tmp_path, snapshot_every=2))
+        for i in range(3):
+            service.add(f"Task {i + 1}", "Désc")
+        service.close()
+
+        def no_tasks(*args, **kwargs):
+            raise AssertionError("a Task was built during load")
+
+        monkeypatch.setattr("storage.journal.Task", no_tasks)
+        recovered = TaskService(journal=TaskJournal(tmp_path), store=ColumnarTaskStore())
+
+        assert [(t.title, t.description) for t in recovered.get_all()] == [
+            (f"Task {i + 1}", "Désc") for i in range(3)
+        ]
@@ -0,0 +1,243 @@
+"""Unit and stress tests for ConcurrentTaskService."""
+
+import random
+import threading
+
+import pytest
+from models.task import TaskStatus
+from services import concurrent_task_service
+from services.concurrent_task_service import ConcurrentTaskService
+
+
+THREADS = 8
+OPS_PER_THREAD = 2000
+
+
+def run_threads(target, count: int = THREADS) -> None:
+    """Run ``target(index)`` on ``count`` threads released together."""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as e:  # surfaced in the main thread below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestConcurrentTaskServiceBasics:
+    """Single-threaded behaviour matches TaskService."""
+
+    def test_crud_round_trip(self):
+        """Test add, update, toggle and delete."""
+        service = ConcurrentTaskService()
+        first = service.add("  Task 1  ", "Desc")
+        second = service.add("Task 2")
+
+        assert (first.id, second.id) == (1, 2)
+        assert first.title == "Task 1"
+        assert service.update(1, title="Renamed").title == "Renamed"
+        assert service.toggle_complete(2).status == TaskStatus.COMPLETE
+        assert [t.id for t in service.get_all(TaskStatus.PENDING)] == [1]
+        assert service.count() == 2
+        assert service.delete(1) is True
+        assert service.delete(1) is False
+        assert service.get(1) is None
+
+    def test_missing_tasks(self):
+        """Test operations on unknown IDs return None."""
+        service = ConcurrentTaskService()
+
+        assert service.update(99, title="X") is None
+        assert service.toggle_complete(99) is None
+
+    def test_validation(self):
+        """Test invalid titles and settings are rejected."""
+        service = ConcurrentTaskService()
+        service.add("Task")
+
+        with pytest.raises(ValueError, match="Title is required"):
+            service.add("   ")
+        with pytest.raises(ValueError, match="Title cannot be empty"):
+            service.update(1, title="")
+        with pytest.raises(ValueError, match="Shard count"):
+            ConcurrentTaskService(shards=0)
+        with pytest.raises(ValueError, match="ID block size"):
+            ConcurrentTaskService(id_block_size=0)
+
+    def test_returned_tasks_are_not_mutated(self):
+        """Test updates store a new Task instead of changing earlier results."""
+        service = ConcurrentTaskService()
+        task = service.add("Original")
+        snapshot = service.get_all()
+
+        service.update(task.id, title="Changed")
+        service.toggle_complete(task.id)
+
+        assert task.title == "Original"
+        assert snapshot[0].status == TaskStatus.PENDING
+        assert service.get(task.id).title == "Changed"
+
+    def test_snapshots_hold_one_shard_lock_at_a_time(self):
+        """Test get_all and count never stop writers on every shard at once."""
+        service = ConcurrentTaskService(shards=4)
+        for i in range(20):
+            service.add(f"Task {i}")
+        held = []
+
+        class TrackingLock:
+            def __init__(self) -> None:
+                self._lock = threading.Lock()
+
+            def __enter__(self):
+                self._lock.acquire()
+                held.append(self)
+                assert len(held) == 1, "two shard locks held at once"
+
+            def __exit__(self, *exc_info):
+                held.remove(self)
+                self._lock.release()
+
+        for shard in service._shards:
+            shard.lock = TrackingLock()
+
+        assert len(service.get_all()) == 20
+        assert service.count() == 20
+        assert service.count(TaskStatus.PENDING) == 20
+
+    def test_snapshot_falls_back_to_all_locks(self):
+        """Test a snapshot overtaken by writes on every pass still finishes.
+
+        Each lock release is followed by a simulated write that replaces the
+        shard's map, so no lock-free pass can succeed.
+        """
+        service = ConcurrentTaskService(shards=4)
+        for i in range(20):
+            service.add(f"Task {i}")
+        held = []
+        most_held = []
+
+        class InterruptedLock:
+            def __init__(self, shard) -> None:
+                self._shard = shard
+                self._lock = threading.Lock()
+
+            def __enter__(self):
+                self._lock.acquire()
+                held.append(self)
+                most_held.append(len(held))
+
+            def __exit__(self, *exc_info):
+                held.remove(self)
+                self._lock.release()
+                self._shard.tasks = dict(self._shard.tasks)
+
+        for shard in service._shards:
+            shard.lock = InterruptedLock(shard)
+
+        assert [t.title for t in service.get_all()] == [f"Task {i}" for i in range(20)]
+        # Every lock-free pass takes one lock at a time; the last takes all four.
+        passes = concurrent_task_service._SNAPSHOT_ATTEMPTS
+        assert most_held == [1] * 4 * passes + [1, 2, 3, 4]
+
+    def test_snapshot_maps_are_copied_on_write(self):
+        """Test writes after a snapshot leave the maps it took untouched."""
+        service = ConcurrentTaskService(shards=2)
+        first = service.add("First")
+        service.add("Second")
+        maps = service._snapshot()
+        frozen = [dict(tasks) for tasks in maps]
+
+        service.add("Third")
+        service.delete(first.id)
+        service.toggle_complete(2)
+
+        assert [dict(tasks) for tasks in maps] == frozen
+        assert [t.title for t in service.get_all()] == ["Second", "Third"]
+
+
+class TestConcurrentTaskServiceStress:
+    """Many threads hammering one service."""
+
+    def test_concurrent_adds_get_unique_ids(self):
+        """Test no ID is handed out twice and no task is lost."""
+        service = ConcurrentTaskService(id_block_size=16)
+        created: list[list[int]] = [[] for _ in range(THREADS)]
+
+        def add(index: int) -> None:
+            for i in range(OPS_PER_THREAD):
+                created[index].append(service.add(f"T{index}-{i}").id)
+
+        run_threads(add)
+
+        all_ids = [task_id for ids in created for task_id in ids]
+        assert len(set(all_ids)) == THREADS * OPS_PER_THREAD
+        assert service.count() == THREADS * OPS_PER_THREAD
+        assert [t.id for t in service.get_all()] == sorted(all_ids)
+
+    def test_concurrent_toggles_are_not_lost(self):
+        """Test every toggle is applied exactly once."""
+        service = ConcurrentTaskService()
+        ids = [service.add(f"Task {i}").id for i in range(64)]
+
+        def toggle(index: int) -> None:
+            for task_id in ids:
+                service.toggle_complete(task_id)
+
+        # An even number of toggles per task leaves every task pending.
+        run_threads(toggle, count=THREADS)
+
+        assert service.count(TaskStatus.PENDING) == len(ids)
+
+    def test_snapshots_are_consistent(self):
+        """Test snapshots taken during writes are well-formed and frozen.
+
+        Writers keep replacing tasks (a delete followed by an add) and
+        toggling them; every snapshot must be sorted, duplicate-free, never
+        larger than the live set, and unchanged by the writes that follow.
+        """
+        service = ConcurrentTaskService(shards=4)
+        live = 32
+        for i in range(live):
+            service.add(f"Task {i}")
+        stop = threading.Event()
+        snapshots = []
+
+        def mutate(index: int) -> None:
+            rng = random.Random(index)
+            for _ in range(OPS_PER_THREAD // 4):
+                task = rng.choice(service.get_all())
+                if service.delete(task.id):
+                    service.add(task.title)
+                service.toggle_complete(rng.choice(service.get_all()).id)
+
+        def observe() -> None:
+            while not stop.is_set():
+                tasks = service.get_all()
+                state = [(t.id, t.title, t.status) for t in tasks]
+                snapshots.append((tasks, state))
+
+        observer = threading.Thread(target=observe)
+        observer.start()
+        try:
+            run_threads(mutate, count=4)
+        finally:
+            stop.set()
+            observer.join()
+
+        assert snapshots
+        for tasks, state in snapshots:
+            ids = [task_id for task_id, _title, _status in state]
+            assert ids == sorted(set(ids))
+            assert len(ids) <= live
+            assert [(t.id, t.title, t.status) for t in tasks] == state
+        assert service.count() == live
@@ -0,0 +1,170 @@
+"""Unit tests for TaskJournal and journal-backed TaskService."""
+
+import os
+
+import pytest
+from models.task import TaskStatus
+from services.task_service import TaskService
+from storage.journal import LOG_FILE, SNAPSHOT_FILE, JournalCorruptError, TaskJournal
+
+
+def reopen(directory, **kwargs) -> TaskService:
+    """Build a fresh service recovering from the given journal directory."""
+    return TaskService(journal=TaskJournal(directory, **kwargs))
+
+
+class TestJournalRecovery:
+    """Tests for replaying the operation log."""
+
+    def test_empty_directory_starts_empty(self, tmp_path):
+        """Test a new journal directory yields an empty service."""
+        service = reopen(tmp_path)
+
+        assert service.get_all() == []
+        assert service.add("First").id == 1
+
+    def test_mutations_survive_reopen(self, tmp_path):
+        """Test add/update/toggle/delete are all replayed."""
+        service = reopen(tmp_path)
+        service.add("Task 1", "Desc 1")
+        service.add("Task 2")
+        service.add("Task 3")
+        service.update(1, title="Renamed")
+        service.toggle_complete(2)
+        service.delete(3)
+        service.close()
+
+        recovered = reopen(tmp_path)
+        tasks = recovered.get_all()
+
+        assert [t.id for t in tasks] == [1, 2]
+        assert tasks[0].title == "Renamed"
+        assert tasks[0].description == "Desc 1"
+        assert tasks[1].status == TaskStatus.COMPLETE
+
+    def test_ids_not_reused_after_reopen(self, tmp_path):
+        """Test the ID counter resumes after the highest logged ID."""
+        service = reopen(tmp_path)
+        service.add("Task 1")
+        service.add("Task 2")
+        service.delete(2)
+        service.close()
+
+        assert reopen(tmp_path).add("Task 3").id == 3
+
+    def test_unicode_round_trip(self, tmp_path):
+        """Test non-ASCII titles and descriptions are preserved."""
+        service = reopen(tmp_path)
+        service.add("Café ☕", "naïve — 日本語")
+        service.close()
+
+        task = reopen(tmp_path).get(1)
+
+        assert task.title == "Café ☕"
+        assert task.description == "naïve — 日本語"
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        """Test a partially written final record is dropped on recovery."""
+        service = reopen(tmp_path)
+        service.add("Task 1")
+        service.add("Task 2")
+        service.close()
+
+        log_path = tmp_path / LOG_FILE
+        size = log_path.stat().st_size
+        with open(log_path, "r+b") as log:
+            log.truncate(size - 3)
+
+        recovered = reopen(tmp_path)
+
+        assert [t.title for t in recovered.get_all()] == ["Task 1"]
+        assert recovered.add("Task 2 again").id == 2
+        recovered.close()
+        assert [t.title for t in reopen(tmp_path).get_all()] == ["Task 1", "Task 2 again"]
+
+
+class TestJournalSnapshot:
+    """Tests for compaction into snapshots."""
+
+    def test_snapshot_truncates_log(self, tmp_path):
+        """Test reaching snapshot_every writes a snapshot and empties the log."""
+        service = reopen(tmp_path, snapshot_every=5)
+        for i in range(5):
+            service.add(f"Task {i + 1}")
+        service.close()
+
+        assert (tmp_path / SNAPSHOT_FILE).exists()
+        assert (tmp_path / LOG_FILE).stat().st_size == 0
+        assert len(reopen(tmp_path).get_all()) == 5
+
+    def test_snapshot_plus_log_tail(self, tmp_path):
+        """Test recovery loads the snapshot and replays only the tail."""
+        service = reopen(tmp_path, snapshot_every=3)
+        for i in range(4):
+            service.add(f"Task {i + 1}")
+        service.toggle_complete(4)
+        service.close()
+
+        tasks = reopen(tmp_path).get_all()
+
+        assert [t.id for t in tasks] == [1, 2, 3, 4]
+        assert tasks[3].status == TaskStatus.COMPLETE
+
+    def test_replaying_log_over_snapshot_is_idempotent(self, tmp_path):
+        """Test a crash between snapshot rename and log truncation is safe."""
+        service = reopen(tmp_path)
+        service.add("Task 1")
+        service.add("Task 2")
+        service.toggle_complete(1)
+        service.delete(2)
+        service.close()
+        log_bytes = (tmp_path / LOG_FILE).read_bytes()
+
+        journal = TaskJournal(tmp_path)
+        tasks, next_id = journal.load()
+        journal.snapshot(list(tasks.values()), next_id)
+        (tmp_path / LOG_FILE).write_bytes(log_bytes)
+
+        tasks = reopen(tmp_path).get_all()
+
+        assert [t.id for t in tasks] == [1]
+        assert tasks[0].status == TaskStatus.COMPLETE
+
+    def test_corrupt_snapshot_raises(self, tmp_path):
+        """Test a damaged snapshot is reported rather than silently loaded."""
+        service = reopen(tmp_path, snapshot_every=1)
+        service.add("Task 1")
+        service.close()
+
+        snapshot_path = tmp_path / SNAPSHOT_FILE
+        data = bytearray(snapshot_path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        snapshot_path.write_bytes(bytes(data))
+
+        with pytest.raises(JournalCorruptError):
+            TaskJournal(tmp_path).load()
+
+
+class TestJournalSync:
+    """Tests for fsync batching."""
+
+    def test_fsync_batched(self, tmp_path, monkeypatch):
+        """Test fsync runs once per sync_every records, plus on close."""
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+
+        service = reopen(tmp_path, sync_every=4)
+        for i in range(10):
+            service.add(f"Task {i + 1}")
+        assert len(calls) == 2
+
+        service.close()
+        assert len(calls) == 3
+
+    def test_invalid_settings_raise(self, tmp_path):
+        """Test non-positive batch sizes are rejected."""
+        with pytest.raises(ValueError, match="sync_every"):
+            TaskJournal(tmp_path, sync_every=0)
+        with pytest.raises(ValueError, match="snapshot_every"):
+            TaskJournal(tmp_path, snapshot_every=0)
@@ -59,6 +59,54 @@ class TestTaskServiceAdd:
         assert task.description == "Description"
 
 
+class TestTaskServiceAddMany:
+    """Tests for TaskService.add_many method."""
+    
+    def test_add_many_assigns_consecutive_ids(self):
+        """Test bulk-added tasks get consecutive IDs across batches."""
+        service = TaskService()
+        service.add("Existing")
+        
+        count = service.add_many(
+            ((f"Task {i}", "") for i in range(5)), batch_size=2
+        )
+        
+        assert count == 5
+        assert [t.id for t in service.get_all()] == [1, 2, 3, 4, 5, 6]
+        assert service.add("Next").id == 7
+    
+    def test_add_many_strips_and_keeps_status(self):
+        """Test items are normalized like add and may carry a status."""
+        service = TaskService()
+        
+        service.add_many([
+            ("  Open  ", "  Desc  "),
+            ("Done", "", TaskStatus.COMPLETE),
+        ])
+        
+        tasks = service.get_all()
+        assert (tasks[0].title, tasks[0].description) == ("Open", "Desc")
+        assert service.get_all(TaskStatus.COMPLETE) == [tasks[1]]
+    
+    def test_add_many_rejects_whole_failing_batch(self):
+        """Test an invalid item discards its batch but keeps earlier ones."""
+        service = TaskService()
+        items = [("Task 1", ""), ("Task 2", ""), ("Task 3", ""), ("  ", "")]
+        
+        with pytest.raises(ValueError, match="Item 4: Title is required"):
+            service.add_many(items, batch_size=2)
+        
+        assert [t.title for t in service.get_all()] == ["Task 1", "Task 2"]
+        assert service.add("Task 3").id == 3
+    
+    def test_add_many_invalid_batch_size_raises(self):
+        """Test a non-positive batch size is rejected."""
+        service = TaskService()
+        
+        with pytest.raises(ValueError, match="Batch size must be at least 1"):
+            service.add_many([("Task", "")], batch_size=0)
+
+
 class TestTaskServiceGetAll:
     """Tests for TaskService.get_all method."""
     
@@ -219,3 +267,156 @@ class TestTaskServiceToggleComplete:
         task = service.toggle_complete(99)
         
         assert task is None
+
+
+class TestTaskServiceIndexes:
+    """Tests for status filtering, counts and paging."""
+    
+    def _service_with_tasks(self) -> TaskService:
+        """Create a service with tasks 1-5 where 2 and 4 are complete."""
+        service = TaskService()
+        for i in range(5):
+            service.add(f"Task {i + 1}")
+        service.toggle_complete(2)
+        service.toggle_complete(4)
+        return service
+    
+    def test_get_all_by_status(self):
+        """Test get_all filters by status in ID order."""
+        service = self._service_with_tasks()
+        
+        pending = service.get_all(TaskStatus.PENDING)
+        complete = service.get_all(TaskStatus.COMPLETE)
+        
+        assert [t.id for t in pending] == [1, 3, 5]
+        assert [t.id for t in complete] == [2, 4]
+    
+    def test_toggle_back_keeps_id_order(self):
+        """Test a task toggled back to pending returns to its ID position."""
+        service = self._service_with_tasks()
+        service.toggle_complete(2)
+        
+        assert [t.id for t in service.get_all(TaskStatus.PENDING)] == [1, 2, 3, 5]
+    
+    def test_counts(self):
+        """Test counts follow adds, toggles and deletes."""
+        service = self._service_with_tasks()
+        service.delete(4)
+        service.delete(5)
+        
+        assert service.count() == 3
+        assert service.count(TaskStatus.PENDING) == 2
+        assert service.count(TaskStatus.COMPLETE) == 1
+    
+    def test_iter_tasks_pages(self):
+        """Test iter_tasks pages with start_after and limit."""
+        service = self._service_with_tasks()
+        
+        first = list(service.iter_tasks(limit=2))
+        second = list(service.iter_tasks(start_after=first[-1].id, limit=2))
+        rest = list(service.iter_tasks(start_after=second[-1].id))
+        
+        assert [t.id for t in first] == [1, 2]
+        assert [t.id for t in second] == [3, 4]
+        assert [t.id for t in rest] == [5]
+    
+    def test_iter_tasks_by_status(self):
+        """Test iter_tasks combines status and start_after."""
+        service = self._service_with_tasks()
+        
+        tasks = list(service.iter_tasks(status=TaskStatus.PENDING, start_after=1))
+        
+        assert [t.id for t in tasks] == [3, 5]
+    
+    def test_iter_tasks_is_lazy(self):
+        """Test iter_tasks returns a generator and tolerates deletes mid-page."""
+        service = self._service_with_tasks()
+        
+        tasks = service.iter_tasks()
+        first = next(tasks)
+        service.delete(2)
+        
+        assert first.id == 1
+        assert [t.id for t in tasks] == [3, 4, 5]
+    
+    def test_iter_tasks_negative_limit_raises(self):
+        """Test a negative limit is rejected."""
+        service = TaskService()
+        
+        with pytest.raises(ValueError, match="Limit cannot be negative"):
+            list(service.iter_tasks(limit=-1))
+
+
+class TestTaskServiceSearch:
+    """Tests for TaskService.search method."""
+    
+    def _service_with_tasks(self) -> TaskService:
+        """Create a service with a few searchable tasks."""
+        service = TaskService()
+        service.add("Buy groceries", "milk, eggs and more milk")
+        service.add("Call mom")
+        service.add("Buy a gift", "for mom")
+        return service
+    
+    def test_search_matches_title_and_description(self):
+        """Test words are found in titles and descriptions, any case."""
+        service = self._service_with_tasks()
+        
+        assert [t.id for t in service.search("MOM")] == [2, 3]
+        assert [t.id for t in service.search("eggs")] == [1]
+    
+    def test_search_requires_every_word(self):
+        """Test multi-word queries only return tasks matching all words."""
+        service = self._service_with_tasks()
+        
+        assert [t.id for t in service.search("buy mom")] == [3]
+    
+    def test_search_prefix(self):
+        """Test query words match as prefixes."""
+        service = self._service_with_tasks()
+        
+        assert [t.id for t in service.search("gro")] == [1]
+        assert [t.id for t in service.search("g")] == [1, 3]
+    
+    def test_search_ranks_by_term_frequency(self):
+        """Test tasks where the words occur more often rank first."""
+        service = TaskService()
+        service.add("milk")
+        service.add("milk", "milk milk")
+        
+        assert [t.id for t in service.search("milk")] == [2, 1]
+    
+    def test_search_status_and_limit(self):
+        """Test status filtering and result limits."""
+        service = self._service_with_tasks()
+        service.toggle_complete(3)
+        
+        assert [t.id for t in service.search("mom", status=TaskStatus.PENDING)] == [2]
+        assert len(service.search("buy", limit=1)) == 1
+    
+    def test_search_follows_mutations(self):
+        """Test the index is kept up to date after the first search."""
+        service = self._service_with_tasks()
+        assert service.search("dentist") == []
+        
+        service.add("Book dentist")
+        service.update(2, title="Call dad")
+        service.delete(3)
+        service.add_many([("Dentist follow-up", "")])
+        
+        assert [t.id for t in service.search("dentist")] == [4, 5]
+        assert service.search("mom") == []
+        assert [t.id for t in service.search("dad")] == [2]
+    
+    def test_search_empty_query(self):
+        """Test a query without words returns nothing."""
+        service = self._service_with_tasks()
+        
+        assert service.search("  ...  ") == []
+    
+    def test_search_negative_limit_raises(self):
+        """Test a negative limit is rejected."""
+        service = TaskService()
+        
+        with pytest.raises(ValueError, match="Limit cannot be negative"):
+            service.search("x", limit=-1)
@@ -0,0 +1,6 @@
+"""Benchmarks for the backend API.
+
+Run a benchmark module from the backend directory, for example::
+
+    python -m benchmarks.load
+"""
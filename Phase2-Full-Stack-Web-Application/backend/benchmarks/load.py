@@ -0,0 +1,164 @@
+"""Load benchmark: sync-session vs async-session database modes.
+
+Starts the API under uvicorn (one worker process) once per mode on a
+temporary SQLite database, seeds a user with tasks, then runs a closed
+loop of concurrent clients listing a page of tasks. For each concurrency
+level it reports requests/sec and p50/p99 latency, and finally the highest
+concurrency each mode sustains within the p99 target.
+
+Usage::
+
+    python -m benchmarks.load [--concurrency 10 50 100 200 400]
+        [--duration 10] [--p99-target 250]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CONCURRENCY = [10, 50, 100, 200, 400]
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    async_database: bool,
+    data_dir: str,
+    port: int,
+    extra_env: dict[str, str] | None = None
+) -> subprocess.Popen:
+    """Start uvicorn for one database mode and wait until it answers."""
+    env = os.environ.copy()
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(data_dir, 'load.db')}"
+    env["ASYNC_DATABASE"] = "true" if async_database else "false"
+    env.update(extra_env or {})
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def seed(client: httpx.AsyncClient, tasks: int) -> dict[str, str]:
+    """Create a user with ``tasks`` tasks and return its auth header."""
+    response = await client.post(
+        "/api/auth/signup", json={"email": "load@example.com", "password": "password123"}
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    for i in range(tasks):
+        await client.post("/api/tasks", json={"title": f"Task {i}"}, headers=headers)
+    return headers
+
+
+async def run_level(
+    base_url: str,
+    headers: dict[str, str],
+    concurrency: int,
+    duration: float
+) -> dict[str, float]:
+    """Run ``concurrency`` looping clients for ``duration`` seconds."""
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/api/tasks", params={"limit": 50}, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors,
+    }
+
+
+async def bench_mode(async_database: bool, args: argparse.Namespace) -> dict[int, dict]:
+    """Benchmark every concurrency level against one server mode."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = start_server(async_database, data_dir, port)
+        try:
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                headers = await seed(client, args.tasks)
+            return {
+                level: await run_level(base_url, headers, level, args.duration)
+                for level in args.concurrency
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark for both modes and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks seeded for the user")
+    parser.add_argument("--p99-target", type=float, default=250.0, help="Milliseconds")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode, async_database in (("sync", False), ("async", True)):
+        print(f"Benchmarking {mode} database mode...", file=sys.stderr)
+        results[mode] = asyncio.run(bench_mode(async_database, args))
+
+    print(f"{'Mode':<6} {'Clients':>8} {'Req/sec':>9} {'p50 ms':>8} {'p99 ms':>8} {'Errors':>7}")
+    print("-" * 51)
+    for mode, levels in results.items():
+        for level, figures in levels.items():
+            print(
+                f"{mode:<6} {level:>8} {figures['rps']:>9,.0f} {figures['p50_ms']:>8.1f} "
+                f"{figures['p99_ms']:>8.1f} {figures['errors']:>7}"
+            )
+
+    print(f"\nMost concurrent clients with p99 <= {args.p99_target:g} ms:")
+    for mode, levels in results.items():
+        within = [
+            level for level, figures in levels.items()
+            if figures["p99_ms"] <= args.p99_target and not figures["errors"]
+        ]
+        print(f"  {mode:<6} {max(within) if within else 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
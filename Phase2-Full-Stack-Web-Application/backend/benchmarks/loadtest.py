@@ -0,0 +1,455 @@
+"""Load test: scenario mixes at fixed arrival rates, with JSON results.
+
+Runs the API under uvicorn (one worker process) or in-process through
+httpx's ASGI transport, on a temporary SQLite database. Seeds ``--users``
+accounts with ``--tasks`` tasks each, then offers requests at each
+``--rate`` (requests/sec) for ``--duration`` seconds. Each request is a
+scenario picked at random by the ``--mix`` weights:
+
+=========  ===================================
+signin     ``POST /api/auth/signin``
+list       ``GET /api/tasks?limit=50``
+create     ``POST /api/tasks``
+toggle     ``PATCH /api/tasks/{id}/complete``
+delete     ``DELETE /api/tasks/{id}``
+=========  ===================================
+
+Requests are sent on a fixed schedule whether or not earlier ones have
+finished (an open loop), and latency is measured from the scheduled send
+time. A server that falls behind therefore shows it in the percentiles,
+instead of quietly being sent fewer requests. No two requests work on the
+same task at once, so the only expected status codes are successes.
+
+Prints throughput, errors and latency percentiles per rate and scenario.
+``--json`` writes them, with the commit and settings, and ``--compare``
+checks a run against such a file, for example one from the previous
+commit::
+
+    python -m benchmarks.loadtest --rate 50 100 --json before.json
+    git checkout my-branch
+    python -m benchmarks.loadtest --rate 50 100 --compare before.json --max-regression 20
+
+Usage::
+
+    python -m benchmarks.loadtest [--target uvicorn|inprocess] [--async-database]
+        [--users 20] [--tasks 50] [--rate 50 100 200] [--duration 10]
+        [--mix list=60,create=15,toggle=15,delete=5,signin=5] [--seed 1]
+        [--json PATH] [--compare PATH] [--max-regression PERCENT]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from .load import BACKEND_DIR, free_port, start_server
+from .signin import percentile
+
+
+PASSWORD = "password123"
+DEFAULT_MIX = "list=60,create=15,toggle=15,delete=5,signin=5"
+# Tasks per seeding request (the API's BATCH_MAX_ITEMS default).
+SEED_BATCH = 500
+
+
+class VirtualUser:
+    """A seeded account and the IDs of its tasks that no request is using."""
+
+    def __init__(self, email: str, headers: dict[str, str], task_ids: list[int]) -> None:
+        self.email = email
+        self.headers = headers
+        self.task_ids = task_ids
+
+    def take_task(self, rng: random.Random) -> Optional[int]:
+        """Remove and return a random task ID, or None if there is none free."""
+        if not self.task_ids:
+            return None
+        index = rng.randrange(len(self.task_ids))
+        self.task_ids[index], self.task_ids[-1] = self.task_ids[-1], self.task_ids[index]
+        return self.task_ids.pop()
+
+
+async def signin(client: httpx.AsyncClient, user: VirtualUser, rng: random.Random):
+    return await client.post(
+        "/api/auth/signin", json={"email": user.email, "password": PASSWORD}
+    )
+
+
+async def list_tasks(client: httpx.AsyncClient, user: VirtualUser, rng: random.Random):
+    return await client.get("/api/tasks", params={"limit": 50}, headers=user.headers)
+
+
+async def create(client: httpx.AsyncClient, user: VirtualUser, rng: random.Random):
+    response = await client.post(
+        "/api/tasks", json={"title": "Load test task"}, headers=user.headers
+    )
+    if response.status_code == 201:
+        user.task_ids.append(response.json()["id"])
+    return response
+
+
+async def toggle(client: httpx.AsyncClient, user: VirtualUser, rng: random.Random):
+    task_id = user.take_task(rng)
+    if task_id is None:
+        return None
+    try:
+        return await client.patch(f"/api/tasks/{task_id}/complete", headers=user.headers)
+    finally:
+        user.task_ids.append(task_id)
+
+
+async def delete(client: httpx.AsyncClient, user: VirtualUser, rng: random.Random):
+    task_id = user.take_task(rng)
+    if task_id is None:
+        return None
+    return await client.delete(f"/api/tasks/{task_id}", headers=user.headers)
+
+
+# A scenario sends one request for a user and returns its response, or None
+# when the user has nothing to do it to (no free task to toggle or delete).
+SCENARIOS = {
+    "signin": signin,
+    "list": list_tasks,
+    "create": create,
+    "toggle": toggle,
+    "delete": delete,
+}
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Parse ``name=weight,...`` into scenario weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})"
+            )
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for {name!r}: {weight!r}")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"negative weight for {name!r}")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+async def seed_users(client: httpx.AsyncClient, users: int, tasks: int) -> list[VirtualUser]:
+    """Sign up ``users`` accounts and give each ``tasks`` tasks."""
+    # Signups queue for the hashing pool; too many at once get 503.
+    slots = asyncio.Semaphore(8)
+
+    async def seed_user(index: int) -> VirtualUser:
+        email = f"load{index}@example.com"
+        async with slots:
+            response = await client.post(
+                "/api/auth/signup", json={"email": email, "password": PASSWORD}
+            )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        task_ids = []
+        for start in range(0, tasks, SEED_BATCH):
+            response = await client.post(
+                "/api/tasks/batch",
+                json={"tasks": [
+                    {"title": f"Task {i}"} for i in range(start, min(tasks, start + SEED_BATCH))
+                ]},
+                headers=headers,
+            )
+            response.raise_for_status()
+            task_ids += [result["id"] for result in response.json()["results"]]
+        return VirtualUser(email, headers, task_ids)
+
+    return list(await asyncio.gather(*(seed_user(i) for i in range(users))))
+
+
+def summarize(latencies: list[float], statuses: dict[str, int], skipped: int) -> dict:
+    """Counts and latency percentiles (milliseconds) for one scenario."""
+    errors = sum(
+        count for status, count in statuses.items()
+        if not (status.isdigit() and 200 <= int(status) < 300)
+    )
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "skipped": skipped,
+        "statuses": dict(sorted(statuses.items())),
+    }
+    if latencies:
+        summary.update({
+            "p50_ms": percentile(latencies, 0.50),
+            "p90_ms": percentile(latencies, 0.90),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": max(latencies) * 1000,
+        })
+    return summary
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    users: list[VirtualUser],
+    mix: dict[str, float],
+    rate: float,
+    duration: float,
+    rng: random.Random
+) -> dict:
+    """Offer ``rate`` requests/sec for ``duration`` seconds and summarize them."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    statuses: dict[str, dict[str, int]] = {name: {} for name in names}
+    skipped = dict.fromkeys(names, 0)
+
+    async def send(name: str, user: VirtualUser, scheduled: float) -> None:
+        try:
+            response = await SCENARIOS[name](client, user, rng)
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        else:
+            if response is None:
+                skipped[name] += 1
+                return
+            status = str(response.status_code)
+        latencies[name].append(time.perf_counter() - scheduled)
+        statuses[name][status] = statuses[name].get(status, 0) + 1
+
+    total = max(1, round(rate * duration))
+    pending = []
+    started = time.perf_counter()
+    for i in range(total):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = rng.choices(names, weights)[0]
+        pending.append(asyncio.ensure_future(send(name, rng.choice(users), scheduled)))
+    # When the client cannot keep up with the schedule, the server is
+    # offered less than --rate; this shows by how much.
+    sending = time.perf_counter() - started
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - started
+
+    scenarios = {
+        name: summarize(latencies[name], statuses[name], skipped[name]) for name in names
+    }
+    combined: dict[str, int] = {}
+    for counts in statuses.values():
+        for status, count in counts.items():
+            combined[status] = combined.get(status, 0) + count
+    scenarios["all"] = summarize(
+        [latency for values in latencies.values() for latency in values],
+        combined,
+        sum(skipped.values()),
+    )
+    completed = scenarios["all"]["requests"] - scenarios["all"]["errors"]
+    return {
+        "rate": rate,
+        "sent": total,
+        "offered_rps": total / sending if sending > 0 else float(total),
+        "throughput_rps": completed / elapsed,
+        "elapsed_s": elapsed,
+        "scenarios": scenarios,
+    }
+
+
+@asynccontextmanager
+async def uvicorn_client(
+    data_dir: str,
+    args: argparse.Namespace,
+    env: dict[str, str]
+) -> AsyncIterator[httpx.AsyncClient]:
+    """A client for the API served by uvicorn on a free port."""
+    port = free_port()
+    server = start_server(args.async_database, data_dir, port, env)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=args.timeout
+        ) as client:
+            yield client
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@asynccontextmanager
+async def inprocess_client(
+    data_dir: str,
+    args: argparse.Namespace,
+    env: dict[str, str]
+) -> AsyncIterator[httpx.AsyncClient]:
+    """A client that calls the app in this process, without HTTP or sockets.
+
+    Settings are read when ``src`` is first imported, so this works once per
+    process.
+    """
+    os.environ.update(env)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(data_dir, 'load.db')}"
+    os.environ["ASYNC_DATABASE"] = "true" if args.async_database else "false"
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=args.timeout,
+        ) as client:
+            yield client
+
+
+def current_commit() -> Optional[str]:
+    """The checked-out commit, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Start the target, seed it and run every rate."""
+    env = {}
+    if args.hash_iterations is not None:
+        env["PASSWORD_HASH_ITERATIONS"] = str(args.hash_iterations)
+    target = inprocess_client if args.target == "inprocess" else uvicorn_client
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        async with target(data_dir, args, env) as client:
+            print(f"Seeding {args.users} users with {args.tasks} tasks each...", file=sys.stderr)
+            users = await seed_users(client, args.users, args.tasks)
+            stages = []
+            for rate in args.rate:
+                print(f"Offering {rate:g} requests/sec for {args.duration:g} s...", file=sys.stderr)
+                stages.append(await run_stage(client, users, args.mix, rate, args.duration, rng))
+    return {
+        "commit": current_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": args.target,
+        "async_database": args.async_database,
+        "config": {
+            "users": args.users,
+            "tasks": args.tasks,
+            "duration": args.duration,
+            "mix": args.mix,
+            "seed": args.seed,
+            "hash_iterations": args.hash_iterations,
+        },
+        "stages": stages,
+    }
+
+
+def print_report(results: dict) -> None:
+    """Print one block per rate with a line per scenario."""
+    for stage in results["stages"]:
+        print(
+            f"\nRate {stage['rate']:g}/s: offered {stage['offered_rps']:,.1f}/s, "
+            f"throughput {stage['throughput_rps']:,.1f}/s"
+        )
+        print(
+            f"{'Scenario':<9} {'Requests':>9} {'Errors':>7} {'Skipped':>8} {'p50 ms':>8} "
+            f"{'p90 ms':>8} {'p99 ms':>8} {'Max ms':>8}"
+        )
+        print("-" * 72)
+        for name, summary in stage["scenarios"].items():
+            figures = "".join(
+                f" {summary[key]:>8.1f}" if key in summary else f" {'-':>8}"
+                for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+            )
+            print(
+                f"{name:<9} {summary['requests']:>9} {summary['errors']:>7} "
+                f"{summary['skipped']:>8}{figures}"
+            )
+
+
+def compare(baseline: dict, results: dict, max_regression: Optional[float]) -> bool:
+    """Print changes from ``baseline``; False if any exceeds ``max_regression`` percent."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} (p99 and throughput change):")
+    if baseline.get("config") != results["config"] or baseline.get("target") != results["target"]:
+        print("  warning: the runs used different settings", file=sys.stderr)
+    stages = {stage["rate"]: stage for stage in baseline["stages"]}
+    passed = True
+    for stage in results["stages"]:
+        before = stages.get(stage["rate"])
+        if before is None:
+            continue
+        checks = [(
+            f"rate {stage['rate']:g} throughput",
+            before["throughput_rps"], stage["throughput_rps"], -1,
+        )]
+        for name, summary in stage["scenarios"].items():
+            previous = before["scenarios"].get(name, {})
+            if "p99_ms" in summary and "p99_ms" in previous:
+                checks.append((
+                    f"rate {stage['rate']:g} {name} p99",
+                    previous["p99_ms"], summary["p99_ms"], 1,
+                ))
+        for label, old, new, worse in checks:
+            change = (new - old) / old * 100 if old else 0.0
+            regressed = max_regression is not None and change * worse > max_regression
+            passed = passed and not regressed
+            print(
+                f"  {label:<32} {old:>10.1f} -> {new:>10.1f} "
+                f"({change:+.1f}%){'  REGRESSION' if regressed else ''}"
+            )
+    return passed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the load test, report it and optionally save or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["uvicorn", "inprocess"], default="uvicorn")
+    parser.add_argument("--async-database", action="store_true")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks seeded per user")
+    parser.add_argument("--rate", type=float, nargs="+", default=[50.0, 100.0, 200.0],
+                        help="Requests/sec to offer, one stage each")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per rate")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the request mix")
+    parser.add_argument("--connections", type=int, default=100,
+                        help="Most open connections to uvicorn")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds per request")
+    parser.add_argument("--hash-iterations", type=int,
+                        help="PASSWORD_HASH_ITERATIONS for the server (default: its own)")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float,
+                        help="Exit with status 1 if a p99 or throughput is this many percent worse")
+    args = parser.parse_args(argv)
+    if args.users < 1 or any(rate <= 0 for rate in args.rate):
+        parser.error("--users and --rate must be positive")
+
+    results = asyncio.run(run(args))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+    if args.compare:
+        with open(args.compare) as baseline:
+            if not compare(json.load(baseline), results, args.max_regression):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
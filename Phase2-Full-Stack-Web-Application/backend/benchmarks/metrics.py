@@ -0,0 +1,108 @@
+"""Metrics middleware overhead: time added per request.
+
+Calls a minimal ASGI app directly, without a server or the framework, so
+the only difference between the two runs is ``MetricsMiddleware`` itself:
+timing, the contextvar, the Server-Timing header and the histogram update.
+Also times the SQL event hooks on an in-memory SQLite engine.
+
+Usage::
+
+    python -m benchmarks.metrics [--requests 200000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+ROUTE = SimpleNamespace(path="/api/tasks/{task_id}")
+
+
+async def endpoint(scope, receive, send) -> None:
+    """Answer like a small JSON route, with the route set as FastAPI does."""
+    scope["route"] = ROUTE
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", b"2")],
+    })
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message) -> None:
+    pass
+
+
+async def time_app(app, requests: int) -> float:
+    """Seconds per request for ``app``, best of three runs."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(requests):
+            scope = {"type": "http", "method": "GET", "query_string": b"", "headers": []}
+            await app(scope, receive, send)
+        best = min(best, (time.perf_counter() - started) / requests)
+    return best
+
+
+def time_statements(statements: int) -> tuple[float, float]:
+    """Seconds per ``SELECT 1`` without and with the SQL hooks charging a request."""
+    from sqlalchemy import create_engine, text
+
+    from src.metrics import RequestTimings, _current, instrument_engine
+
+    results = []
+    for instrumented in (False, True):
+        engine = create_engine("sqlite://")
+        if instrumented:
+            instrument_engine(engine)
+        token = _current.set(RequestTimings())
+        try:
+            with engine.connect() as connection:
+                statement = text("SELECT 1")
+                best = float("inf")
+                for _ in range(3):
+                    started = time.perf_counter()
+                    for _ in range(statements):
+                        connection.execute(statement)
+                    best = min(best, (time.perf_counter() - started) / statements)
+        finally:
+            _current.reset(token)
+        results.append(best)
+    return results[0], results[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the overhead."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--statements", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BACKEND_DIR)
+    from src.metrics import MetricsMiddleware, RequestMetrics
+
+    bare = asyncio.run(time_app(endpoint, args.requests))
+    wrapped = asyncio.run(time_app(
+        MetricsMiddleware(endpoint, metrics=RequestMetrics()), args.requests
+    ))
+    plain_sql, hooked_sql = time_statements(args.statements)
+
+    print(f"Bare app:              {bare * 1e6:8.2f} us/request")
+    print(f"With MetricsMiddleware: {wrapped * 1e6:7.2f} us/request")
+    print(f"Middleware overhead:   {(wrapped - bare) * 1e6:8.2f} us/request")
+    print(f"SQL hook overhead:     {(hooked_sql - plain_sql) * 1e6:8.2f} us/statement")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
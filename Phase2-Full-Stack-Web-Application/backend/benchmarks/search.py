@@ -0,0 +1,143 @@
+"""Task search benchmark: full-text index vs substring scan.
+
+Seeds a temporary SQLite database (or ``--database-url``) with one user's
+tasks built from a fixed vocabulary, plus another user's, and times
+``TaskService.search_tasks`` against ``get_user_tasks(q=...)``'s
+``LIKE '%q%'`` scan for queries of different selectivity. Reports p50/p99
+latency and the number of matches for each.
+
+Usage::
+
+    python -m benchmarks.search [--tasks 100000] [--queries 50]
+        [--database-url postgresql://...]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+COMMON = ["buy", "call", "email", "review", "fix", "plan", "book", "pay", "clean", "write"]
+OBJECTS = [
+    "groceries", "milk", "report", "invoice", "dentist", "flights", "garden", "taxes",
+    "presentation", "birthday", "meeting", "car", "laundry", "budget", "newsletter",
+]
+RARE = ["zeppelin", "quokka", "harpsichord", "xylophone", "kumquat"]
+
+# name -> (query, fraction of tasks it is expected to match, roughly)
+QUERIES = {
+    "common word": "buy",
+    "two prefixes": "rev pres",
+    "rare word": "quokka",
+    "no match": "nonexistent",
+}
+
+
+def task_text(rng: random.Random) -> tuple[str, str]:
+    """A random task title and description."""
+    title = f"{rng.choice(COMMON)} {rng.choice(OBJECTS)}"
+    words = rng.sample(OBJECTS, 4)
+    if rng.random() < 0.001:
+        words.append(rng.choice(RARE))
+    return title, f"Remember the {' and '.join(words)} before {rng.choice(COMMON)}ing"
+
+
+def timings(fn, repeat: int) -> tuple[float, float, int]:
+    """p50 and p99 of ``repeat`` calls in milliseconds, and the result size."""
+    samples = []
+    result = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return (
+        samples[len(samples) // 2] * 1000,
+        samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        len(result),
+    )
+
+
+def run(tasks: int, repeat: int, limit: int) -> dict[str, dict[str, tuple]]:
+    """Seed the database and time each query both ways."""
+    # Imported here so the app picks up the chosen DATABASE_URL.
+    from sqlalchemy import insert
+    from sqlmodel import Session
+
+    from src.database import create_db_and_tables, engine
+    from src.models.task import Task
+    from src.models.user import User
+    from src.search import search_backend
+    from src.services.task_service import TaskService
+
+    create_db_and_tables()
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        users = [User(email=f"search{i}@example.com", password_hash="x") for i in range(2)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [user.id for user in users]
+        for user_id in user_ids:
+            for offset in range(0, tasks, 10000):
+                rows = []
+                for i in range(offset, min(tasks, offset + 10000)):
+                    title, description = task_text(rng)
+                    rows.append({
+                        "user_id": user_id, "title": title, "description": description,
+                        "is_complete": False, "priority": 1,
+                        "created_at": start + timedelta(seconds=i),
+                        "updated_at": start + timedelta(seconds=i),
+                    })
+                session.exec(insert(Task.__table__), params=rows)
+            session.commit()
+
+    print(f"Search backend: {search_backend(engine)}", file=sys.stderr)
+    results = {}
+    with Session(engine) as session:
+        for name, q in QUERIES.items():
+            results[name] = {
+                "search": timings(
+                    lambda: TaskService.search_tasks(session, user_ids[0], q, limit), repeat
+                ),
+                "like": timings(
+                    lambda: TaskService.get_user_tasks(session, user_ids[0], limit, q=q)[0],
+                    max(3, repeat // 10)
+                ),
+            }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000, help="Tasks per user")
+    parser.add_argument("--queries", type=int, default=50, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["DATABASE_URL"] = (
+            args.database_url or f"sqlite:///{os.path.join(data_dir, 'search.db')}"
+        )
+        sys.path.insert(0, BACKEND_DIR)
+        results = run(args.tasks, args.queries, args.limit)
+
+    print(f"{args.tasks:,} tasks per user, top {args.limit} results")
+    print(f"{'Query':<14} {'Method':<7} {'p50 ms':>8} {'p99 ms':>8} {'Rows':>5}")
+    print("-" * 46)
+    for name, methods in results.items():
+        for method, (p50, p99, rows) in methods.items():
+            print(f"{name:<14} {method:<7} {p50:>8.2f} {p99:>8.2f} {rows:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
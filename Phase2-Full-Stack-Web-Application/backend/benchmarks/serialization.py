@@ -0,0 +1,153 @@
+"""Task list serialization benchmark: response_model vs the fast path.
+
+Seeds a temporary SQLite database with one user's tasks and compares the
+two ways of answering ``GET /api/tasks``:
+
+* before: load ORM ``Task`` objects and let FastAPI validate them against
+  ``response_model=list[TaskRead]`` and encode them with ``json``;
+* after: load a column projection (``TaskService.get_user_tasks``) and
+  encode the rows directly with ``serialization.json_response``.
+
+For each it reports the best time to fetch the tasks and to serialize them
+(through a real FastAPI route, so validation is included), and the peak
+memory allocated while serializing.
+
+Usage::
+
+    python -m benchmarks.serialization [--tasks 10000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    """Best wall time of ``repeat`` calls, in milliseconds, with GC paused."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return min(times) * 1000
+
+
+def peak_allocated(fn: Callable[[], object]) -> float:
+    """Peak memory allocated while ``fn`` runs, in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run(tasks: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Seed the database and measure both paths."""
+    # Imported here so the app picks up the temporary DATABASE_URL.
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+
+    from src.database import create_db_and_tables, engine
+    from src.models.task import Task, TaskRead
+    from src.models.user import User
+    from src.serialization import json_response
+    from src.services.task_service import TaskService
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        user = User(email="bench@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        start = datetime(2024, 1, 1)
+        session.exec(insert(Task.__table__), params=[
+            {"user_id": user_id, "title": f"Task {i}", "description": "Benchmark task",
+             "is_complete": i % 3 == 0, "created_at": start + timedelta(milliseconds=i * 250),
+             "updated_at": start + timedelta(seconds=i)}
+            for i in range(tasks)
+        ])
+        session.commit()
+
+    def fetch_orm() -> list[Task]:
+        with Session(engine) as session:
+            statement = select(Task).where(Task.user_id == user_id).order_by(
+                Task.created_at.desc(), Task.id.desc()
+            )
+            return list(session.exec(statement).all())
+
+    def fetch_rows() -> list:
+        with Session(engine) as session:
+            return TaskService.get_user_tasks(session, user_id)[0]
+
+    orm_tasks = fetch_orm()
+    rows = fetch_rows()
+
+    app = FastAPI()
+
+    @app.get("/before", response_model=list[TaskRead])
+    def before():
+        return orm_tasks
+
+    @app.get("/after", response_model=list[TaskRead])
+    def after():
+        return json_response([row._asdict() for row in rows])
+
+    results = {}
+    with TestClient(app) as client:
+        bodies = {path: client.get(f"/{path}").content for path in ("before", "after")}
+        if bodies["before"] != bodies["after"]:
+            raise AssertionError("The two paths produced different JSON")
+        for path, fetch in (("before", fetch_orm), ("after", fetch_rows)):
+            results[path] = {
+                "fetch_ms": best_time(fetch, repeat),
+                "serialize_ms": best_time(lambda: client.get(f"/{path}"), repeat),
+                "serialize_peak_mib": peak_allocated(lambda: client.get(f"/{path}")),
+                "bytes": len(bodies[path]),
+            }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10000, help="Tasks in the response")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds; the best is kept")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(data_dir, 'bench.db')}"
+        sys.path.insert(0, BACKEND_DIR)
+        results = run(args.tasks, args.repeat)
+
+    print(f"{args.tasks:,} tasks, {results['after']['bytes']:,} bytes of JSON")
+    print(f"{'Path':<7} {'Fetch ms':>9} {'Serialize ms':>13} {'Peak MiB':>9}")
+    print("-" * 41)
+    for path, figures in results.items():
+        print(
+            f"{path:<7} {figures['fetch_ms']:>9.1f} {figures['serialize_ms']:>13.1f} "
+            f"{figures['serialize_peak_mib']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Sign-in benchmark: hashing in the threadpool vs a process pool.
+
+Starts the API under uvicorn (one worker process) once per hashing setup:
+``PASSWORD_HASH_WORKERS=0`` hashes in the threadpool, as before hashing had
+its own pool, and the other runs use that many worker processes. Each run
+measures
+
+* sign-in throughput with ``--signins`` concurrent clients, and
+* ``GET /api/tasks`` latency, first on an idle server and then while the
+  same sign-in storm is running.
+
+Requests refused with 503 while the hashing pool is saturated are counted
+separately from other errors.
+
+Usage::
+
+    python -m benchmarks.signin [--workers 0 2] [--signins 32]
+        [--readers 4] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+import httpx
+
+from .load import free_port, seed, start_server
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """The ``fraction`` percentile of ``samples``, in milliseconds."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+async def loop_requests(
+    client: httpx.AsyncClient,
+    request: dict,
+    deadline: float,
+    latencies: list[float],
+    statuses: dict[int, int]
+) -> None:
+    """Send ``request`` repeatedly until ``deadline``."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.request(**request)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run_phase(
+    base_url: str,
+    headers: dict[str, str],
+    signins: int,
+    readers: int,
+    duration: float
+) -> dict[str, float]:
+    """Run ``signins`` sign-in clients alongside ``readers`` task readers."""
+    signin = {
+        "method": "POST",
+        "url": "/api/auth/signin",
+        "json": {"email": "load@example.com", "password": "password123"},
+    }
+    read = {"method": "GET", "url": "/api/tasks", "params": {"limit": 50}, "headers": headers}
+    signin_latencies: list[float] = []
+    read_latencies: list[float] = []
+    signin_statuses: dict[int, int] = {}
+    read_statuses: dict[int, int] = {}
+    limits = httpx.Limits(max_connections=signins + readers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(loop_requests(client, signin, deadline, signin_latencies, signin_statuses)
+              for _ in range(signins)),
+            *(loop_requests(client, read, deadline, read_latencies, read_statuses)
+              for _ in range(readers)),
+        )
+
+    return {
+        "signins_per_sec": signin_statuses.get(200, 0) / duration,
+        "signin_503": signin_statuses.get(503, 0),
+        "signin_errors": sum(
+            count for code, count in signin_statuses.items() if code not in (200, 503)
+        ),
+        "read_p50_ms": percentile(read_latencies, 0.5),
+        "read_p99_ms": percentile(read_latencies, 0.99),
+        "read_errors": sum(count for code, count in read_statuses.items() if code != 200),
+    }
+
+
+async def bench_workers(workers: int, args: argparse.Namespace) -> dict[str, dict]:
+    """Benchmark one hashing setup: idle reads, then reads under a storm."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    extra_env = {
+        "PASSWORD_HASH_WORKERS": str(workers),
+        "PASSWORD_HASH_QUEUE": str(args.queue),
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = start_server(False, data_dir, port, extra_env)
+        try:
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                headers = await seed(client, args.tasks)
+            return {
+                "idle": await run_phase(base_url, headers, 0, args.readers, args.duration),
+                "storm": await run_phase(
+                    base_url, headers, args.signins, args.readers, args.duration
+                ),
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark for each hashing setup and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2],
+                        help="PASSWORD_HASH_WORKERS values to compare")
+    parser.add_argument("--queue", type=int, default=32, help="PASSWORD_HASH_QUEUE")
+    parser.add_argument("--signins", type=int, default=32, help="Concurrent sign-in clients")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent task readers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks seeded for the user")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for workers in args.workers:
+        print(f"Benchmarking PASSWORD_HASH_WORKERS={workers}...", file=sys.stderr)
+        results[workers] = asyncio.run(bench_workers(workers, args))
+
+    print(
+        f"{'Workers':>7} {'Phase':<6} {'Signin/s':>9} {'503s':>6} {'Errors':>7} "
+        f"{'Read p50':>9} {'Read p99':>9}"
+    )
+    print("-" * 59)
+    for workers, phases in results.items():
+        for phase, figures in phases.items():
+            print(
+                f"{workers:>7} {phase:<6} {figures['signins_per_sec']:>9.1f} "
+                f"{figures['signin_503']:>6} "
+                f"{figures['signin_errors'] + figures['read_errors']:>7} "
+                f"{figures['read_p50_ms']:>9.1f} {figures['read_p99_ms']:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
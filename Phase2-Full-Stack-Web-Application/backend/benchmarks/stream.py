@@ -0,0 +1,136 @@
+"""Task stream benchmark: idle connection cost and fan-out latency.
+
+Starts the API under uvicorn (one worker process) on a temporary SQLite
+database, opens ``--connections`` idle ``/api/tasks/stream`` connections
+for one user and reports the server's resident memory per connection.
+It then changes a task ``--changes`` times and reports how long the event
+takes to reach the first, median and last subscriber.
+
+Usage::
+
+    python -m benchmarks.stream [--connections 5000] [--changes 5]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+import httpx
+
+from .load import free_port, start_server
+
+
+def rss_kib(pid: int) -> int:
+    """Resident memory of a process, from /proc (Linux only)."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+async def open_stream(port: int, token: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open an SSE connection and wait for its first frame."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET /api/tasks/stream?access_token={token} HTTP/1.1\r\n"
+        f"Host: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await reader.readuntil(b": connected\n\n")
+    return reader, writer
+
+
+async def wait_for_event(reader: asyncio.StreamReader, started: list[float]) -> float:
+    """Seconds from the change being sent until this stream sees it."""
+    await reader.readuntil(b"event: toggled\n")
+    return time.perf_counter() - started[0]
+
+
+async def bench(args: argparse.Namespace) -> dict[str, float]:
+    """Open the connections, measure memory, then time the fan-out."""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = start_server(args.async_database, data_dir, port)
+        streams = []
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                response = await client.post(
+                    "/api/auth/signup",
+                    json={"email": "stream@example.com", "password": "password123"}
+                )
+                token = response.json()["token"]
+                headers = {"Authorization": f"Bearer {token}"}
+                task_id = (await client.post(
+                    "/api/tasks", json={"title": "Watched"}, headers=headers
+                )).json()["id"]
+
+                # One warm-up stream, so per-connection memory excludes first-use costs.
+                streams.append(await open_stream(port, token))
+                baseline = rss_kib(server.pid)
+                for start in range(0, args.connections, 500):
+                    streams += await asyncio.gather(*(
+                        open_stream(port, token)
+                        for _ in range(min(500, args.connections - start))
+                    ))
+                opened = len(streams) - 1
+                per_connection = (rss_kib(server.pid) - baseline) * 1024 / opened
+
+                latencies = {"first": [], "median": [], "last": []}
+                for _ in range(args.changes):
+                    started = [0.0]
+                    waits = [
+                        asyncio.ensure_future(wait_for_event(reader, started))
+                        for reader, _ in streams
+                    ]
+                    started[0] = time.perf_counter()
+                    await client.patch(f"/api/tasks/{task_id}/complete", headers=headers)
+                    arrivals = sorted(await asyncio.gather(*waits))
+                    latencies["first"].append(arrivals[0])
+                    latencies["median"].append(arrivals[len(arrivals) // 2])
+                    latencies["last"].append(arrivals[-1])
+                stats = (await client.get("/health/stream")).json()
+        finally:
+            # uvicorn waits for open streams before it exits.
+            for _, writer in streams:
+                writer.close()
+            await asyncio.gather(
+                *(writer.wait_closed() for _, writer in streams), return_exceptions=True
+            )
+            server.terminate()
+            server.wait()
+
+    return {
+        "connections": opened,
+        "subscriptions": stats["subscriptions"],
+        "bytes_per_connection": per_connection,
+        **{
+            f"{name}_ms": sorted(values)[len(values) // 2] * 1000
+            for name, values in latencies.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and print the figures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--changes", type=int, default=5, help="Task changes to time")
+    parser.add_argument("--async-database", action="store_true")
+    args = parser.parse_args(argv)
+
+    print(f"Opening {args.connections} streams...", file=sys.stderr)
+    figures = asyncio.run(bench(args))
+
+    print(f"Idle connections:       {figures['connections']:,}")
+    print(f"Server subscriptions:   {figures['subscriptions'] - 1:,} (+1 warm-up)")
+    print(f"Server RSS/connection:  {figures['bytes_per_connection'] / 1024:.1f} KiB")
+    print("Change to event (median of runs):")
+    for name in ("first", "median", "last"):
+        print(f"  {name:<7} subscriber {figures[f'{name}_ms']:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
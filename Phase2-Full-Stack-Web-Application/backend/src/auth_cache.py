@@ -0,0 +1,130 @@
+"""In-process cache of authenticated principals.
+
+Resolving a bearer token means verifying the JWT signature and loading the
+user row. Both results are cached here, keyed by a SHA-256 digest of the
+token so raw tokens are never kept in memory. Entries live for at most
+``auth_cache_ttl`` seconds and never past the token's own expiry, and the
+cache holds at most ``auth_cache_size`` entries, evicting the least
+recently used.
+
+Changes to a user made through the ORM invalidate that user's entries in
+this process. Other workers, and writes that bypass the ORM, are only
+seen once entries expire, so the TTL bounds how stale a principal can be.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from .config import get_settings
+from .models.user import User
+
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """A verified token's claims and the user it belongs to."""
+    claims: dict
+    user: User
+
+
+class PrincipalCache:
+    """Bounded LRU cache of principals with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # digest -> (expires at, on the monotonic clock; principal)
+        self._entries: OrderedDict[bytes, tuple[float, Principal]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Return the cached principal for a token, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, principal: Principal) -> None:
+        """Cache a principal until the TTL or the token's ``exp`` passes."""
+        if not self.enabled:
+            return
+        lifetime = self.ttl
+        expires = principal.claims.get("exp")
+        if isinstance(expires, (int, float)):
+            lifetime = min(lifetime, expires - time.time())
+        if lifetime <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached principal for a user."""
+        with self._lock:
+            stale = [
+                key for key, (_expires, principal) in self._entries.items()
+                if principal.user.id == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(settings.auth_cache_size, settings.auth_cache_ttl)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    principal_cache.invalidate_user(target.id)
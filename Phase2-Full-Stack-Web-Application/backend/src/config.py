@@ -12,6 +12,48 @@ class Settings(BaseSettings):
     jwt_secret: str = "dev-secret-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_days: int = 7
+    # Use an async driver (aiosqlite / asyncpg) and AsyncSession per request
+    async_database: bool = False
+    
+    # Verified-token cache (per worker process); 0 disables it
+    auth_cache_size: int = 10000
+    auth_cache_ttl: float = 60.0  # seconds
+    
+    # Password hashing: PBKDF2 iterations for new hashes, worker processes,
+    # and jobs allowed to wait for a worker before signups/signins get a 503
+    password_hash_iterations: int = 100000
+    password_hash_workers: int = 2
+    password_hash_queue: int = 32
+    password_hash_retry_after: int = 1  # seconds
+    
+    # Task change streams: events queued per client before it is dropped,
+    # and seconds between keep-alive comments on an idle SSE stream
+    stream_queue_size: int = 100
+    stream_heartbeat: float = 15.0
+    
+    # Days deleted tasks are remembered for delta sync; clients that have
+    # not synced for longer must do a full sync
+    tombstone_retention_days: int = 90
+    
+    # Request profiling: requests with ?profile=1 and this token in an
+    # X-Profile-Token header get a sampling profile; empty disables it
+    profile_token: str = ""
+    profile_interval: float = 0.001  # seconds between samples
+    
+    # Largest number of items accepted by one batch request
+    batch_max_items: int = 500
+    
+    # Connection pool (per engine, per worker process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds; -1 keeps connections forever
+    db_pool_pre_ping: bool = True
+    
+    # SQLite tuning, applied to every new connection
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
     
     class Config:
         env_file = ".env"
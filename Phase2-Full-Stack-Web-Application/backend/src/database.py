@@ -1,30 +1,179 @@
 """Database configuration and session management."""
 
-from sqlmodel import SQLModel, create_engine, Session
-from typing import Generator
-from .config import get_settings
+from collections.abc import AsyncGenerator, Callable
+from typing import Generator, TypeVar, Union
+
+from anyio import to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import Settings, get_settings
+from .metrics import instrument_engine
+from .migrations import migrate
+from .pool import InstrumentedAsyncPool, InstrumentedQueuePool, pool_status
 
 
 settings = get_settings()
 
-# SQLite needs check_same_thread=False for FastAPI
-connect_args = {}
-if settings.database_url.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
 
-engine = create_engine(
-    settings.database_url,
-    echo=False,
-    connect_args=connect_args
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, config: Settings, asynchronous: bool = False) -> dict:
+    """Build create_engine keyword arguments from the pool settings."""
+    options: dict = {"echo": False}
+    if url.startswith("sqlite"):
+        # SQLite needs check_same_thread=False for FastAPI
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(url):
+            # Each connection would get its own empty in-memory database.
+            return options
+    options.update(
+        poolclass=InstrumentedAsyncPool if asynchronous else InstrumentedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+    return options
+
+
+def configure_sqlite(engine: Engine, config: Settings) -> None:
+    """Apply the SQLite pragmas to every connection the engine opens.
+    
+    WAL lets readers run alongside the single writer, and the busy timeout
+    makes a blocked writer wait instead of failing with "database is
+    locked". ``synchronous=NORMAL`` is durable in WAL mode except for the
+    last transactions before a power loss.
+    """
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}",
+        f"PRAGMA cache_size={-int(config.sqlite_cache_size_kib)}",
+    ]
+    
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url, settings))
+if engine.dialect.name == "sqlite":
+    configure_sqlite(engine, settings)
+instrument_engine(engine)
+
+# A session for one request: an AsyncSession when async_database is on,
+# otherwise a regular Session whose work runs in the threadpool.
+Database = Union[AsyncSession, Session]
+
+T = TypeVar("T")
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL to the matching async driver.
+
+    ``sqlite`` uses aiosqlite and ``postgresql`` uses asyncpg, which spells
+    libpq's ``sslmode`` option as ``ssl``.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+        return parsed.render_as_string(hide_password=False)
+    raise ValueError(f"No async driver configured for '{backend}' databases")
+
+
+def create_async_session_factory(url: str, config: Settings = settings) -> async_sessionmaker:
+    """Create an async engine and a factory for its sessions."""
+    async_url = async_database_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, config, True))
+    if async_engine.dialect.name == "sqlite":
+        configure_sqlite(async_engine.sync_engine, config)
+    instrument_engine(async_engine.sync_engine)
+    # Results are used after commit without reloading, which would need I/O.
+    return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async_session_factory = (
+    create_async_session_factory(settings.database_url)
+    if settings.async_database else None
 )
 
 
+def pool_stats() -> dict[str, dict]:
+    """Live connection pool statistics for each engine in use."""
+    stats = {"sync": pool_status(engine.pool)}
+    if async_session_factory is not None:
+        stats["async"] = pool_status(async_session_factory.kw["bind"].sync_engine.pool)
+    return stats
+
+
 def create_db_and_tables():
-    """Create all database tables."""
-    SQLModel.metadata.create_all(engine)
+    """Create or upgrade the database schema by applying pending migrations."""
+    migrate(engine)
 
 
 def get_session() -> Generator[Session, None, None]:
     """Yield a database session."""
     with Session(engine) as session:
         yield session
+
+
+async def get_db() -> AsyncGenerator[Database, None]:
+    """Yield the configured kind of session for an async route."""
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            yield session
+        return
+
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        await to_thread.run_sync(session.close)
+
+
+async def run_sync(db: Database, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Await ``fn(session, *args, **kwargs)`` without blocking the event loop.
+    
+    With an AsyncSession the function runs on the async driver through
+    ``AsyncSession.run_sync``; with a sync Session it runs in the threadpool.
+    This lets the async services reuse the sync query code unchanged.
+    
+    Each call is its own unit of work: the session is closed afterwards,
+    returning its connection to the pool while the request awaits anything
+    else. Returned objects stay loaded but are detached. Holding connections
+    across awaits would let waiting requests exhaust the pool (and, in sync
+    mode, the threadpool) and stall the requests that hold them.
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await db.close()
+    
+    def call() -> T:
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+    
+    return await to_thread.run_sync(call)
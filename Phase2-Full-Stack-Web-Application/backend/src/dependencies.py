@@ -1,33 +1,40 @@
 """Dependencies for route protection."""
 
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session
-from .database import get_session
-from .services.auth_service import AuthService
+from .auth_cache import Principal, principal_cache
+from .database import Database, get_db
+from .services.auth_service import AsyncAuthService, AuthService
 from .models.user import User
 
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    session: Annotated[Session, Depends(get_session)]
-) -> User:
-    """Get the current authenticated user from JWT token."""
-    token = credentials.credentials
-    user_id = AuthService.verify_token(token)
+async def authenticate(token: str, db: Database) -> User:
+    """Resolve a JWT to its user.
+    
+    Verified tokens are remembered in the principal cache, so repeat
+    requests skip both the signature check and the user lookup.
+    
+    Raises:
+        HTTPException: 401 if the token is invalid or its user is gone.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal.user
     
-    if user_id is None:
+    claims = AuthService.decode_token(token)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = AuthService.get_user_by_id(session, user_id)
+    user = await AsyncAuthService.get_user_by_id(db, int(claims["sub"]))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,4 +42,33 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    principal_cache.put(token, Principal(claims=claims, user=user))
     return user
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[Database, Depends(get_db)]
+) -> User:
+    """Get the current authenticated user from JWT token."""
+    return await authenticate(credentials.credentials, db)
+
+
+async def get_stream_user(
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(optional_security)],
+    db: Annotated[Database, Depends(get_db)],
+    access_token: Annotated[Optional[str], Query()] = None
+) -> User:
+    """Get the current user from the bearer token or an ``access_token`` query.
+    
+    Browsers cannot set headers on ``EventSource`` or WebSocket requests,
+    so streams also accept the token in the URL.
+    """
+    token = credentials.credentials if credentials is not None else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await authenticate(token, db)
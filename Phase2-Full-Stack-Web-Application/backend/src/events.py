@@ -0,0 +1,170 @@
+"""In-process fan-out of task changes to streaming clients.
+
+``TaskService`` publishes an event after every committed task change, and
+each open ``/api/tasks/stream`` connection holds a ``Subscription`` for its
+user. An event is encoded to JSON once and the same bytes are handed to
+every subscriber, so fan-out costs one list append per connection.
+
+Every subscription queues at most ``stream_queue_size`` events. A client
+that falls that far behind is dropped rather than buffered without bound:
+its stream ends with an ``overflow`` event, and it should reconnect and
+refetch the task list (a conditional GET with its last ETag costs little).
+
+The hub lives in one worker process, so a client only hears about changes
+made through the same worker. Run a single worker per stream endpoint, or
+put a shared broker in front of the hubs, when scaling out.
+"""
+
+import asyncio
+import threading
+from typing import Any, Optional
+
+from .config import get_settings
+from .serialization import dumps
+
+
+settings = get_settings()
+
+# A queued event: its type and its JSON encoding, shared by all subscribers.
+Message = tuple[str, bytes]
+
+
+class Subscription:
+    """One client's bounded queue of pending events.
+
+    Owned by the event loop that created it: ``offer`` and ``get`` must run
+    there (the hub takes care of that for events published from threads).
+    """
+
+    __slots__ = ("user_id", "loop", "max_queue", "dropped", "_pending", "_waiter")
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, max_queue: int) -> None:
+        self.user_id = user_id
+        self.loop = loop
+        self.max_queue = max_queue
+        self.dropped = False
+        self._pending: list[Message] = []
+        self._waiter: Optional[asyncio.Future] = None
+
+    def offer(self, message: Message) -> None:
+        """Queue an event, or drop the subscription if its queue is full."""
+        if self.dropped:
+            return
+        if len(self._pending) >= self.max_queue:
+            self.dropped = True
+            self._pending = []
+        else:
+            self._pending.append(message)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[list[Message]]:
+        """Wait for events and take all that are pending.
+
+        Returns:
+            The pending events, oldest first; an empty list if ``timeout``
+            seconds passed without any; None once the subscription has
+            been dropped.
+        """
+        if not self._pending and not self.dropped:
+            self._waiter = self.loop.create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiter = None
+        if self.dropped:
+            return None
+        messages, self._pending = self._pending, []
+        return messages
+
+
+class TaskEventHub:
+    """Routes task events to the subscriptions of the user they belong to."""
+
+    def __init__(self, max_queue: int) -> None:
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Start receiving a user's events; call from the consuming event loop."""
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering to a subscription (safe to call twice)."""
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def has_subscribers(self, user_id: int) -> bool:
+        """Whether anyone is listening, so publishers can skip building events."""
+        return user_id in self._subscribers
+
+    def publish(self, user_id: int, event_type: str, payload: dict[str, Any]) -> None:
+        """Send an event to every subscription of a user.
+
+        Safe to call from any thread. Subscriptions on the calling thread's
+        event loop get the event straight away; others are handed it with
+        one ``call_soon_threadsafe`` per loop.
+        """
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+            if not subscriptions:
+                return
+            self.published += 1
+        message = (event_type, dumps({"type": event_type, **payload}))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        by_loop: dict[asyncio.AbstractEventLoop, list[Subscription]] = {}
+        for subscription in subscriptions:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, targets in by_loop.items():
+            if loop is running:
+                self._deliver(targets, message)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(self._deliver, targets, message)
+
+    def _deliver(self, subscriptions: list[Subscription], message: Message) -> None:
+        for subscription in subscriptions:
+            was_dropped = subscription.dropped
+            subscription.offer(message)
+            if subscription.dropped:
+                self.dropped += not was_dropped
+            else:
+                self.delivered += 1
+
+    def stats(self) -> dict[str, int]:
+        """Open subscriptions and event counters."""
+        with self._lock:
+            subscriptions = sum(len(subs) for subs in self._subscribers.values())
+            users = len(self._subscribers)
+        return {
+            "subscriptions": subscriptions,
+            "users": users,
+            "max_queue": self.max_queue,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+def sse_frame(message: Message) -> bytes:
+    """Encode an event for a ``text/event-stream`` response."""
+    event_type, data = message
+    return b"event: " + event_type.encode() + b"\ndata: " + data + b"\n\n"
+
+
+task_events = TaskEventHub(settings.stream_queue_size)
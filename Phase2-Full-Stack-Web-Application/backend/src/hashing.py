@@ -0,0 +1,164 @@
+"""PBKDF2 password hashing off the event loop, with admission control.
+
+Hashes are stored as ``pbkdf2_sha256$<iterations>$<salt>$<hex digest>`` so
+each one records its own work factor; raising the configured iteration
+count only affects new hashes, and old ones are upgraded on the next
+successful sign-in. Hashes from before the format existed (``salt$digest``)
+used 100,000 iterations.
+
+PBKDF2 holds the GIL for most of its run, so hashing in threads would still
+stall the worker's event loop. ``PasswordHasher`` runs it in a small pool
+of processes instead and admits at most ``workers + max_queue`` jobs at a
+time; beyond that it raises ``HasherBusyError`` so the request can be
+refused quickly rather than queueing without bound.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from anyio import to_thread
+
+
+ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 100000
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing pool is saturated."""
+
+
+def parse_hash(hashed_password: str) -> tuple[int, str, str]:
+    """Split a stored hash into (iterations, salt, hex digest).
+
+    Raises:
+        ValueError: If the hash is in neither known format.
+    """
+    parts = hashed_password.split("$")
+    if len(parts) == 2:
+        salt, digest = parts
+        return LEGACY_ITERATIONS, salt, digest
+    if len(parts) == 4 and parts[0] == ALGORITHM:
+        return int(parts[1]), parts[2], parts[3]
+    raise ValueError("Unknown password hash format")
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations
+    ).hex()
+
+
+def hash_password(password: str, iterations: int) -> str:
+    """Hash a password with a new random salt."""
+    salt = secrets.token_hex(16)
+    return f"{ALGORITHM}${iterations}${salt}${_pbkdf2(password, salt, iterations)}"
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash in either format."""
+    try:
+        iterations, salt, digest = parse_hash(hashed_password)
+    except ValueError:
+        return False
+    return hmac.compare_digest(_pbkdf2(plain_password, salt, iterations), digest)
+
+
+def needs_rehash(hashed_password: str, iterations: int) -> bool:
+    """Whether a hash is in the legacy format or below ``iterations``."""
+    try:
+        stored_iterations = parse_hash(hashed_password)[0]
+    except ValueError:
+        return True
+    return not hashed_password.startswith(f"{ALGORITHM}$") or stored_iterations < iterations
+
+
+class PasswordHasher:
+    """Runs hashing jobs in a process pool, refusing work when saturated.
+
+    With ``workers=0`` jobs run in the threadpool instead, still subject to
+    the ``max_queue`` limit.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and threadpool is
+            # unsafe; spawned workers only import this module.
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.in_flight >= max(self.capacity, 1):
+                self.rejected += 1
+                raise HasherBusyError("Password hashing is saturated")
+            self.in_flight += 1
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def _run(self, fn: Callable, *args):
+        self._admit()
+        if self.workers <= 0:
+            try:
+                return await to_thread.run_sync(fn, *args)
+            finally:
+                self._release()
+        try:
+            with self._lock:
+                future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the job finishes, not when the caller stops
+        # waiting, so abandoned requests still count against the limit.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str, iterations: int) -> str:
+        """Hash a password in the pool."""
+        return await self._run(hash_password, password, iterations)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in the pool."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        """Current load and totals."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
@@ -2,9 +2,14 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from .database import create_db_and_tables
+from .auth_cache import principal_cache
+from .database import create_db_and_tables, pool_stats
+from .events import task_events
+from .metrics import MetricsMiddleware, request_metrics
 from .routers import auth_router, tasks_router
+from .services.auth_service import password_hasher
 
 
 @asynccontextmanager
@@ -13,7 +18,8 @@ async def lifespan(app: FastAPI):
     # Startup: create tables
     create_db_and_tables()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop the password hashing processes
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -30,7 +36,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
+# Outermost, so its timings include the other middleware.
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(auth_router)
@@ -47,3 +56,35 @@ def root():
 def health():
     """Health check for kubernetes/docker."""
     return {"status": "healthy"}
+
+
+@app.get("/health/pool")
+def health_pool():
+    """Connection pool occupancy and checkout wait times, for sizing pools."""
+    return pool_stats()
+
+
+@app.get("/health/auth-cache")
+def health_auth_cache():
+    """Principal cache size and hit/miss counters."""
+    return principal_cache.stats()
+
+
+@app.get("/health/hashing")
+def health_hashing():
+    """Password hashing pool load and rejected attempts."""
+    return password_hasher.stats()
+
+
+@app.get("/health/stream")
+def health_stream():
+    """Open task stream subscriptions and event fan-out counters."""
+    return task_events.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Request latency, SQL and serialization metrics in Prometheus text format."""
+    return PlainTextResponse(
+        request_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,294 @@
+"""Per-request metrics, Server-Timing headers and the Prometheus exposition.
+
+``MetricsMiddleware`` times every HTTP request and, per method and route
+template (``/api/tasks/{task_id}``, never the raw path, so the number of
+series stays bounded), keeps:
+
+- a latency histogram by status code;
+- how many SQL statements its requests ran and for how long, from cursor
+  events on the engines (``instrument_engine``);
+- time spent validating and encoding JSON bodies (``serialization``'s
+  ``json_response`` and ``model_response``, which every task route uses;
+  the auth routes are left to FastAPI and not counted);
+
+plus the number of requests in flight, which includes open task streams.
+``/metrics`` renders them in the Prometheus text format. Each response also
+carries a ``Server-Timing`` header with the same figures for that request,
+which browser developer tools display.
+
+A request's figures live in a contextvar. anyio copies the context into
+the threadpool, so statements run there are charged to the request that
+ran them. Totals are only updated on the event loop thread, so they need
+no locks, and the bookkeeping costs a few microseconds per request (see
+``benchmarks/metrics.py``).
+
+With ``PROFILE_TOKEN`` set, a request with ``?profile=1`` and that token in
+an ``X-Profile-Token`` header is run under the sampling profiler
+(``profiling``), and the response is replaced by its folded stacks. The
+request itself still runs in full, writes included.
+"""
+
+import hmac
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+from urllib.parse import parse_qs
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+from .profiling import SamplingProfiler
+
+
+settings = get_settings()
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route (404s for unknown paths).
+UNMATCHED_ROUTE = "<unmatched>"
+
+PROFILE_HEADER = b"x-profile-token"
+
+
+class RequestTimings:
+    """What one request has spent so far, outside its own code."""
+
+    __slots__ = ("statements", "db_seconds", "serialization_seconds")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+    def server_timing(self, total: float) -> bytes:
+        """The ``Server-Timing`` header value, with durations in milliseconds."""
+        return (
+            f'app;dur={total * 1000:.2f}, '
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} queries", '
+            f'ser;dur={self.serialization_seconds * 1000:.2f}'
+        ).encode()
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_serialization(seconds: float) -> None:
+    """Charge JSON encoding time to the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.serialization_seconds += seconds
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Charge the engine's SQL statements to the requests that run them."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_statement(connection, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            connection.info["statement_started"] = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_statement(connection, cursor, statement, parameters, context, executemany):
+        timings = _current.get()
+        started = connection.info.pop("statement_started", None)
+        if timings is not None and started is not None:
+            timings.statements += 1
+            timings.db_seconds += perf_counter() - started
+
+
+class Histogram:
+    """Counts of observations per latency bucket, and their sum."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        # One count per bucket, then the overflow (+Inf) bucket.
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    """Request totals per route, rendered for Prometheus."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.latency: dict[tuple[str, str, int], Histogram] = {}
+        # (method, route) -> [statements, db seconds, serialization seconds]
+        self.work: dict[tuple[str, str], list] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        timings: RequestTimings
+    ) -> None:
+        """Add one finished request."""
+        histogram = self.latency.get((method, route, status))
+        if histogram is None:
+            histogram = self.latency[method, route, status] = Histogram()
+        histogram.observe(seconds)
+        work = self.work.get((method, route))
+        if work is None:
+            work = self.work[method, route] = [0, 0.0, 0.0]
+        work[0] += timings.statements
+        work[1] += timings.db_seconds
+        work[2] += timings.serialization_seconds
+
+    def clear(self) -> None:
+        """Forget every total (the in-flight gauge is live and kept)."""
+        self.latency.clear()
+        self.work.clear()
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP todo_http_request_duration_seconds Time from request to the end of the response.",
+            "# TYPE todo_http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'todo_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            cumulative += histogram.counts[-1]
+            lines += [
+                f'todo_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}',
+                f"todo_http_request_duration_seconds_sum{{{labels}}} {histogram.sum!r}",
+                f"todo_http_request_duration_seconds_count{{{labels}}} {cumulative}",
+            ]
+        counters = (
+            ("todo_db_statements_total", "SQL statements run by requests.", 0),
+            ("todo_db_seconds_total", "Time requests spent running SQL statements.", 1),
+            ("todo_serialization_seconds_total", "Time requests spent encoding JSON.", 2),
+        )
+        for name, help_text, field in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), work in sorted(self.work.items()):
+                lines.append(
+                    f'{name}{{method="{method}",route="{_escape(route)}"}} {work[field]!r}'
+                )
+        lines += [
+            "# HELP todo_http_requests_in_flight Requests being handled, open streams included.",
+            "# TYPE todo_http_requests_in_flight gauge",
+            f"todo_http_requests_in_flight {self.in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records ``request_metrics`` and adds Server-Timing."""
+
+    def __init__(
+        self,
+        app,
+        metrics: RequestMetrics = request_metrics,
+        profile_token: str = settings.profile_token,
+        profile_interval: float = settings.profile_interval
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.profile_token = profile_token.encode()
+        self.profile_interval = profile_interval
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.profile_token and b"profile=" in scope["query_string"] and self._wants_profile(scope):
+            await self._profile(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        context_token = _current.set(timings)
+        started = perf_counter()
+        status = 500
+        metrics = self.metrics
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", timings.server_timing(perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            metrics.in_flight -= 1
+            _current.reset(context_token)
+            route = scope.get("route")
+            metrics.observe(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                perf_counter() - started,
+                timings,
+            )
+
+    def _wants_profile(self, scope) -> bool:
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        if query.get("profile") != ["1"]:
+            return False
+        token = dict(scope["headers"]).get(PROFILE_HEADER, b"")
+        return hmac.compare_digest(token, self.profile_token)
+
+    async def _profile(self, scope, receive, send) -> None:
+        """Run the request under the profiler and answer with the folded stacks."""
+        if self._profiling:
+            await _plain_response(send, 409, b"A profile is already running\n")
+            return
+
+        async def discard(message) -> None:
+            pass
+
+        self._profiling = True
+        profiler = SamplingProfiler(self.profile_interval)
+        started = perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            folded = profiler.stop()
+            self._profiling = False
+        elapsed = perf_counter() - started
+        await _plain_response(
+            send, 200, folded.encode(),
+            [(b"server-timing", f"app;dur={elapsed * 1000:.2f}".encode())]
+        )
+
+
+async def _plain_response(send, status: int, body: bytes, headers=()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,168 @@
+"""Versioned schema migrations.
+
+Each migration is a function that brings the schema from the previous
+version to its own. Applied versions are recorded in ``schema_version``, so
+start-up only runs the ones a database has not seen yet. Databases created
+before migrations existed (by a bare ``create_all``) start at version 0.
+
+Migrations must be idempotent: a fresh database gets the current models'
+full schema from migration 1, and later migrations then find their changes
+already in place.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, inspect, select, text, update
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from .models.task import Task, TaskCompletionDay, TaskTombstone
+from .reconcile import reconcile_task_stats
+from .search import create_search_index, drop_search_index
+
+
+_metadata = MetaData()
+
+# The list sort indexes added with priorities.
+SORT_INDEXES = {"ix_tasks_user_status_created", "ix_tasks_user_priority", "ix_tasks_user_title"}
+
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_tables(connection: Connection) -> None:
+    """Create any missing tables from the current models."""
+    SQLModel.metadata.create_all(connection)
+
+
+def _add_column(connection: Connection, table: str, column: str, definition: str) -> None:
+    """Add a column unless the table already has it."""
+    columns = {existing["name"] for existing in inspect(connection).get_columns(table)}
+    if column not in columns:
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+
+
+def _task_indexes(connection: Connection) -> None:
+    """Replace the single-column user_id index with composite indexes."""
+    # Spelled out rather than taken from the model, whose indexes may
+    # depend on columns that later migrations add.
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_created ON tasks (user_id, created_at, id)"
+    ))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_status ON tasks (user_id, is_complete)"
+    ))
+    connection.execute(text("DROP INDEX IF EXISTS ix_tasks_user_id"))
+
+
+def _user_data_version(connection: Connection) -> None:
+    """Add users.data_version, the per-user task list version."""
+    _add_column(connection, "users", "data_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _task_priority_and_sorts(connection: Connection) -> None:
+    """Add tasks.priority and an index for each list sort."""
+    _add_column(connection, "tasks", "priority", "INTEGER NOT NULL DEFAULT 1")
+    # Only this migration's indexes: later ones may need later columns.
+    for index in Task.__table__.indexes:
+        if index.name in SORT_INDEXES:
+            index.create(connection, checkfirst=True)
+    # Superseded by ix_tasks_user_status_created.
+    connection.execute(text("DROP INDEX IF EXISTS ix_tasks_user_status"))
+
+
+
+def _task_search(connection: Connection) -> None:
+    """Add the full-text search index and the user's-newest-task index it uses."""
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_newest ON tasks (user_id, id)"
+    ))
+    create_search_index(connection)
+
+
+
+def _task_stats(connection: Connection) -> None:
+    """Add the task counters, completion times and buckets, and fill them in."""
+    _add_column(connection, "users", "task_count", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(connection, "users", "completed_count", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(connection, "tasks", "completed_at", "TIMESTAMP")
+    TaskCompletionDay.__table__.create(connection, checkfirst=True)
+    tasks = Task.__table__
+    # The last update is the best guess at when older tasks were completed.
+    connection.execute(
+        update(tasks).where(tasks.c.is_complete, tasks.c.completed_at.is_(None))
+        .values(completed_at=tasks.c.updated_at)
+    )
+    reconcile_task_stats(connection, fix=True)
+
+
+def _task_changes(connection: Connection) -> None:
+    """Add change sequence numbers, tombstones and the sync floor."""
+    _add_column(connection, "tasks", "change_seq", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(connection, "users", "sync_floor", "INTEGER NOT NULL DEFAULT 0")
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_changes ON tasks (user_id, change_seq, id)"
+    ))
+    TaskTombstone.__table__.create(connection, checkfirst=True)
+
+
+def _task_insert_sentinel(connection: Connection) -> None:
+    """Add the column batch inserts use to match RETURNING rows to items."""
+    _add_column(connection, "tasks", "insert_sentinel", "INTEGER")
+
+
+def _task_search_by_user(connection: Connection) -> None:
+    """Rebuild the full-text index with each task's owner in it."""
+    drop_search_index(connection)
+    create_search_index(connection)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Create tables", _create_tables),
+    (2, "Composite task indexes", _task_indexes),
+    (3, "User data versions", _user_data_version),
+    (4, "Task priorities and sort indexes", _task_priority_and_sorts),
+    (5, "Full-text task search", _task_search),
+    (6, "Task statistics", _task_stats),
+    (7, "Task change feed", _task_changes),
+    (8, "Task insert sentinel", _task_insert_sentinel),
+    (9, "Per-user full-text search", _task_search_by_user),
+]
+
+
+def current_version(connection: Connection) -> int:
+    """Return the newest applied migration version (0 if none)."""
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    versions = connection.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def migrate(engine: Engine) -> int:
+    """Apply every pending migration in a single transaction.
+
+    Returns:
+        The schema version after migrating.
+    """
+    with engine.begin() as connection:
+        _metadata.create_all(connection)
+        version = current_version(connection)
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            apply(connection)
+            connection.execute(schema_version.insert().values(
+                version=number,
+                description=description,
+                applied_at=datetime.utcnow()
+            ))
+            version = number
+    return version
@@ -1,10 +1,25 @@
 """Task model for todo items."""
 
+from enum import Enum
+from pydantic import field_validator
+from sqlalchemy import Index, insert_sentinel
 from sqlmodel import SQLModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 
+class TaskPriority(str, Enum):
+    """Task priority as sent and received by the API."""
+    low = "low"
+    medium = "medium"
+    high = "high"
+
+
+# Priorities are stored as ranks so that sorting by priority is an index scan.
+PRIORITY_RANKS = {TaskPriority.low: 0, TaskPriority.medium: 1, TaskPriority.high: 2}
+PRIORITY_NAMES = {rank: priority.value for priority, rank in PRIORITY_RANKS.items()}
+
+
 class TaskBase(SQLModel):
     """Base task fields."""
     title: str = Field(min_length=1)
@@ -12,26 +27,87 @@ class TaskBase(SQLModel):
 
 
 class Task(TaskBase, table=True):
-    """Task database model."""
+    """Task database model.
+    
+    Every query is scoped to one user, so the indexes lead with user_id and
+    each list sort has an index ending in its full sort key, read forwards
+    or backwards as the order requires:
+    
+    - ``ix_tasks_user_created``: by date, also used for keyset pages;
+    - ``ix_tasks_user_status_created``: by date within a status, and
+      counting tasks by status without touching the table;
+    - ``ix_tasks_user_priority``: by priority rank, newest first within one;
+    - ``ix_tasks_user_title``: by title;
+    - ``ix_tasks_user_newest``: a user's newest ids, which bound a search;
+    - ``ix_tasks_user_changes``: tasks changed since a sync token, in order.
+    
+    Lookups by ``(id, user_id)`` go through the primary key.
+    
+    ``insert_sentinel`` is filled in by batch inserts so that rows returned
+    from a multi-row INSERT can be matched to their parameters on databases
+    whose RETURNING order is not guaranteed (SQLite).
+    """
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_status_created", "user_id", "is_complete", "created_at", "id"),
+        Index("ix_tasks_user_priority", "user_id", "priority", "created_at", "id"),
+        Index("ix_tasks_user_title", "user_id", "title", "id"),
+        Index("ix_tasks_user_newest", "user_id", "id"),
+        Index("ix_tasks_user_changes", "user_id", "change_seq", "id"),
+        insert_sentinel("insert_sentinel"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
     is_complete: bool = Field(default=False)
+    # A PRIORITY_RANKS value
+    priority: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # When the task was last completed. Kept when it is reopened, so the
+    # completion can be taken back out of that day's bucket.
+    completed_at: Optional[datetime] = None
+    # The user's data_version as of the task's last change (see get_changes).
+    change_seq: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TaskTombstone(SQLModel, table=True):
+    """A deleted task, kept so delta syncs can tell clients to drop it.
+    
+    The key doubles as the index for reading a user's deletions in change
+    order. Tombstones are pruned after a retention period (see
+    ``tombstones``).
+    """
+    __tablename__ = "task_tombstones"
+    
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    change_seq: int = Field(primary_key=True)
+    task_id: int = Field(primary_key=True)
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TaskCompletionDay(SQLModel, table=True):
+    """How many of a user's completed tasks were completed on a (UTC) day."""
+    __tablename__ = "task_completion_days"
+    
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    completed: int = 0
+
+
 class TaskCreate(SQLModel):
     """Schema for task creation."""
     title: str
     description: str = ""
+    priority: TaskPriority = TaskPriority.medium
 
 
 class TaskUpdate(SQLModel):
     """Schema for task update."""
     title: Optional[str] = None
     description: Optional[str] = None
+    priority: Optional[TaskPriority] = None
 
 
 class TaskRead(SQLModel):
@@ -40,6 +116,84 @@ class TaskRead(SQLModel):
     title: str
     description: str
     is_complete: bool
+    priority: TaskPriority
     user_id: int
     created_at: datetime
     updated_at: datetime
+    
+    @field_validator("priority", mode="before")
+    @classmethod
+    def priority_from_rank(cls, value):
+        """Accept the stored rank as well as the priority name."""
+        if isinstance(value, int):
+            return PRIORITY_NAMES[value]
+        return value
+
+
+class TaskSearchResult(TaskRead):
+    """A task matching a search, with its relevance and a highlighted snippet.
+    
+    ``snippet`` is HTML: matched words are wrapped in ``<mark>`` and the
+    rest is escaped.
+    """
+    rank: float
+    snippet: str
+
+
+class CompletionBucket(SQLModel):
+    """Tasks completed on one day."""
+    date: date
+    completed: int
+
+
+class TaskStats(SQLModel):
+    """Schema for a user's task statistics."""
+    total: int
+    completed: int
+    pending: int
+    completed_by_day: list[CompletionBucket]
+
+
+class TaskChanges(SQLModel):
+    """Schema for a delta sync: what changed since a sync token.
+    
+    Apply ``changes`` (created or updated tasks) and drop the ``deleted``
+    IDs, then send ``sync_token`` next time. While ``has_more`` is true,
+    ask again straight away for the rest.
+    """
+    changes: list[TaskRead]
+    deleted: list[int]
+    sync_token: str
+    has_more: bool
+
+
+class TaskBatchCreate(SQLModel):
+    """Schema for creating several tasks at once."""
+    tasks: list[TaskCreate] = Field(min_length=1)
+
+
+class TaskBatchIds(SQLModel):
+    """Schema for a batch operation on existing tasks."""
+    ids: list[int] = Field(min_length=1)
+
+
+class TaskBatchComplete(TaskBatchIds):
+    """Schema for setting or toggling completion of several tasks.
+    
+    Leave ``is_complete`` unset to toggle each task.
+    """
+    is_complete: Optional[bool] = None
+
+
+class TaskBatchResult(SQLModel):
+    """Outcome for one item of a batch request."""
+    index: int
+    status: int
+    id: Optional[int] = None
+    task: Optional[TaskRead] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(SQLModel):
+    """Per-item results of a batch request, in request order."""
+    results: list[TaskBatchResult]
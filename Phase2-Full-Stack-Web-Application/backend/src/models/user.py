@@ -16,6 +16,14 @@ class User(UserBase, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     password_hash: str
+    # Bumped by every change to the user's tasks; served as the list ETag.
+    data_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Running task counts, updated together with data_version (see reconcile).
+    task_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    completed_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Newest change_seq of the user's pruned tombstones; sync tokens from
+    # before it may have missed deletions and are refused.
+    sync_floor: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
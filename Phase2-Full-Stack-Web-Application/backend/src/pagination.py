@@ -0,0 +1,90 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor holds the sort key of the last row on a page, tagged with the sort
+and order it belongs to so it cannot be replayed against a different one.
+Sync tokens are the same kind of cursor over the change feed.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+# The value types of each sort's key, in key order.
+SORT_KEY_TYPES: dict[str, tuple[type, ...]] = {
+    "date": (datetime, int),
+    "priority": (int, datetime, int),
+    "title": (str, int),
+}
+
+
+def encode_cursor(*key, sort: str = "date", order: str = "desc") -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in key]
+    raw = json.dumps([sort, order, *values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = "date", order: str = "desc") -> tuple:
+    """Decode a cursor produced by encode_cursor for the same sort and order.
+
+    Raises:
+        ValueError: If the cursor is malformed or for another sort or order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, *values = json.loads(base64.urlsafe_b64decode(padded))
+        types = SORT_KEY_TYPES[sort]
+        if (cursor_sort, cursor_order) != (sort, order) or len(values) != len(types):
+            raise ValueError
+        key = []
+        for kind, value in zip(types, values):
+            if kind is datetime:
+                value = datetime.fromisoformat(value)
+            elif type(value) is not kind:
+                raise TypeError
+            key.append(value)
+        return tuple(key)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class SyncTokenExpiredError(Exception):
+    """Raised when a sync token predates the user's retained tombstones."""
+
+
+class SyncPosition(NamedTuple):
+    """Where a delta sync resumes in a user's change feed.
+    
+    The next changes are those after ``(seq, task_id)``, or after all of
+    ``seq`` when ``task_id`` is None. Deletions at or before ``floor`` are
+    skipped: a sync that started from nothing never had those tasks.
+    """
+    floor: int
+    seq: int
+    task_id: Optional[int] = None
+
+
+def encode_sync_token(position: SyncPosition) -> str:
+    """Encode a change feed position as an opaque sync token."""
+    raw = json.dumps(["sync", *position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> SyncPosition:
+    """Decode a token produced by encode_sync_token.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        tag, floor, seq, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if tag != "sync" or type(floor) is not int or type(seq) is not int:
+            raise ValueError
+        if task_id is not None and type(task_id) is not int:
+            raise TypeError
+        return SyncPosition(floor, seq, task_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid sync token") from e
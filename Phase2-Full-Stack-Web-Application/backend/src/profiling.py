@@ -0,0 +1,76 @@
+"""A sampling profiler for single requests, with flame graph output.
+
+While a profile runs, a background thread wakes every ``interval`` seconds
+and records the stack of every other thread that is doing work. Threads
+parked in the event loop's selector, a lock or a queue are skipped, so the
+event loop thread and the threadpool workers that serve the request are
+what gets sampled. The result is in the folded-stack format (one
+``outer;...;inner count`` line per distinct stack) read by flamegraph.pl,
+speedscope and most other flame graph tools.
+
+The whole process is sampled, so requests running at the same time show up
+too. Profile on a quiet instance.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+
+# Where threads wait for work: samples whose innermost frame is in one of
+# these modules are idle time, not the request's.
+_IDLE_MODULES = {"threading.py", "selectors.py", "queue.py"}
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples thread stacks between ``start`` and ``stop``."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        # The sampler needs the GIL to take a sample; by default a busy
+        # thread only hands it over every 5 ms.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the samples as folded stacks."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        return self.folded()
+
+    def folded(self) -> str:
+        """The samples taken so far, one ``stack count`` line each, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
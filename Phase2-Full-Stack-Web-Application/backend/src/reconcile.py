@@ -0,0 +1,165 @@
+"""Check the incrementally maintained task statistics against the tasks.
+
+Every task mutation moves ``users.task_count``, ``users.completed_count``
+and the ``task_completion_days`` buckets in the same transaction as the
+write, so they should always equal what counting the tasks would give. This
+job counts the tasks anyway, a batch of users at a time, reports any drift
+(from writes that bypassed ``TaskService``, for instance) and with ``--fix``
+overwrites the stored values with the counted ones.
+
+Each batch locks its users' rows first. Every mutation updates the user's
+row too, so a batch sees no task writes for those users while it counts.
+
+Usage::
+
+    python -m src.reconcile [--fix] [--batch-size 500]
+"""
+
+import argparse
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, func, select, true, update
+from sqlalchemy.engine import Connection, Engine
+
+from .models.task import Task, TaskCompletionDay
+from .models.user import User
+
+
+@dataclass(frozen=True)
+class StatsDrift:
+    """A stored statistic that differs from the count of the tasks."""
+    user_id: int
+    # "task_count", "completed_count" or "completed on <ISO date>"
+    field: str
+    stored: int
+    actual: int
+
+
+def _as_date(value) -> date:
+    # SQLite's date() returns text.
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def reconcile_task_stats(
+    connection: Connection,
+    user_ids: Optional[list[int]] = None,
+    fix: bool = False
+) -> list[StatsDrift]:
+    """Compare the stored statistics of some users (default: all) with their tasks.
+
+    Runs in the caller's transaction. With ``fix`` the stored values are
+    replaced by the counted ones before returning.
+
+    Returns:
+        The statistics that were wrong.
+    """
+    users, tasks, days = User.__table__, Task.__table__, TaskCompletionDay.__table__
+    user_scope = users.c.id.in_(user_ids) if user_ids is not None else true()
+    stored = {
+        row.id: row
+        for row in connection.execute(
+            select(users.c.id, users.c.task_count, users.c.completed_count)
+            .where(user_scope).with_for_update()
+        )
+    }
+    if not stored:
+        return []
+    ids = list(stored)
+
+    counted = {
+        row.user_id: row
+        for row in connection.execute(
+            select(
+                tasks.c.user_id,
+                func.count().label("task_count"),
+                func.count().filter(tasks.c.is_complete).label("completed_count"),
+            ).where(tasks.c.user_id.in_(ids)).group_by(tasks.c.user_id)
+        )
+    }
+    drift = []
+    for user_id, row in stored.items():
+        actual = counted.get(user_id)
+        for field in ("task_count", "completed_count"):
+            value = getattr(actual, field) if actual is not None else 0
+            if getattr(row, field) != value:
+                drift.append(StatsDrift(user_id, field, getattr(row, field), value))
+
+    stored_days = Counter({
+        (row.user_id, row.day): row.completed
+        for row in connection.execute(
+            select(days.c.user_id, days.c.day, days.c.completed).where(days.c.user_id.in_(ids))
+        )
+    })
+    day = func.date(tasks.c.completed_at)
+    counted_days = Counter({
+        (row.user_id, _as_date(row.day)): row.completed
+        for row in connection.execute(
+            select(tasks.c.user_id, day.label("day"), func.count().label("completed"))
+            .where(tasks.c.user_id.in_(ids), tasks.c.is_complete)
+            .group_by(tasks.c.user_id, day)
+        )
+    })
+    for user_id, bucket in sorted(stored_days.keys() | counted_days.keys()):
+        if stored_days[user_id, bucket] != counted_days[user_id, bucket]:
+            drift.append(StatsDrift(
+                user_id, f"completed on {bucket.isoformat()}",
+                stored_days[user_id, bucket], counted_days[user_id, bucket]
+            ))
+
+    if fix and drift:
+        for user_id in {item.user_id for item in drift}:
+            actual = counted.get(user_id)
+            connection.execute(update(users).where(users.c.id == user_id).values(
+                task_count=actual.task_count if actual is not None else 0,
+                completed_count=actual.completed_count if actual is not None else 0,
+            ))
+            connection.execute(delete(days).where(days.c.user_id == user_id))
+            buckets = [
+                {"user_id": user_id, "day": bucket, "completed": count}
+                for (owner, bucket), count in counted_days.items() if owner == user_id
+            ]
+            if buckets:
+                connection.execute(days.insert(), buckets)
+    return drift
+
+
+def reconcile_all(engine: Engine, fix: bool = False, batch_size: int = 500) -> list[StatsDrift]:
+    """Reconcile every user, ``batch_size`` users per transaction."""
+    drift = []
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            user_ids = connection.execute(
+                select(User.__table__.c.id).where(User.__table__.c.id > last_id)
+                .order_by(User.__table__.c.id).limit(batch_size)
+            ).scalars().all()
+            if not user_ids:
+                return drift
+            drift += reconcile_task_stats(connection, user_ids, fix)
+        last_id = user_ids[-1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the job; exit with 1 if any drift was found."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fix", action="store_true", help="Overwrite wrong values")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per transaction")
+    args = parser.parse_args(argv)
+
+    # Imported here: the database module runs the migrations, which use this one.
+    from .database import engine
+
+    drift = reconcile_all(engine, args.fix, args.batch_size)
+    for item in drift:
+        print(f"user {item.user_id}: {item.field} is {item.stored}, counted {item.actual}")
+    action = "fixed" if args.fix else "found"
+    print(f"{len(drift)} wrong value(s) {action}", file=sys.stderr)
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,13 +3,26 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
-from ..database import get_session
+from ..config import get_settings
+from ..database import Database, get_db, get_session
+from ..hashing import HasherBusyError
 from ..models.user import UserCreate, UserRead, UserLogin
-from ..services.auth_service import AuthService
+from ..services.auth_service import AsyncAuthService, AuthService
 
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+settings = get_settings()
+
+
+def hashing_busy() -> HTTPException:
+    """503 telling the client when to retry a saturated signup/signin."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry",
+        headers={"Retry-After": str(settings.password_hash_retry_after)},
+    )
+
 
 class TokenResponse(UserRead):
     """Response with user data and token."""
@@ -17,13 +30,13 @@ class TokenResponse(UserRead):
 
 
 @router.post("/signup", response_model=TokenResponse)
-def signup(
+async def signup(
     user_data: UserCreate,
-    session: Annotated[Session, Depends(get_session)]
+    db: Annotated[Database, Depends(get_db)]
 ):
     """Create a new user account."""
     # Check if email already exists
-    existing = AuthService.get_user_by_email(session, user_data.email)
+    existing = await AsyncAuthService.get_user_by_email(db, user_data.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,23 +51,29 @@ def signup(
         )
     
     # Create user
-    user = AuthService.create_user(session, user_data)
+    try:
+        user = await AsyncAuthService.create_user(db, user_data)
+    except HasherBusyError:
+        raise hashing_busy()
     token = AuthService.create_access_token(user.id)
     
     return TokenResponse(id=user.id, email=user.email, token=token)
 
 
 @router.post("/signin", response_model=TokenResponse)
-def signin(
+async def signin(
     credentials: UserLogin,
-    session: Annotated[Session, Depends(get_session)]
+    db: Annotated[Database, Depends(get_db)]
 ):
     """Sign in with email and password."""
-    user = AuthService.authenticate_user(
-        session, 
-        credentials.email, 
-        credentials.password
-    )
+    try:
+        user = await AsyncAuthService.authenticate_user(
+            db, 
+            credentials.email, 
+            credentials.password
+        )
+    except HasherBusyError:
+        raise hashing_busy()
     
     if user is None:
         raise HTTPException(
@@ -1,31 +1,300 @@
 """Task CRUD routes."""
 
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from ..database import get_session
-from ..models.task import TaskCreate, TaskUpdate, TaskRead
+import asyncio
+from typing import Annotated, Literal, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from ..config import get_settings
+from ..database import Database, get_db
+from ..events import sse_frame, task_events
+from ..models.task import (
+    TaskBatchComplete,
+    TaskBatchCreate,
+    TaskBatchIds,
+    TaskBatchResponse,
+    TaskChanges,
+    TaskCreate,
+    TaskRead,
+    TaskSearchResult,
+    TaskStats,
+    TaskUpdate,
+)
 from ..models.user import User
-from ..services.task_service import TaskService
-from ..dependencies import get_current_user
+from ..pagination import SyncTokenExpiredError
+from ..serialization import json_response, model_response
+from ..services.task_service import AsyncTaskService
+from ..dependencies import authenticate, get_current_user, get_stream_user
 
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+settings = get_settings()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+MAX_STATS_DAYS = 366
+
+
+def list_etag(user_id: int, data_version: int) -> str:
+    """ETag for a user's task list at a given data version."""
+    return f'"{user_id}-{data_version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def parse_ids(ids: str) -> list[int]:
+    """Parse a comma-separated list of task IDs.
+    
+    Raises:
+        ValueError: If an ID is not an integer or there are too many.
+    """
+    try:
+        task_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("ids must be comma-separated integers") from None
+    if len(task_ids) > settings.batch_max_items:
+        raise ValueError(f"At most {settings.batch_max_items} ids per request")
+    return task_ids
+
+
+def check_batch_size(count: int) -> None:
+    """Reject batches larger than the configured maximum."""
+    if count > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_max_items} items per batch"
+        )
 
 
 @router.get("", response_model=list[TaskRead])
-def get_tasks(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)]
+async def get_tasks(
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Optional[str] = None,
+    ids: Annotated[Optional[str], Query(description="Comma-separated task IDs")] = None,
+    status_filter: Annotated[
+        Literal["all", "pending", "completed"], Query(alias="status")
+    ] = "all",
+    q: Annotated[Optional[str], Query(max_length=200, description="Text to search for")] = None,
+    sort: Literal["date", "priority", "title"] = "date",
+    order: Annotated[
+        Optional[Literal["asc", "desc"]], Query(description="Defaults to the sort's natural order")
+    ] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None
 ):
-    """Get all tasks for the current user."""
-    return TaskService.get_user_tasks(session, current_user.id)
+    """Get the current user's tasks, newest first unless ``sort`` says otherwise.
+    
+    Without ``limit`` every matching task is returned. With it, one page is
+    returned and, if more tasks follow, the cursor for the next page is sent
+    in the ``X-Next-Cursor`` response header; it is only valid with the same
+    ``sort`` and ``order``. ``ids=1,2,3`` fetches just those tasks; unknown
+    IDs are left out. ``status``, ``q``, ``sort`` and ``order`` filter and
+    order the list in the database (see ``TaskService.get_user_tasks``).
+    
+    The ``ETag`` is the user's data version, which every task change bumps.
+    A request whose ``If-None-Match`` still matches gets an empty 304 after
+    a single lookup of the version, without reading any tasks.
+    """
+    # Read the version first: a change racing with the listing then leaves
+    # the ETag older than the body, which only costs the client a refetch.
+    data_version = await AsyncTaskService.get_data_version(db, current_user.id)
+    etag = list_etag(current_user.id, data_version or 0)
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+        )
+    
+    try:
+        task_ids = parse_ids(ids) if ids is not None else None
+        tasks, next_cursor = await AsyncTaskService.get_user_tasks(
+            db, current_user.id, limit, cursor, task_ids, status_filter, q, sort, order
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    # The rows already have TaskRead's shape; skip re-validating them.
+    return json_response([task._asdict() for task in tasks], headers=headers)
+
+
+@router.get("/search", response_model=list[TaskSearchResult])
+async def search_tasks(
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20
+):
+    """Search the current user's tasks by title and description.
+    
+    Every word is matched as a prefix (``gro mil`` finds "Buy groceries and
+    milk"). Results are ranked best first and carry an HTML ``snippet``
+    with the matches in ``<mark>`` tags.
+    """
+    results = await AsyncTaskService.search_tasks(db, current_user.id, q, limit)
+    return json_response(results)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_stats(
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    days: Annotated[int, Query(ge=1, le=MAX_STATS_DAYS)] = 30
+):
+    """Get the current user's task totals and completions per day.
+    
+    The counts are maintained as tasks change rather than counted on each
+    request, so this is cheap to poll.
+    """
+    stats = await AsyncTaskService.get_stats(db, current_user.id, days)
+    return model_response(TaskStats, stats)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_changes(
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    since: Annotated[Optional[str], Query(description="sync_token from the last sync")] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = MAX_PAGE_SIZE
+):
+    """Get the current user's task changes since a sync token.
+    
+    Returns the tasks created or updated and the IDs of tasks deleted since
+    ``since``, oldest change first, and the ``sync_token`` to send next
+    time. Without ``since`` every task is returned. At most ``limit``
+    entries come back at once; ``has_more`` says to ask again straight
+    away. A token too old for the retained deletions gets 410, after which
+    the client should sync again without one.
+    """
+    try:
+        changes = await AsyncTaskService.get_changes(db, current_user.id, since, limit)
+    except SyncTokenExpiredError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # The rows already have TaskRead's shape; skip re-validating them.
+    return json_response(changes, headers={"Cache-Control": "private, no-cache"})
+
+
+@router.get("/stream")
+async def stream_tasks(current_user: Annotated[User, Depends(get_stream_user)]):
+    """Stream the current user's task changes as Server-Sent Events.
+    
+    Each change is an event named ``created``, ``updated``, ``toggled`` or
+    ``deleted`` whose data is ``{"type": ..., "task": {...}}`` (``{"type":
+    "deleted", "id": ...}`` for deletions). A comment is sent every
+    ``stream_heartbeat`` seconds to keep proxies from closing an idle
+    connection. A client that falls ``stream_queue_size`` events behind
+    gets an ``overflow`` event and the stream ends; it should refetch the
+    task list and reconnect.
+    
+    ``EventSource`` cannot send headers, so the token may be passed as the
+    ``access_token`` query parameter instead.
+    """
+    user_id = current_user.id
+    
+    async def events():
+        # Subscribe only once the body is being sent, so a response that is
+        # never sent leaves nothing behind; the finally below always runs.
+        subscription = task_events.subscribe(user_id)
+        try:
+            yield b"retry: 3000\n: connected\n\n"
+            while True:
+                messages = await subscription.get(settings.stream_heartbeat)
+                if messages is None:
+                    yield b"event: overflow\ndata: {}\n\n"
+                    return
+                if not messages:
+                    yield b": ping\n\n"
+                    continue
+                yield b"".join(sse_frame(message) for message in messages)
+        finally:
+            task_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/stream/ws")
+async def stream_tasks_ws(websocket: WebSocket, db: Annotated[Database, Depends(get_db)]):
+    """Stream the current user's task changes over a WebSocket.
+    
+    Sends the same JSON documents as the SSE stream, one text message per
+    event. The token comes from the ``access_token`` query parameter or a
+    bearer ``Authorization`` header; without a valid one the socket is
+    closed with code 1008. A client that falls too far behind gets an
+    ``overflow`` message and the socket is closed with code 1013.
+    """
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    token = websocket.query_params.get("access_token") or (
+        credentials if scheme.lower() == "bearer" else None
+    )
+    try:
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        current_user = await authenticate(token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscription = task_events.subscribe(current_user.id)
+    # Clients have nothing to send; reading is how a disconnect is noticed.
+    received = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            waiting = asyncio.ensure_future(subscription.get())
+            await asyncio.wait([waiting, received], return_when=asyncio.FIRST_COMPLETED)
+            if received.done():
+                if received.result()["type"] == "websocket.disconnect":
+                    waiting.cancel()
+                    return
+                received = asyncio.ensure_future(websocket.receive())
+            if not waiting.done():
+                waiting.cancel()
+                continue
+            messages = waiting.result()
+            if messages is None:
+                await websocket.send_text('{"type":"overflow"}')
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            for _, data in messages:
+                await websocket.send_text(data.decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        received.cancel()
+        task_events.unsubscribe(subscription)
 
 
 @router.post("", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
-    session: Annotated[Session, Depends(get_session)],
+    db: Annotated[Database, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """Create a new task."""
@@ -35,18 +304,57 @@ def create_task(
             detail="Title is required"
         )
     
-    return TaskService.create_task(session, current_user.id, task_data)
+    task = await AsyncTaskService.create_task(db, current_user.id, task_data)
+    return model_response(TaskRead, task, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def create_tasks(
+    batch: TaskBatchCreate,
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)]
+):
+    """Create several tasks in one transaction, with a result per item."""
+    check_batch_size(len(batch.tasks))
+    results = await AsyncTaskService.create_tasks(db, current_user.id, batch.tasks)
+    return model_response(TaskBatchResponse, {"results": results})
+
+
+@router.patch("/batch/complete", response_model=TaskBatchResponse)
+async def complete_tasks(
+    batch: TaskBatchComplete,
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)]
+):
+    """Set or toggle completion of several tasks, with a result per ID."""
+    check_batch_size(len(batch.ids))
+    results = await AsyncTaskService.set_complete_many(
+        db, current_user.id, batch.ids, batch.is_complete
+    )
+    return model_response(TaskBatchResponse, {"results": results})
+
+
+@router.delete("/batch", response_model=TaskBatchResponse)
+async def delete_tasks(
+    batch: TaskBatchIds,
+    db: Annotated[Database, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)]
+):
+    """Delete several tasks in one transaction, with a result per ID."""
+    check_batch_size(len(batch.ids))
+    results = await AsyncTaskService.delete_many(db, current_user.id, batch.ids)
+    return model_response(TaskBatchResponse, {"results": results})
 
 
 @router.put("/{task_id}", response_model=TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    session: Annotated[Session, Depends(get_session)],
+    db: Annotated[Database, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """Update a task."""
-    task = TaskService.update_task(session, task_id, current_user.id, task_data)
+    task = await AsyncTaskService.update_task(db, task_id, current_user.id, task_data)
     
     if task is None:
         raise HTTPException(
@@ -54,17 +362,17 @@ def update_task(
             detail="Task not found"
         )
     
-    return task
+    return model_response(TaskRead, task)
 
 
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    db: Annotated[Database, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """Delete a task."""
-    deleted = TaskService.delete_task(session, task_id, current_user.id)
+    deleted = await AsyncTaskService.delete_task(db, task_id, current_user.id)
     
     if not deleted:
         raise HTTPException(
@@ -72,17 +380,17 @@ def delete_task(
             detail="Task not found"
         )
     
-    return {"success": True, "message": "Task deleted"}
+    return json_response({"success": True, "message": "Task deleted"})
 
 
 @router.patch("/{task_id}/complete", response_model=TaskRead)
-def toggle_complete(
+async def toggle_complete(
     task_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    db: Annotated[Database, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """Toggle task completion status."""
-    task = TaskService.toggle_complete(session, task_id, current_user.id)
+    task = await AsyncTaskService.toggle_complete(db, task_id, current_user.id)
     
     if task is None:
         raise HTTPException(
@@ -90,4 +398,4 @@ def toggle_complete(
             detail="Task not found"
         )
     
-    return task
+    return model_response(TaskRead, task)
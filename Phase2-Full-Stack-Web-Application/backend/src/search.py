@@ -0,0 +1,253 @@
+"""Database-native full-text search over task titles and descriptions.
+
+SQLite keeps an FTS5 index, ``tasks_fts``, as an external-content table over
+``tasks``: triggers on ``tasks`` keep it in sync, so every write path (ORM,
+Core and batch statements alike) updates it in the same transaction. The
+index is shared by every user, so it also indexes ``user_id`` and each query
+matches the owner's id inside the MATCH: FTS5 intersects the owner's rows
+with the matched words instead of collecting every user's matches first.
+PostgreSQL uses a stored, generated ``tasks.search_vector`` column with a GIN
+index, which the database maintains itself. Titles weigh more than
+descriptions in both.
+
+Queries are split into words and every word is matched as a prefix, so
+``"gro mil"`` finds "Buy groceries and milk". Matches are ranked (BM25 on
+SQLite, ``ts_rank_cd`` on PostgreSQL), but only among the user's
+``SEARCH_CANDIDATES`` newest matches: scoring every match of a word that
+appears in half of 100,000 tasks takes tens of milliseconds, while finding
+the newest matches is an index walk. Selective queries never reach the cap.
+Other databases, or SQLite builds without FTS5, fall back to an unranked
+substring match, newest first.
+
+Snippets are cut from the returned rows in Python, so only those rows pay
+for them: matched words are wrapped in ``<mark>`` tags and the rest of the
+text is HTML-escaped.
+"""
+
+import html
+import re
+import unicodedata
+import weakref
+
+from sqlalchemy import func, inspect, literal_column, or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from .models.task import Task
+
+
+FTS_TABLE = "tasks_fts"
+SEARCH_CANDIDATES = 1000
+SNIPPET_WORDS = 12
+
+_WORD = re.compile(r"\w+")
+
+_backends: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+_SQLITE_SETUP = [
+    # Prefix indexes up to four characters keep short prefix queries from
+    # merging thousands of distinct words.
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, user_id, content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+    AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+        INSERT INTO {FTS_TABLE} (rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END""",
+    # Index the rows that existed before the table did.
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+_SQLITE_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_POSTGRES_SETUP = [
+    """ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search ON tasks USING GIN (search_vector)",
+]
+
+# The query names the owner, so both read the index alone. The owner's
+# column weighs nothing in the ranking.
+_FTS_FLOOR = text(f"""
+    SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query
+    ORDER BY rowid DESC LIMIT 1 OFFSET :offset
+""")
+
+_FTS_RANKED = text(f"""
+    SELECT rowid AS id, -bm25({FTS_TABLE}, 10.0, 1.0, 0.0) AS rank
+    FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query AND rowid >= :floor
+    ORDER BY rank DESC, rowid DESC LIMIT :limit
+""")
+
+
+def _has_fts5(connection: Connection) -> bool:
+    try:
+        connection.execute(text("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)"))
+    except OperationalError:
+        return False
+    connection.execute(text("DROP TABLE temp.fts5_probe"))
+    return True
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the full-text index for the connection's database, if it has one."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite" and _has_fts5(connection):
+        statements = _SQLITE_SETUP
+    elif dialect == "postgresql":
+        statements = _POSTGRES_SETUP
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop SQLite's full-text index and its triggers, if they exist."""
+    if connection.dialect.name == "sqlite":
+        for statement in _SQLITE_TEARDOWN:
+            connection.execute(text(statement))
+
+
+def search_backend(engine: Engine) -> str:
+    """``fts5``, ``tsvector`` or ``like``: how the engine's database searches.
+
+    The answer is remembered per engine, since the index only ever appears
+    through a migration at start-up.
+    """
+    backend = _backends.get(engine)
+    if backend is None:
+        if engine.dialect.name == "postgresql":
+            columns = {column["name"] for column in inspect(engine).get_columns("tasks")}
+            backend = "tsvector" if "search_vector" in columns else "like"
+        elif engine.dialect.name == "sqlite" and inspect(engine).has_table(FTS_TABLE):
+            backend = "fts5"
+        else:
+            backend = "like"
+        _backends[engine] = backend
+    return backend
+
+
+def _fold(word: str) -> str:
+    """Lower-case a word and strip its diacritics, as the FTS5 tokenizer does."""
+    decomposed = unicodedata.normalize("NFKD", word.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def search_terms(q: str) -> list[str]:
+    """The lower-cased words of a query; punctuation and operators are dropped."""
+    return [word.lower() for word in _WORD.findall(q)]
+
+
+def _fts5_matches(session: Session, user_id: int, terms: list[str], limit: int) -> list:
+    # Quoted terms are plain words to FTS5; the trailing * makes each a
+    # prefix. They only match the text columns, never the owner's id.
+    words = " ".join(f'"{term}"*' for term in terms)
+    params = {"query": f'{{title description}}:({words}) AND user_id:"{user_id}"'}
+    # The oldest of the newest SEARCH_CANDIDATES matches bounds the ranking.
+    floor = session.exec(_FTS_FLOOR, params={**params, "offset": SEARCH_CANDIDATES - 1}).first()
+    params["floor"] = floor[0] if floor else 0
+    return session.exec(_FTS_RANKED, params={**params, "limit": limit}).all()
+
+
+def ranked_matches(session: Session, user_id: int, terms: list[str], limit: int) -> list:
+    """The ids of a user's best matches for a non-empty list of terms.
+
+    Returns:
+        ``(id, rank)`` rows, best (highest rank) first.
+    """
+    backend = search_backend(session.get_bind())
+    if backend == "fts5":
+        return _fts5_matches(session, user_id, terms, limit)
+
+    if backend == "tsvector":
+        vector = literal_column("tasks.search_vector")
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        candidates = (
+            select(Task.id, vector.label("search_vector"))
+            .where(Task.user_id == user_id, vector.op("@@")(query))
+            .order_by(Task.id.desc())
+            .limit(SEARCH_CANDIDATES)
+            .subquery()
+        )
+        rank = func.ts_rank_cd(candidates.c.search_vector, query).label("rank")
+        statement = (
+            select(candidates.c.id, rank)
+            .order_by(rank.desc(), candidates.c.id.desc())
+            .limit(limit)
+        )
+        return session.exec(statement).all()
+
+    conditions = [
+        or_(
+            Task.title.icontains(term, autoescape=True),
+            Task.description.icontains(term, autoescape=True),
+        )
+        for term in terms
+    ]
+    statement = (
+        select(Task.id, literal_column("0.0").label("rank"))
+        .where(Task.user_id == user_id, *conditions)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(limit)
+    )
+    return session.exec(statement).all()
+
+
+def _highlight(text: str, terms: list[str]) -> str | None:
+    """The window of ``text`` around its first matched word, or None."""
+    words = list(_WORD.finditer(text))
+    prefixes = tuple(_fold(term) for term in terms)
+    matched = {i for i, word in enumerate(words) if _fold(word.group()).startswith(prefixes)}
+    if not matched:
+        return None
+    # Keep a little context before the first match.
+    first = max(0, min(min(matched) - 2, len(words) - SNIPPET_WORDS))
+    window = words[first:first + SNIPPET_WORDS]
+    parts = ["…"] if first > 0 else []
+    position = window[0].start() if first > 0 else 0
+    for i, word in enumerate(window, start=first):
+        parts.append(html.escape(text[position:word.start()], quote=False))
+        escaped = html.escape(word.group(), quote=False)
+        parts.append(f"<mark>{escaped}</mark>" if i in matched else escaped)
+        position = word.end()
+    if first + SNIPPET_WORDS < len(words):
+        parts.append("…")
+    else:
+        parts.append(html.escape(text[position:], quote=False))
+    return "".join(parts)
+
+
+def make_snippet(title: str, description: str | None, terms: list[str]) -> str:
+    """An HTML snippet of a task with the words matching ``terms`` marked.
+
+    Prefers the description, which has more context around a match, and
+    falls back to the escaped title when neither matches word by word (a
+    substring search can match inside a word).
+    """
+    for field in (description or "", title):
+        snippet = _highlight(field, terms)
+        if snippet is not None:
+            return snippet
+    return html.escape(title, quote=False)
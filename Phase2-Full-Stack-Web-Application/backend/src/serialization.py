@@ -0,0 +1,82 @@
+"""Fast JSON responses for plain rows.
+
+FastAPI validates a route's return value against its ``response_model`` and
+then encodes the result with the stdlib ``json`` module. For a list of
+thousands of tasks that is most of the request's CPU time, and the data is
+already in the right shape when it comes straight from a column projection.
+``json_response`` turns dicts, lists and datetimes into bytes in one step,
+with orjson when it is installed, producing the same JSON FastAPI would.
+
+Routes returning a single model use ``model_response``, which validates and
+encodes it as FastAPI would, so that work is timed too.
+"""
+
+import json
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from .metrics import record_serialization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON.
+
+    Naive datetimes become ISO 8601 strings without an offset, as pydantic
+    renders them.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[dict[str, str]] = None
+) -> Response:
+    """A JSON response whose body is encoded without model validation.
+
+    The content must already match the route's documented response model.
+    The encoding time is charged to the request's metrics.
+    """
+    started = perf_counter()
+    body = dumps(content)
+    record_serialization(perf_counter() - started)
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def model_response(
+    model: type[BaseModel],
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[dict[str, str]] = None
+) -> Response:
+    """A JSON response of ``content`` validated against ``model``.
+
+    Does what FastAPI does with a ``response_model``: ``content`` (an ORM
+    object, a dict or a model instance) is validated and encoded. Unlike
+    FastAPI, the time taken is charged to the request's metrics.
+    """
+    started = perf_counter()
+    if not isinstance(content, model):
+        content = model.model_validate(content)
+    body = content.model_dump_json().encode("utf-8")
+    record_serialization(perf_counter() - started)
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
@@ -1,6 +1,6 @@
 """Services package."""
 
-from .auth_service import AuthService
-from .task_service import TaskService
+from .auth_service import AsyncAuthService, AuthService
+from .task_service import AsyncTaskService, TaskService
 
-__all__ = ["AuthService", "TaskService"]
+__all__ = ["AsyncAuthService", "AsyncTaskService", "AuthService", "TaskService"]
@@ -2,16 +2,19 @@
 
 from datetime import datetime, timedelta
 from typing import Optional
-import hashlib
-import secrets
 from jose import jwt, JWTError
 from sqlmodel import Session, select
+from .. import hashing
+from ..database import Database, run_sync
+from ..hashing import HasherBusyError, PasswordHasher
 from ..models.user import User, UserCreate
 from ..config import get_settings
 
 
 settings = get_settings()
 
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue)
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -19,29 +22,17 @@ class AuthService:
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using PBKDF2-SHA256."""
-        salt = secrets.token_hex(16)
-        pw_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000  # iterations
-        )
-        return f"{salt}${pw_hash.hex()}"
+        return hashing.hash_password(password, settings.password_hash_iterations)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        try:
-            salt, stored_hash = hashed_password.split('$')
-            pw_hash = hashlib.pbkdf2_hmac(
-                'sha256',
-                plain_password.encode('utf-8'),
-                salt.encode('utf-8'),
-                100000
-            )
-            return pw_hash.hex() == stored_hash
-        except ValueError:
-            return False
+        return hashing.verify_password(plain_password, hashed_password)
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Whether a hash uses fewer iterations than currently configured."""
+        return hashing.needs_rehash(hashed_password, settings.password_hash_iterations)
     
     @staticmethod
     def create_access_token(user_id: int) -> str:
@@ -54,20 +45,28 @@ class AuthService:
         return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
     
     @staticmethod
-    def verify_token(token: str) -> Optional[int]:
-        """Verify a JWT token and return user_id if valid."""
+    def decode_token(token: str) -> Optional[dict]:
+        """Verify a JWT token and return its claims if valid."""
         try:
             payload = jwt.decode(
                 token, 
                 settings.jwt_secret, 
                 algorithms=[settings.jwt_algorithm]
             )
-            user_id = payload.get("sub")
-            if user_id is None:
+            if payload.get("sub") is None:
                 return None
-            return int(user_id)
-        except JWTError:
+            int(payload["sub"])
+            return payload
+        except (JWTError, ValueError):
+            return None
+    
+    @staticmethod
+    def verify_token(token: str) -> Optional[int]:
+        """Verify a JWT token and return user_id if valid."""
+        payload = AuthService.decode_token(token)
+        if payload is None:
             return None
+        return int(payload["sub"])
     
     @staticmethod
     def get_user_by_email(session: Session, email: str) -> Optional[User]:
@@ -83,10 +82,33 @@ class AuthService:
     @staticmethod
     def create_user(session: Session, user_data: UserCreate) -> User:
         """Create a new user."""
-        user = User(
-            email=user_data.email,
-            password_hash=AuthService.hash_password(user_data.password)
+        return AuthService.save_user(
+            session,
+            user_data.email,
+            AuthService.hash_password(user_data.password)
         )
+    
+    @staticmethod
+    def save_user(session: Session, email: str, password_hash: str) -> User:
+        """Insert a user whose password is already hashed."""
+        user = User(email=email, password_hash=password_hash)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+    
+    @staticmethod
+    def update_password_hash(
+        session: Session,
+        user_id: int,
+        password_hash: str
+    ) -> Optional[User]:
+        """Replace a user's password hash."""
+        user = session.get(User, user_id)
+        if user is None:
+            return None
+        user.password_hash = password_hash
+        user.updated_at = datetime.utcnow()
         session.add(user)
         session.commit()
         session.refresh(user)
@@ -105,3 +127,52 @@ class AuthService:
         if not AuthService.verify_password(password, user.password_hash):
             return None
         return user
+
+
+class AsyncAuthService:
+    """Awaitable AuthService for async routes.
+    
+    Database work goes through ``database.run_sync``. Password hashing is
+    deliberately slow CPU work, so it runs in ``password_hasher``'s process
+    pool; when that is saturated these methods raise ``HasherBusyError``.
+    """
+    
+    @staticmethod
+    async def get_user_by_email(db: Database, email: str) -> Optional[User]:
+        """Get user by email address."""
+        return await run_sync(db, AuthService.get_user_by_email, email)
+    
+    @staticmethod
+    async def get_user_by_id(db: Database, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return await run_sync(db, AuthService.get_user_by_id, user_id)
+    
+    @staticmethod
+    async def create_user(db: Database, user_data: UserCreate) -> User:
+        """Create a new user."""
+        password_hash = await password_hasher.hash(
+            user_data.password, settings.password_hash_iterations
+        )
+        return await run_sync(db, AuthService.save_user, user_data.email, password_hash)
+    
+    @staticmethod
+    async def authenticate_user(db: Database, email: str, password: str) -> Optional[User]:
+        """Authenticate user with email and password.
+        
+        Hashes made with fewer than the configured iterations are upgraded
+        after a successful check, unless the hashing pool is busy.
+        """
+        user = await AsyncAuthService.get_user_by_email(db, email)
+        if user is None:
+            return None
+        if not await password_hasher.verify(password, user.password_hash):
+            return None
+        if AuthService.needs_rehash(user.password_hash):
+            try:
+                password_hash = await password_hasher.hash(
+                    password, settings.password_hash_iterations
+                )
+            except HasherBusyError:
+                return user
+            user = await run_sync(db, AuthService.update_password_hash, user.id, password_hash)
+        return user
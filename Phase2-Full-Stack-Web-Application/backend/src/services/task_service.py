@@ -1,32 +1,665 @@
 """Task service for CRUD operations."""
 
-from datetime import datetime
+from collections import Counter
+from datetime import date, datetime, timedelta
 from typing import Optional
+from sqlalchemy import Row, case, delete, insert, not_, or_, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
-from ..models.task import Task, TaskCreate, TaskUpdate
+from ..database import Database, run_sync
+from ..events import task_events
+from ..models.task import (
+    PRIORITY_NAMES,
+    PRIORITY_RANKS,
+    CompletionBucket,
+    Task,
+    TaskBatchResult,
+    TaskCompletionDay,
+    TaskCreate,
+    TaskRead,
+    TaskStats,
+    TaskTombstone,
+    TaskUpdate,
+)
+from ..models.user import User
+from ..pagination import (
+    SyncPosition,
+    SyncTokenExpiredError,
+    decode_cursor,
+    decode_sync_token,
+    encode_cursor,
+    encode_sync_token,
+)
+from ..search import make_snippet, ranked_matches, search_terms
+
+
+def _read_column(name: str):
+    column = Task.__table__.c[name]
+    if name == "priority":
+        return case(PRIORITY_NAMES, value=column).label(name)
+    return column
+
+
+# The task columns in TaskRead's field order, so a projected row's
+# ``_asdict()`` has the same keys, in the same order, as a serialized TaskRead.
+TASK_READ_COLUMNS = [_read_column(name) for name in TaskRead.model_fields]
+
+# Each list sort's key (ending in the ID to make it unique) and its default
+# order. Every key is the tail of an index that starts with user_id.
+SORT_KEYS = {
+    "date": (Task.created_at, Task.id),
+    "priority": (Task.priority, Task.created_at, Task.id),
+    "title": (Task.title, Task.id),
+}
+DEFAULT_ORDER = {"date": "desc", "priority": "desc", "title": "asc"}
+
+
+_UPSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def completion_changes(rows, deleted: bool = False) -> Counter:
+    """Per-day change in completed tasks from rows as returned by a write.
+    
+    The rows either just had their completion flipped (counting +1 on the
+    completion day if now complete, -1 if reopened) or, with ``deleted``,
+    were just deleted (-1 for each that was complete).
+    """
+    changes = Counter()
+    for row in rows:
+        if deleted and not row.is_complete:
+            continue
+        changes[row.completed_at.date()] += 1 if row.is_complete and not deleted else -1
+    return changes
+
+
+def _add_completions(session: Session, user_id: int, day: date, delta: int) -> None:
+    """Add ``delta`` to a user's completion bucket for ``day``."""
+    table = TaskCompletionDay.__table__
+    upsert = _UPSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(table).values(user_id=user_id, day=day, completed=delta)
+        session.exec(statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={"completed": table.c.completed + delta}
+        ))
+        return
+    result = session.exec(
+        update(table).where(table.c.user_id == user_id, table.c.day == day)
+        .values(completed=table.c.completed + delta)
+    )
+    if not result.rowcount:
+        session.exec(insert(table).values(user_id=user_id, day=day, completed=delta))
+
+
+def _completed_at_after_toggle(now: datetime):
+    """SET value for completed_at when flipping is_complete in the same UPDATE.
+    
+    SET expressions see the old row, so a task being completed gets ``now``
+    and one being reopened keeps its completion time.
+    """
+    column = Task.__table__.c.completed_at
+    return case((Task.__table__.c.is_complete, column), else_=now)
+
+
+def _next_change_seq(user_id: int):
+    """SQL for the change_seq of the current transaction's task writes.
+    
+    That is the data_version ``_record_change`` is about to set. Where the
+    database has row locks the user's row is locked while reading it, so
+    concurrent writers for one user get sequence numbers in commit order
+    and a sync never skips past a change that has yet to commit.
+    """
+    users = User.__table__
+    return (
+        select(users.c.data_version + 1).where(users.c.id == user_id)
+        .with_for_update().scalar_subquery()
+    )
+
+
+def _lock_change_seq(session: Session, user_id: int):
+    """Lock the user's row before a delete; returns the change_seq to use.
+    
+    Updates lock the user's row (through ``_next_change_seq``) before the
+    task rows they write, but a DELETE locks its task rows first. So where
+    the database has row locks the user's row is locked up front, keeping
+    every write in the same user-then-task order. SQLite locks the whole
+    database for the first write, and reading before it would only risk a
+    busy error when the transaction upgrades to a writer.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return _next_change_seq(user_id)
+    users = User.__table__
+    return session.exec(
+        select(users.c.data_version + 1).where(users.c.id == user_id).with_for_update()
+    ).one()
+
+
+def _add_tombstones(session: Session, user_id: int, task_ids: list[int], change_seq) -> None:
+    """Record deleted tasks for delta sync, in the caller's transaction."""
+    now = datetime.utcnow()
+    session.exec(insert(TaskTombstone.__table__).values([
+        {"user_id": user_id, "change_seq": change_seq, "task_id": task_id, "deleted_at": now}
+        for task_id in task_ids
+    ]))
+
+
+def _record_change(
+    session: Session,
+    user_id: int,
+    added: int = 0,
+    completions: Optional[Counter] = None
+) -> None:
+    """Record a change to a user's tasks, in the caller's transaction.
+    
+    Bumps the data version and moves the task counters in one UPDATE of the
+    user's row; ``completions`` (see ``completion_changes``) also adjusts
+    the completion buckets.
+    """
+    completions = completions or Counter()
+    users = User.__table__
+    session.exec(
+        update(users).where(users.c.id == user_id).values(
+            data_version=users.c.data_version + 1,
+            task_count=users.c.task_count + added,
+            completed_count=users.c.completed_count + sum(completions.values()),
+        )
+    )
+    for day, delta in sorted(completions.items()):
+        if delta:
+            _add_completions(session, user_id, day, delta)
+
+
+def _publish(user_id: int, event_type: str, items) -> None:
+    """Tell the user's stream subscribers about committed changes.
+    
+    ``items`` are the changed tasks (anything TaskRead validates), or the
+    IDs of deleted tasks. Nothing is built when nobody is listening.
+    """
+    if not task_events.has_subscribers(user_id):
+        return
+    for item in items:
+        if event_type == "deleted":
+            payload = {"id": item}
+        else:
+            payload = {"task": TaskRead.model_validate(item).model_dump(mode="json")}
+        task_events.publish(user_id, event_type, payload)
+
+
+def _write_returning(
+    session: Session,
+    statement,
+    user_id: int,
+    task_id: int,
+    toggles_completion: bool = False
+) -> Optional[Task]:
+    """Run an UPDATE on one task and return the task as stored afterwards.
+    
+    Uses ``UPDATE ... RETURNING`` where supported, so the write and the read
+    are one statement. Elsewhere the UPDATE is followed by a SELECT in the
+    same transaction. With ``toggles_completion`` the statement flipped the
+    task's completion, and the completion counters follow it.
+    
+    Returns:
+        A detached Task, or None if no task matched.
+    """
+    table = Task.__table__
+    if session.get_bind().dialect.update_returning:
+        row = session.exec(statement.returning(*table.c)).first()
+    else:
+        result = session.exec(statement)
+        row = None
+        if result.rowcount:
+            row = session.exec(
+                select(*table.c).where(table.c.id == task_id, table.c.user_id == user_id)
+            ).first()
+    if row is not None:
+        completions = completion_changes([row]) if toggles_completion else None
+        _record_change(session, user_id, completions=completions)
+    session.commit()
+    return Task(**row._asdict()) if row is not None else None
 
 
 class TaskService:
-    """Service for task CRUD operations."""
+    """Service for task CRUD operations.
+    
+    Mutations are single statements (``... RETURNING`` where supported)
+    scoped by ``(id, user_id)``, so each is one round trip and atomic; a
+    task that does not exist or belongs to another user simply matches no
+    rows. A mutation that changes anything also bumps the user's
+    ``data_version`` and moves their task counters and completion buckets
+    (``get_stats``) in the same transaction, and once committed is published
+    to the user's stream subscribers (``events.task_events``).
+    """
     
     @staticmethod
     def create_task(session: Session, user_id: int, task_data: TaskCreate) -> Task:
         """Create a new task for a user."""
-        task = Task(
-            user_id=user_id,
-            title=task_data.title,
-            description=task_data.description
+        now = datetime.utcnow()
+        values = {
+            "user_id": user_id,
+            "title": task_data.title,
+            "description": task_data.description,
+            "is_complete": False,
+            "priority": PRIORITY_RANKS[task_data.priority],
+            "change_seq": _next_change_seq(user_id),
+            "created_at": now,
+            "updated_at": now,
+        }
+        table = Task.__table__
+        if session.get_bind().dialect.insert_returning:
+            row = session.exec(insert(table).values(values).returning(*table.c)).one()
+            _record_change(session, user_id, added=1)
+            session.commit()
+            created = Task(**row._asdict())
+        else:
+            task = Task(**values)
+            session.add(task)
+            session.flush()
+            created = Task(**task.model_dump())
+            _record_change(session, user_id, added=1)
+            session.commit()
+        _publish(user_id, "created", [created])
+        return created
+    
+    @staticmethod
+    def get_user_tasks(
+        session: Session,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        status: str = "all",
+        q: Optional[str] = None,
+        sort: str = "date",
+        order: Optional[str] = None
+    ) -> tuple[list[Row], Optional[str]]:
+        """Get a user's tasks, filtered and sorted, optionally one page at a time.
+        
+        Tasks are returned as lightweight rows of ``TASK_READ_COLUMNS``
+        rather than ORM objects: lists are read-only and can be large, and
+        ``row._asdict()`` is ready to serialize as-is.
+        
+        ``ids`` restricts the result to those tasks; IDs that do not exist
+        or belong to someone else are left out. ``status`` is ``all``,
+        ``pending`` or ``completed``, and ``q`` keeps tasks whose title or
+        description contains it, ignoring case.
+        
+        ``sort`` is ``date`` (newest first by default), ``priority``
+        (highest first, then newest) or ``title`` (A-Z); ``order`` (``asc``
+        or ``desc``) reverses the default. Each sort reads an index in
+        order, so no sorting happens at query time.
+        
+        Pages use keyset pagination on the sort key: the cursor holds the
+        key of the previous page's last task and the next page starts
+        strictly after it, so every page costs the same however deep the
+        client goes.
+        
+        Returns:
+            The tasks and a cursor for the next page (None on the last page).
+        
+        Raises:
+            ValueError: If the cursor is malformed or from another sort.
+        """
+        order = order or DEFAULT_ORDER[sort]
+        key = SORT_KEYS[sort]
+        statement = select(*TASK_READ_COLUMNS).where(Task.user_id == user_id)
+        if ids is not None:
+            statement = statement.where(Task.id.in_(ids))
+        if status != "all":
+            statement = statement.where(Task.is_complete == (status == "completed"))
+        if q:
+            statement = statement.where(or_(
+                Task.title.icontains(q, autoescape=True),
+                Task.description.icontains(q, autoescape=True),
+            ))
+        if cursor is not None:
+            after = tuple_(*key)
+            bound = tuple_(*decode_cursor(cursor, sort, order))
+            statement = statement.where(after < bound if order == "desc" else after > bound)
+        statement = statement.order_by(
+            *(column.desc() if order == "desc" else column.asc() for column in key)
+        )
+        if limit is None:
+            return list(session.exec(statement).all()), None
+        
+        # Fetch one extra row to learn whether another page follows.
+        tasks = list(session.exec(statement.limit(limit + 1)).all())
+        if len(tasks) <= limit:
+            return tasks, None
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        last_key = [getattr(last, column.name) for column in key]
+        if sort == "priority":
+            last_key[0] = PRIORITY_RANKS[last.priority]
+        return tasks, encode_cursor(*last_key, sort=sort, order=order)
+    
+    @staticmethod
+    def search_tasks(session: Session, user_id: int, q: str, limit: int = 20) -> list[dict]:
+        """Full-text search of a user's task titles and descriptions.
+        
+        Every word of ``q`` matches as a prefix and all must match. Uses the
+        database's full-text index (see ``search``), best match first.
+        
+        Returns:
+            Dicts of the TaskRead fields plus ``rank`` and ``snippet``.
+        """
+        terms = search_terms(q)
+        if not terms:
+            return []
+        matches = ranked_matches(session, user_id, terms, limit)
+        if not matches:
+            return []
+        # Ownership is checked on the table too, not only by the index.
+        statement = select(*TASK_READ_COLUMNS).where(
+            Task.user_id == user_id, Task.id.in_([match.id for match in matches])
         )
-        session.add(task)
+        tasks = {row.id: row._asdict() for row in session.exec(statement).all()}
+        results = []
+        for match in matches:
+            # A task deleted between the two queries is dropped.
+            task = tasks.get(match.id)
+            if task is None:
+                continue
+            task["rank"] = match.rank
+            task["snippet"] = make_snippet(task["title"], task["description"], terms)
+            results.append(task)
+        return results
+    
+    @staticmethod
+    def create_tasks(
+        session: Session,
+        user_id: int,
+        items: list[TaskCreate]
+    ) -> list[TaskBatchResult]:
+        """Create several tasks in one transaction.
+        
+        Items with an empty title are reported as errors; the rest are
+        inserted with a multi-row ``INSERT ... RETURNING`` where the
+        database supports it.
+        
+        Returns:
+            One result per item, in request order.
+        """
+        results: list[Optional[TaskBatchResult]] = []
+        rows: list[tuple[int, dict]] = []
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            if not item.title.strip():
+                results.append(TaskBatchResult(
+                    index=index, status=400, error="Title is required"
+                ))
+                continue
+            results.append(None)
+            rows.append((index, {
+                "user_id": user_id,
+                "title": item.title,
+                "description": item.description,
+                "is_complete": False,
+                "priority": PRIORITY_RANKS[item.priority],
+                "created_at": now,
+                "updated_at": now,
+            }))
+        if not rows:
+            return results
+        
+        table = Task.__table__
+        change_seq = _next_change_seq(user_id)
+        if session.get_bind().dialect.insert_returning:
+            # Rows come back in parameter order, so they line up with the items.
+            inserted = session.exec(
+                insert(table).values(change_seq=change_seq).returning(
+                    *table.c, sort_by_parameter_order=True
+                ),
+                params=[values for _, values in rows]
+            ).all()
+            created = [TaskRead.model_validate(row._asdict()) for row in inserted]
+        else:
+            tasks = [Task(**values, change_seq=change_seq) for _, values in rows]
+            session.add_all(tasks)
+            session.flush()
+            created = [TaskRead.model_validate(task) for task in tasks]
+        _record_change(session, user_id, added=len(created))
         session.commit()
-        session.refresh(task)
-        return task
+        _publish(user_id, "created", created)
+        
+        for (index, _), task in zip(rows, created):
+            results[index] = TaskBatchResult(index=index, status=201, id=task.id, task=task)
+        return results
+    
+    @staticmethod
+    def set_complete_many(
+        session: Session,
+        user_id: int,
+        ids: list[int],
+        is_complete: Optional[bool] = None
+    ) -> list[TaskBatchResult]:
+        """Set (or, if is_complete is None, toggle) completion of many tasks.
+        
+        Runs one ``UPDATE ... WHERE id IN (...)`` in a single transaction.
+        When setting, tasks already in the requested state are left alone.
+        
+        Returns:
+            One result per distinct ID, in request order.
+        """
+        ids = list(dict.fromkeys(ids))
+        table = Task.__table__
+        scope = (table.c.user_id == user_id, table.c.id.in_(ids))
+        now = datetime.utcnow()
+        if is_complete is None:
+            flipped = scope
+            values = {
+                "is_complete": not_(table.c.is_complete),
+                "completed_at": _completed_at_after_toggle(now),
+            }
+        else:
+            # Only tasks whose state changes are written (and counted);
+            # the others are read back as they are.
+            flipped = (*scope, table.c.is_complete == (not is_complete))
+            values = {"is_complete": is_complete}
+            if is_complete:
+                values["completed_at"] = now
+        statement = update(table).where(*flipped).values(
+            updated_at=now, change_seq=_next_change_seq(user_id), **values
+        )
+        
+        if session.get_bind().dialect.update_returning:
+            rows = session.exec(statement.returning(*table.c)).all()
+        else:
+            flipped_ids = session.exec(select(table.c.id).where(*flipped)).all()
+            session.exec(statement.where(table.c.id.in_(flipped_ids)))
+            rows = session.exec(select(*table.c).where(table.c.id.in_(flipped_ids))).all()
+        flipped_rows = [row._asdict() for row in rows]
+        if rows:
+            _record_change(session, user_id, completions=completion_changes(rows))
+        if is_complete is not None and len(rows) < len(ids):
+            changed = {row.id for row in rows}
+            rows += session.exec(
+                select(*table.c).where(*scope, table.c.id.not_in(changed))
+            ).all()
+        session.commit()
+        _publish(user_id, "toggled", flipped_rows)
+        
+        updated = {row.id: TaskRead.model_validate(row._asdict()) for row in rows}
+        return [
+            TaskBatchResult(index=index, status=200, id=task_id, task=updated[task_id])
+            if task_id in updated else
+            TaskBatchResult(index=index, status=404, id=task_id, error="Task not found")
+            for index, task_id in enumerate(ids)
+        ]
+    
+    @staticmethod
+    def delete_many(session: Session, user_id: int, ids: list[int]) -> list[TaskBatchResult]:
+        """Delete many tasks with one ``DELETE ... WHERE id IN (...)``.
+        
+        Returns:
+            One result per distinct ID, in request order.
+        """
+        ids = list(dict.fromkeys(ids))
+        table = Task.__table__
+        scope = (table.c.user_id == user_id, table.c.id.in_(ids))
+        statement = delete(table).where(*scope)
+        change_seq = _lock_change_seq(session, user_id)
+        
+        columns = (table.c.id, table.c.is_complete, table.c.completed_at)
+        if session.get_bind().dialect.delete_returning:
+            rows = session.exec(statement.returning(*columns)).all()
+        else:
+            rows = session.exec(select(*columns).where(*scope)).all()
+            session.exec(statement)
+        if rows:
+            _add_tombstones(session, user_id, [row.id for row in rows], change_seq)
+            _record_change(
+                session, user_id, added=-len(rows),
+                completions=completion_changes(rows, deleted=True)
+            )
+        session.commit()
+        deleted = [row.id for row in rows]
+        _publish(user_id, "deleted", deleted)
+        
+        return [
+            TaskBatchResult(index=index, status=200, id=task_id)
+            if task_id in deleted else
+            TaskBatchResult(index=index, status=404, id=task_id, error="Task not found")
+            for index, task_id in enumerate(ids)
+        ]
     
     @staticmethod
-    def get_user_tasks(session: Session, user_id: int) -> list[Task]:
-        """Get all tasks for a user."""
-        statement = select(Task).where(Task.user_id == user_id).order_by(Task.created_at.desc())
-        return list(session.exec(statement).all())
+    def get_data_version(session: Session, user_id: int) -> Optional[int]:
+        """Get the version of a user's task list (a primary key lookup)."""
+        return session.exec(select(User.data_version).where(User.id == user_id)).first()
+    
+    @staticmethod
+    def get_changes(
+        session: Session,
+        user_id: int,
+        since: Optional[str] = None,
+        limit: int = 500
+    ) -> dict:
+        """Get what changed in a user's tasks since a sync token (delta sync).
+        
+        Every task write stamps the task with a ``change_seq`` and every
+        delete leaves a tombstone with one, so a sync reads only the rows
+        after the token's position, through ``ix_tasks_user_changes`` and
+        the tombstones' key: its cost follows the number of changes, not
+        the number of tasks. Without ``since`` all tasks are returned (a
+        full sync) with a token to continue from.
+        
+        Only changes up to the user's data version, read first, are
+        returned. Writers stamp rows with the version they are about to
+        set while holding the user's row, so every change at or below it
+        has committed and a later one can never be numbered below it. The
+        sync floor is read last: pruning raises it in the transaction that
+        deletes the tombstones, so a sync that missed them sees the raise.
+        
+        Returns:
+            A dict shaped like TaskChanges, with the tasks as TaskRead dicts.
+        
+        Raises:
+            ValueError: If ``since`` is malformed.
+            SyncTokenExpiredError: If tombstones the token still needs have
+                been pruned; the client must start over with a full sync.
+        """
+        position = decode_sync_token(since) if since is not None else None
+        version = session.exec(select(User.data_version).where(User.id == user_id)).one()
+        if position is None:
+            position = SyncPosition(floor=version, seq=-1)
+        
+        def after(seq_column, id_column):
+            if position.task_id is None:
+                return seq_column > position.seq
+            return tuple_(seq_column, id_column) > tuple_(position.seq, position.task_id)
+        
+        tasks, tombstones = Task.__table__, TaskTombstone.__table__
+        # Each source is read in change order, one row past the page.
+        changed = session.exec(
+            select(*TASK_READ_COLUMNS, tasks.c.change_seq)
+            .where(
+                tasks.c.user_id == user_id,
+                after(tasks.c.change_seq, tasks.c.id),
+                tasks.c.change_seq <= version,
+            )
+            .order_by(tasks.c.change_seq, tasks.c.id).limit(limit + 1)
+        ).all()
+        deleted = session.exec(
+            select(tombstones.c.change_seq, tombstones.c.task_id)
+            .where(
+                tombstones.c.user_id == user_id,
+                after(tombstones.c.change_seq, tombstones.c.task_id),
+                tombstones.c.change_seq > position.floor,
+                tombstones.c.change_seq <= version,
+            )
+            .order_by(tombstones.c.change_seq, tombstones.c.task_id).limit(limit + 1)
+        ).all()
+        sync_floor = session.exec(select(User.sync_floor).where(User.id == user_id)).one()
+        # Pruned tombstones are numbered up to the floor; did the position
+        # still need any of them?
+        missed = position.seq < sync_floor or (
+            position.seq == sync_floor and position.task_id is not None
+        )
+        if position.floor < sync_floor and missed:
+            raise SyncTokenExpiredError("Sync token expired; sync again without one")
+        
+        entries = sorted(
+            [(row.change_seq, row.id, row) for row in changed]
+            + [(row.change_seq, row.task_id, None) for row in deleted],
+            key=lambda entry: entry[:2]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        if has_more:
+            seq, task_id, _ = entries[-1]
+            next_position = SyncPosition(position.floor, seq, task_id)
+        else:
+            next_position = SyncPosition(version, version)
+        
+        changes = []
+        for _, _, row in entries:
+            if row is not None:
+                task = row._asdict()
+                del task["change_seq"]
+                changes.append(task)
+        return {
+            "changes": changes,
+            "deleted": [task_id for _, task_id, row in entries if row is None],
+            "sync_token": encode_sync_token(next_position),
+            "has_more": has_more,
+        }
+    
+    @staticmethod
+    def get_stats(
+        session: Session,
+        user_id: int,
+        days: int = 30,
+        today: Optional[date] = None
+    ) -> TaskStats:
+        """Get a user's task counts and completions per day.
+        
+        Reads the counters off the user's row and at most ``days`` bucket
+        rows, so the cost does not grow with the number of tasks.
+        
+        Args:
+            days: Number of days of buckets, ending today (UTC). Days without
+                completions are included with a count of 0.
+        """
+        total, completed = session.exec(
+            select(User.task_count, User.completed_count).where(User.id == user_id)
+        ).one()
+        today = today or datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        buckets = dict(session.exec(
+            select(TaskCompletionDay.day, TaskCompletionDay.completed).where(
+                TaskCompletionDay.user_id == user_id, TaskCompletionDay.day >= since
+            )
+        ).all())
+        return TaskStats(
+            total=total,
+            completed=completed,
+            pending=total - completed,
+            completed_by_day=[
+                CompletionBucket(date=day, completed=buckets.get(day, 0))
+                for day in (since + timedelta(days=offset) for offset in range(days))
+            ],
+        )
     
     @staticmethod
     def get_task(session: Session, task_id: int, user_id: int) -> Optional[Task]:
@@ -42,42 +675,170 @@ class TaskService:
         task_data: TaskUpdate
     ) -> Optional[Task]:
         """Update a task."""
-        task = TaskService.get_task(session, task_id, user_id)
-        if task is None:
-            return None
-        
+        values = {"updated_at": datetime.utcnow(), "change_seq": _next_change_seq(user_id)}
         if task_data.title is not None:
-            task.title = task_data.title
+            values["title"] = task_data.title
         if task_data.description is not None:
-            task.description = task_data.description
+            values["description"] = task_data.description
+        if task_data.priority is not None:
+            values["priority"] = PRIORITY_RANKS[task_data.priority]
         
-        task.updated_at = datetime.utcnow()
-        session.add(task)
-        session.commit()
-        session.refresh(task)
+        table = Task.__table__
+        statement = update(table).where(
+            table.c.id == task_id, table.c.user_id == user_id
+        ).values(values)
+        task = _write_returning(session, statement, user_id, task_id)
+        if task is not None:
+            _publish(user_id, "updated", [task])
         return task
     
     @staticmethod
     def delete_task(session: Session, task_id: int, user_id: int) -> bool:
         """Delete a task."""
-        task = TaskService.get_task(session, task_id, user_id)
-        if task is None:
-            return False
-        
-        session.delete(task)
+        table = Task.__table__
+        scope = (table.c.id == task_id, table.c.user_id == user_id)
+        statement = delete(table).where(*scope)
+        change_seq = _lock_change_seq(session, user_id)
+        columns = (table.c.is_complete, table.c.completed_at)
+        if session.get_bind().dialect.delete_returning:
+            row = session.exec(statement.returning(*columns)).first()
+        else:
+            row = session.exec(select(*columns).where(*scope)).first()
+            session.exec(statement)
+        if row is not None:
+            _add_tombstones(session, user_id, [task_id], change_seq)
+            _record_change(
+                session, user_id, added=-1, completions=completion_changes([row], deleted=True)
+            )
         session.commit()
+        if row is None:
+            return False
+        _publish(user_id, "deleted", [task_id])
         return True
     
     @staticmethod
     def toggle_complete(session: Session, task_id: int, user_id: int) -> Optional[Task]:
-        """Toggle task completion status."""
-        task = TaskService.get_task(session, task_id, user_id)
-        if task is None:
-            return None
+        """Toggle task completion status.
         
-        task.is_complete = not task.is_complete
-        task.updated_at = datetime.utcnow()
-        session.add(task)
-        session.commit()
-        session.refresh(task)
+        The flip happens in the database (``SET is_complete = NOT
+        is_complete``), so concurrent toggles are never lost.
+        """
+        now = datetime.utcnow()
+        table = Task.__table__
+        statement = update(table).where(
+            table.c.id == task_id, table.c.user_id == user_id
+        ).values(
+            is_complete=not_(table.c.is_complete),
+            completed_at=_completed_at_after_toggle(now),
+            updated_at=now,
+            change_seq=_next_change_seq(user_id),
+        )
+        task = _write_returning(session, statement, user_id, task_id, toggles_completion=True)
+        if task is not None:
+            _publish(user_id, "toggled", [task])
         return task
+
+
+class AsyncTaskService:
+    """Awaitable TaskService for async routes.
+    
+    Each method runs the matching TaskService query code through
+    ``database.run_sync``, on the async driver or in the threadpool
+    depending on the session it is given.
+    """
+    
+    @staticmethod
+    async def create_task(db: Database, user_id: int, task_data: TaskCreate) -> Task:
+        """Create a new task for a user."""
+        return await run_sync(db, TaskService.create_task, user_id, task_data)
+    
+    @staticmethod
+    async def get_user_tasks(
+        db: Database,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        status: str = "all",
+        q: Optional[str] = None,
+        sort: str = "date",
+        order: Optional[str] = None
+    ) -> tuple[list[Row], Optional[str]]:
+        """Get a user's tasks, filtered and sorted, optionally one page at a time."""
+        return await run_sync(
+            db, TaskService.get_user_tasks, user_id, limit, cursor, ids, status, q, sort, order
+        )
+    
+    @staticmethod
+    async def search_tasks(db: Database, user_id: int, q: str, limit: int = 20) -> list[dict]:
+        """Full-text search of a user's task titles and descriptions."""
+        return await run_sync(db, TaskService.search_tasks, user_id, q, limit)
+    
+    @staticmethod
+    async def create_tasks(
+        db: Database,
+        user_id: int,
+        items: list[TaskCreate]
+    ) -> list[TaskBatchResult]:
+        """Create several tasks in one transaction."""
+        return await run_sync(db, TaskService.create_tasks, user_id, items)
+    
+    @staticmethod
+    async def set_complete_many(
+        db: Database,
+        user_id: int,
+        ids: list[int],
+        is_complete: Optional[bool] = None
+    ) -> list[TaskBatchResult]:
+        """Set or toggle completion of many tasks in one statement."""
+        return await run_sync(db, TaskService.set_complete_many, user_id, ids, is_complete)
+    
+    @staticmethod
+    async def delete_many(db: Database, user_id: int, ids: list[int]) -> list[TaskBatchResult]:
+        """Delete many tasks in one statement."""
+        return await run_sync(db, TaskService.delete_many, user_id, ids)
+    
+    @staticmethod
+    async def get_data_version(db: Database, user_id: int) -> Optional[int]:
+        """Get the version of a user's task list."""
+        return await run_sync(db, TaskService.get_data_version, user_id)
+    
+    @staticmethod
+    async def get_changes(
+        db: Database,
+        user_id: int,
+        since: Optional[str] = None,
+        limit: int = 500
+    ) -> dict:
+        """Get what changed in a user's tasks since a sync token."""
+        return await run_sync(db, TaskService.get_changes, user_id, since, limit)
+    
+    @staticmethod
+    async def get_stats(db: Database, user_id: int, days: int = 30) -> TaskStats:
+        """Get a user's task counts and completions per day."""
+        return await run_sync(db, TaskService.get_stats, user_id, days)
+    
+    @staticmethod
+    async def get_task(db: Database, task_id: int, user_id: int) -> Optional[Task]:
+        """Get a specific task by ID, scoped to user."""
+        return await run_sync(db, TaskService.get_task, task_id, user_id)
+    
+    @staticmethod
+    async def update_task(
+        db: Database,
+        task_id: int,
+        user_id: int,
+        task_data: TaskUpdate
+    ) -> Optional[Task]:
+        """Update a task."""
+        return await run_sync(db, TaskService.update_task, task_id, user_id, task_data)
+    
+    @staticmethod
+    async def delete_task(db: Database, task_id: int, user_id: int) -> bool:
+        """Delete a task."""
+        return await run_sync(db, TaskService.delete_task, task_id, user_id)
+    
+    @staticmethod
+    async def toggle_complete(db: Database, task_id: int, user_id: int) -> Optional[Task]:
+        """Toggle task completion status."""
+        return await run_sync(db, TaskService.toggle_complete, task_id, user_id)
@@ -0,0 +1,88 @@
+"""Prune the deletion tombstones kept for delta sync.
+
+Every deleted task leaves a row in ``task_tombstones`` so that
+``GET /api/tasks/changes`` can tell clients to drop it. Clients sync often,
+so tombstones older than ``tombstone_retention_days`` are no longer needed
+by anyone but long-absent clients. This job deletes them and raises each
+affected user's ``sync_floor`` to the newest pruned ``change_seq``; a sync
+token from before that may have missed deletions, so it is refused and the
+client does a full sync instead. The floor moves in the same transaction
+as the delete, so a sync that misses the pruned tombstones sees the new
+floor (see ``TaskService.get_changes``).
+
+Usage::
+
+    python -m src.tombstones [--days 90] [--batch-size 500]
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from .config import get_settings
+from .models.task import TaskTombstone
+from .models.user import User
+
+
+def prune_tombstones(connection: Connection, user_ids: list[int], before: datetime) -> int:
+    """Delete some users' tombstones from before ``before``, in the caller's transaction.
+
+    Returns:
+        The number of tombstones deleted.
+    """
+    users, tombstones = User.__table__, TaskTombstone.__table__
+    old = (tombstones.c.user_id.in_(user_ids), tombstones.c.deleted_at < before)
+    floors = connection.execute(
+        select(tombstones.c.user_id, func.max(tombstones.c.change_seq).label("floor"))
+        .where(*old).group_by(tombstones.c.user_id)
+    ).all()
+    for user_id, floor in floors:
+        connection.execute(
+            update(users).where(users.c.id == user_id, users.c.sync_floor < floor)
+            .values(sync_floor=floor)
+        )
+    return connection.execute(delete(tombstones).where(*old)).rowcount
+
+
+def prune_all(engine: Engine, before: datetime, batch_size: int = 500) -> int:
+    """Prune every user's old tombstones, ``batch_size`` users per transaction."""
+    tombstones = TaskTombstone.__table__
+    pruned = 0
+    last_id = 0
+    while True:
+        with engine.begin() as connection:
+            user_ids = connection.execute(
+                select(tombstones.c.user_id).distinct()
+                .where(tombstones.c.user_id > last_id, tombstones.c.deleted_at < before)
+                .order_by(tombstones.c.user_id).limit(batch_size)
+            ).scalars().all()
+            if not user_ids:
+                return pruned
+            pruned += prune_tombstones(connection, user_ids, before)
+        last_id = user_ids[-1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the job and report how many tombstones were deleted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--days", type=int, default=get_settings().tombstone_retention_days,
+        help="Keep tombstones this many days"
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per transaction")
+    args = parser.parse_args(argv)
+
+    # Imported here: the database module runs the migrations.
+    from .database import engine
+
+    before = datetime.utcnow() - timedelta(days=args.days)
+    pruned = prune_all(engine, before, args.batch_size)
+    print(f"{pruned} tombstone(s) older than {args.days} days pruned", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
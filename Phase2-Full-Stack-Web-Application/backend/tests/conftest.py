@@ -0,0 +1,90 @@
+"""Pytest configuration for the backend tests."""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Point the app at a throwaway SQLite database before it is imported.
+_db_dir = tempfile.mkdtemp(prefix="todo-backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+# Import the app as ``src`` the same way uvicorn does from this directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+from sqlmodel import SQLModel, Session  # noqa: E402
+
+from src import database  # noqa: E402
+from src.auth_cache import principal_cache  # noqa: E402
+from src.database import create_async_session_factory, engine  # noqa: E402
+from src.main import app  # noqa: E402
+from src.migrations import schema_version  # noqa: E402
+from src.search import FTS_TABLE  # noqa: E402
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request, monkeypatch):
+    """A test client on an empty database, once per database mode."""
+    SQLModel.metadata.drop_all(engine)
+    schema_version.drop(engine, checkfirst=True)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    # User IDs restart with the database, so cached principals would be stale.
+    principal_cache.clear()
+    factory = None
+    if request.param == "async":
+        factory = create_async_session_factory(os.environ["DATABASE_URL"])
+        monkeypatch.setattr(database, "async_session_factory", factory)
+    with TestClient(app) as test_client:
+        yield test_client
+        if factory is not None:
+            test_client.portal.call(factory.kw["bind"].dispose)
+
+
+@pytest.fixture
+def session(client):
+    """A database session on the same database as ``client``."""
+    with Session(engine) as db_session:
+        yield db_session
+
+
+def signup(client: TestClient, email: str = "user@example.com") -> dict[str, str]:
+    """Create an account and return its Authorization header."""
+    response = client.post(
+        "/api/auth/signup", json={"email": email, "password": "password123"}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization header for a freshly signed-up user."""
+    return signup(client)
+
+
+def app_engine():
+    """The sync engine behind the sessions the app is currently using."""
+    if database.async_session_factory is not None:
+        return database.async_session_factory.kw["bind"].sync_engine
+    return engine
+
+
+@contextmanager
+def captured_sql(target=None):
+    """Collect (statement, parameters) for every query sent to the database."""
+    target = target if target is not None else app_engine()
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    event.listen(target, "before_cursor_execute", capture)
+    try:
+        yield queries
+    finally:
+        event.remove(target, "before_cursor_execute", capture)
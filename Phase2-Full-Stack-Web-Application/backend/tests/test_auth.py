@@ -0,0 +1,137 @@
+"""Tests for password hashing and the sign-in routes."""
+
+import asyncio
+
+import pytest
+from sqlmodel import select
+
+from src import hashing
+from src.hashing import HasherBusyError, PasswordHasher
+from src.models.user import User
+from src.services import auth_service
+from src.services.auth_service import password_hasher
+
+
+def legacy_hash(password: str, salt: str = "ab" * 16) -> str:
+    """A hash in the pre-versioning ``salt$digest`` format."""
+    return f"{salt}${hashing._pbkdf2(password, salt, hashing.LEGACY_ITERATIONS)}"
+
+
+class TestHashFormat:
+    """Tests for the stored hash format."""
+
+    def test_hash_records_iterations(self):
+        """Test new hashes carry their algorithm and work factor."""
+        hashed = hashing.hash_password("password123", 1000)
+
+        assert hashed.startswith("pbkdf2_sha256$1000$")
+        assert hashing.verify_password("password123", hashed)
+        assert not hashing.verify_password("wrong-password", hashed)
+
+    def test_legacy_hashes_still_verify(self):
+        """Test hashes from before the format change are accepted."""
+        hashed = legacy_hash("password123")
+
+        assert hashing.verify_password("password123", hashed)
+        assert hashing.needs_rehash(hashed, 1000)
+
+    def test_needs_rehash_below_configured_iterations(self):
+        """Test only weaker hashes are flagged for upgrade."""
+        hashed = hashing.hash_password("password123", 1000)
+
+        assert hashing.needs_rehash(hashed, 2000)
+        assert not hashing.needs_rehash(hashed, 1000)
+        assert not hashing.verify_password("password123", "garbage")
+
+
+class TestPasswordHasher:
+    """Tests for the process pool hasher."""
+
+    def test_hashes_in_worker_processes(self):
+        """Test hashing and verifying round-trip through the pool."""
+        hasher = PasswordHasher(workers=1, max_queue=1)
+
+        async def run():
+            hashed = await hasher.hash("password123", 1000)
+            return hashed, await hasher.verify("password123", hashed)
+
+        try:
+            hashed, valid = asyncio.run(run())
+        finally:
+            hasher.shutdown()
+        assert valid
+        assert hashed.startswith("pbkdf2_sha256$1000$")
+
+    def test_rejects_work_beyond_capacity(self):
+        """Test jobs past workers + max_queue are refused, not queued."""
+        hasher = PasswordHasher(workers=1, max_queue=1)
+
+        async def run():
+            return await asyncio.gather(
+                *(hasher.hash("password123", 200000) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            hasher.shutdown()
+        assert sum(isinstance(result, HasherBusyError) for result in results) == 1
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["in_flight"] == 0
+
+
+class TestSignin:
+    """Tests for signin and signup around the hashing pool."""
+
+    def signin(self, client, email="user@example.com"):
+        return client.post(
+            "/api/auth/signin", json={"email": email, "password": "password123"}
+        )
+
+    def test_signin_upgrades_legacy_hash(self, client, session):
+        """Test a legacy hash is replaced by a versioned one on sign-in."""
+        session.add(User(email="old@example.com", password_hash=legacy_hash("password123")))
+        session.commit()
+
+        assert self.signin(client, "old@example.com").status_code == 200
+
+        session.expire_all()
+        user = session.exec(select(User)).one()
+        assert user.password_hash.startswith("pbkdf2_sha256$100000$")
+        assert self.signin(client, "old@example.com").status_code == 200
+
+    def test_signin_upgrades_after_raising_iterations(
+        self, client, auth_headers, session, monkeypatch
+    ):
+        """Test raising the work factor upgrades hashes as users sign in."""
+        monkeypatch.setattr(auth_service.settings, "password_hash_iterations", 120000)
+
+        assert self.signin(client).status_code == 200
+
+        session.expire_all()
+        assert session.exec(select(User)).one().password_hash.startswith(
+            "pbkdf2_sha256$120000$"
+        )
+
+    def test_saturated_pool_returns_503(self, client, auth_headers, monkeypatch):
+        """Test signin and signup are refused with Retry-After when busy."""
+        monkeypatch.setattr(password_hasher, "in_flight", password_hasher.capacity)
+
+        signin = self.signin(client)
+        signup = client.post(
+            "/api/auth/signup", json={"email": "new@example.com", "password": "password123"}
+        )
+
+        for response in (signin, signup):
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+    @pytest.mark.parametrize("password", ["password123", "wrong-password"])
+    def test_signin_checks_password(self, client, auth_headers, password):
+        """Test sign-in succeeds only with the right password."""
+        response = client.post(
+            "/api/auth/signin", json={"email": "user@example.com", "password": password}
+        )
+
+        assert response.status_code == (200 if password == "password123" else 401)
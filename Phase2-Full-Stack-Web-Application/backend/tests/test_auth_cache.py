@@ -0,0 +1,125 @@
+"""Tests for the authenticated principal cache."""
+
+import time
+
+from sqlmodel import select
+
+from src import auth_cache
+from src.auth_cache import Principal, PrincipalCache, principal_cache
+from src.models.user import User
+
+from conftest import captured_sql
+
+
+def user_queries(sql) -> list[str]:
+    """Queries that load a user row (not just its data version)."""
+    return [statement for statement, _ in sql if "users.password_hash" in statement]
+
+
+def principal(user_id: int, expires_in: float = 3600) -> Principal:
+    return Principal(
+        claims={"sub": str(user_id), "exp": int(time.time() + expires_in)},
+        user=User(id=user_id, email=f"user{user_id}@example.com", password_hash="x"),
+    )
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache itself."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry goes first when the cache is full."""
+        cache = PrincipalCache(max_entries=2, ttl=60)
+        cache.put("a", principal(1))
+        cache.put("b", principal(2))
+        cache.get("a")
+        cache.put("c", principal(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a").user.id == 1
+        assert cache.get("c").user.id == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        """Test entries are dropped after the TTL."""
+        now = [1000.0]
+        monkeypatch.setattr(auth_cache.time, "monotonic", lambda: now[0])
+        cache = PrincipalCache(max_entries=10, ttl=60)
+        cache.put("a", principal(1))
+
+        now[0] += 59
+        assert cache.get("a") is not None
+        now[0] += 2
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_never_outlives_token(self):
+        """Test a token is not cached past its own expiry."""
+        cache = PrincipalCache(max_entries=10, ttl=60)
+        cache.put("expired", principal(1, expires_in=-1))
+
+        assert cache.get("expired") is None
+
+    def test_keys_are_token_digests(self):
+        """Test raw tokens are not kept in the cache."""
+        cache = PrincipalCache(max_entries=10, ttl=60)
+        cache.put("secret-token", principal(1))
+
+        assert all(len(key) == 32 for key in cache._entries)
+        assert b"secret-token" not in cache._entries
+
+    def test_disabled_with_zero_size(self):
+        """Test a zero-size cache stores nothing."""
+        cache = PrincipalCache(max_entries=0, ttl=60)
+        cache.put("a", principal(1))
+
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 0
+
+
+class TestCurrentUserCaching:
+    """Tests for the cache behind get_current_user."""
+
+    def test_repeat_requests_skip_user_lookup(self, client, auth_headers):
+        """Test only the first request with a token loads the user."""
+        before = client.get("/health/auth-cache").json()
+        with captured_sql() as first:
+            client.get("/api/tasks", headers=auth_headers)
+        with captured_sql() as second:
+            response = client.get("/api/tasks", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(user_queries(first)) == 1
+        assert user_queries(second) == []
+        after = client.get("/health/auth-cache").json()
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 1
+
+    def test_invalid_tokens_are_not_cached(self, client):
+        """Test rejected tokens stay rejected and take no cache space."""
+        headers = {"Authorization": "Bearer not-a-jwt"}
+
+        for _ in range(2):
+            assert client.get("/api/tasks", headers=headers).status_code == 401
+        assert principal_cache.stats()["size"] == 0
+
+    def test_user_update_invalidates(self, client, auth_headers, session):
+        """Test changing a user drops their cached principal."""
+        client.get("/api/tasks", headers=auth_headers)
+        user = session.exec(select(User)).one()
+        user.email = "renamed@example.com"
+        session.add(user)
+        session.commit()
+
+        assert principal_cache.stats()["size"] == 0
+        with captured_sql() as sql:
+            client.get("/api/tasks", headers=auth_headers)
+        assert len(user_queries(sql)) == 1
+
+    def test_deleted_user_is_rejected(self, client, auth_headers, session):
+        """Test a cached token stops working once its user is deleted."""
+        client.get("/api/tasks", headers=auth_headers)
+        session.delete(session.exec(select(User)).one())
+        session.commit()
+
+        response = client.get("/api/tasks", headers=auth_headers)
+        assert response.status_code == 401
@@ -0,0 +1,172 @@
+"""Tests for delta sync of tasks and the tombstones behind it."""
+
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from src.database import engine
+from src.models.task import TaskTombstone
+from src.models.user import User
+from src.pagination import SyncPosition, encode_sync_token
+from src.services.task_service import TaskService
+from src.tombstones import prune_all
+
+from conftest import captured_sql, signup
+
+
+def create(client, headers, title="Task"):
+    """Create a task and return its id."""
+    response = client.post("/api/tasks", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def sync(client, headers, since=None, **params):
+    """Fetch changes and check the response."""
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/tasks/changes", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestChangesEndpoint:
+    """Tests for GET /api/tasks/changes."""
+
+    def test_full_sync(self, client, auth_headers):
+        """Test a sync without a token returns every task in change order."""
+        ids = [create(client, auth_headers, f"Task {i}") for i in range(3)]
+        client.delete(f"/api/tasks/{ids[1]}", headers=auth_headers)
+
+        body = sync(client, auth_headers)
+
+        assert [task["id"] for task in body["changes"]] == [ids[0], ids[2]]
+        assert body["changes"][0]["priority"] == "medium"
+        # Deletions from before the first sync are of no interest.
+        assert body["deleted"] == []
+        assert body["has_more"] is False
+
+    def test_returns_only_what_changed(self, client, auth_headers):
+        """Test updates, toggles, deletes and new tasks since the token."""
+        ids = [create(client, auth_headers, f"Task {i}") for i in range(5)]
+        token = sync(client, auth_headers)["sync_token"]
+
+        client.put(f"/api/tasks/{ids[0]}", json={"title": "Renamed"}, headers=auth_headers)
+        client.patch(f"/api/tasks/{ids[1]}/complete", headers=auth_headers)
+        client.delete(f"/api/tasks/{ids[2]}", headers=auth_headers)
+        client.request("DELETE", "/api/tasks/batch", json={"ids": [ids[3]]}, headers=auth_headers)
+        new_id = create(client, auth_headers, "New")
+
+        body = sync(client, auth_headers, token)
+
+        assert [(task["id"], task["title"], task["is_complete"]) for task in body["changes"]] == [
+            (ids[0], "Renamed", False), (ids[1], "Task 1", True), (new_id, "New", False)
+        ]
+        assert body["deleted"] == [ids[2], ids[3]]
+        assert body["has_more"] is False
+
+        again = sync(client, auth_headers, body["sync_token"])
+        assert (again["changes"], again["deleted"]) == ([], [])
+        assert again["sync_token"] == body["sync_token"]
+
+    def test_a_task_changed_twice_is_sent_once(self, client, auth_headers):
+        """Test only the latest state of a task is returned."""
+        task_id = create(client, auth_headers)
+        token = sync(client, auth_headers)["sync_token"]
+        for _ in range(3):
+            client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+
+        body = sync(client, auth_headers, token)
+
+        assert [(task["id"], task["is_complete"]) for task in body["changes"]] == [(task_id, True)]
+
+    def test_pages_split_one_transaction(self, client, auth_headers):
+        """Test a batch larger than the limit is paged through completely."""
+        token = sync(client, auth_headers)["sync_token"]
+        response = client.post(
+            "/api/tasks/batch",
+            json={"tasks": [{"title": f"Task {i}"} for i in range(5)]},
+            headers=auth_headers,
+        )
+        created = [item["id"] for item in response.json()["results"]]
+        client.delete(f"/api/tasks/{created[0]}", headers=auth_headers)
+
+        pages = []
+        while True:
+            body = sync(client, auth_headers, token, limit=2)
+            pages.append(([task["id"] for task in body["changes"]], body["deleted"]))
+            token = body["sync_token"]
+            if not body["has_more"]:
+                break
+
+        assert pages == [(created[1:3], []), (created[3:5], []), ([], [created[0]])]
+
+    def test_scoped_to_user(self, client, auth_headers):
+        """Test another user's changes are never returned."""
+        token = sync(client, auth_headers)["sync_token"]
+        other = signup(client, "other@example.com")
+        client.delete(f"/api/tasks/{create(client, other)}", headers=other)
+
+        body = sync(client, auth_headers, token)
+
+        assert (body["changes"], body["deleted"]) == ([], [])
+
+    def test_invalid_token(self, client, auth_headers):
+        """Test a malformed token is rejected."""
+        response = client.get(
+            "/api/tasks/changes", params={"since": "nonsense"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestTombstonePruning:
+    """Tests for pruning tombstones and the sync floor it sets."""
+
+    def test_old_tokens_expire(self, client, auth_headers, session):
+        """Test a token from before pruned deletions gets 410, then full sync works."""
+        ids = [create(client, auth_headers, f"Task {i}") for i in range(3)]
+        token = sync(client, auth_headers)["sync_token"]
+        client.delete(f"/api/tasks/{ids[0]}", headers=auth_headers)
+        current = sync(client, auth_headers, token)["sync_token"]
+
+        assert prune_all(engine, before=datetime.utcnow() + timedelta(seconds=1)) == 1
+
+        assert session.exec(select(TaskTombstone)).all() == []
+        response = client.get("/api/tasks/changes", params={"since": token}, headers=auth_headers)
+        assert response.status_code == 410
+        # A token issued after the pruned deletion is still good.
+        assert sync(client, auth_headers, current)["deleted"] == []
+        assert [task["id"] for task in sync(client, auth_headers)["changes"]] == ids[1:]
+
+    def test_keeps_recent_tombstones(self, client, auth_headers, session):
+        """Test tombstones inside the retention period are left alone."""
+        client.delete(f"/api/tasks/{create(client, auth_headers)}", headers=auth_headers)
+
+        assert prune_all(engine, before=datetime.utcnow() - timedelta(days=1)) == 0
+        assert session.exec(select(User.sync_floor)).one() == 0
+
+
+class TestChangesQuery:
+    """Tests for the SQL behind get_changes."""
+
+    def test_reads_changes_through_indexes(self, client, auth_headers, session):
+        """Test neither source is scanned or sorted."""
+        create(client, auth_headers)
+        user_id = session.exec(select(User)).one().id
+        token = encode_sync_token(SyncPosition(floor=0, seq=0, task_id=5))
+
+        with captured_sql(engine) as sql:
+            TaskService.get_changes(session, user_id, token, limit=10)
+
+        plans = {}
+        with engine.connect() as connection:
+            for statement, parameters in sql:
+                rows = connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).all()
+                plans[statement.split("FROM")[1].split()[0]] = " | ".join(row[-1] for row in rows)
+        assert "ix_tasks_user_changes" in plans["tasks"]
+        # The tombstones' primary key is the autoindex.
+        assert "COVERING INDEX sqlite_autoindex_task_tombstones_1" in plans["task_tombstones"]
+        assert not any("TEMP B-TREE" in plan for plan in plans.values())
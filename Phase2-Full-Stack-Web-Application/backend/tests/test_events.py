@@ -0,0 +1,252 @@
+"""Tests for the task change stream."""
+
+import asyncio
+import json
+import threading
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src.events import TaskEventHub, sse_frame, task_events
+from src.routers import tasks as tasks_router
+from src.routers.tasks import stream_tasks
+
+from conftest import signup
+
+
+def decode(message):
+    """The JSON document of a queued event."""
+    return json.loads(message[1])
+
+
+async def open_stream(user_id):
+    """Call the SSE route directly and return its body iterator."""
+    response = await stream_tasks(SimpleNamespace(id=user_id))
+    assert response.media_type == "text/event-stream"
+    return response.body_iterator
+
+
+class TestTaskEventHub:
+    """Tests for TaskEventHub and Subscription."""
+
+    def test_fans_out_to_the_users_subscribers(self):
+        """Test every subscription of a user gets the event, and only theirs."""
+        hub = TaskEventHub(max_queue=10)
+
+        async def run():
+            first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+            hub.publish(1, "created", {"task": {"id": 7}})
+            return await first.get(), await second.get(), await other.get(0.01)
+
+        first, second, other = asyncio.run(run())
+
+        assert [decode(message) for message in first] == [{"type": "created", "task": {"id": 7}}]
+        # The event is encoded once and shared.
+        assert first[0] is second[0]
+        assert other == []
+        assert hub.stats()["delivered"] == 2
+
+    def test_publish_without_subscribers_is_free(self):
+        """Test nothing is counted or encoded for a user nobody listens to."""
+        hub = TaskEventHub(max_queue=10)
+
+        hub.publish(1, "created", {"task": {"id": 7}})
+
+        assert not hub.has_subscribers(1)
+        assert hub.stats()["published"] == 0
+
+    def test_slow_subscriber_is_dropped(self):
+        """Test a full queue drops the subscription instead of growing."""
+        hub = TaskEventHub(max_queue=2)
+
+        async def run():
+            slow = hub.subscribe(1)
+            for task_id in range(4):
+                hub.publish(1, "deleted", {"id": task_id})
+            return await slow.get()
+
+        assert asyncio.run(run()) is None
+        assert hub.stats()["dropped"] == 1
+        assert hub.stats()["delivered"] == 2
+
+    def test_publish_from_another_thread(self):
+        """Test events published off the loop wake the waiting subscriber."""
+        hub = TaskEventHub(max_queue=10)
+
+        async def run():
+            subscription = hub.subscribe(1)
+            waiting = asyncio.ensure_future(subscription.get(5))
+            await asyncio.sleep(0)
+            thread = threading.Thread(target=hub.publish, args=(1, "deleted", {"id": 1}))
+            thread.start()
+            messages = await waiting
+            thread.join()
+            hub.unsubscribe(subscription)
+            return messages
+
+        assert [decode(message) for message in asyncio.run(run())] == [{"type": "deleted", "id": 1}]
+        assert hub.stats()["subscriptions"] == 0
+
+    def test_sse_frame(self):
+        """Test the event name and data lines."""
+        assert sse_frame(("deleted", b'{"id":1}')) == b'event: deleted\ndata: {"id":1}\n\n'
+
+
+class TestSseStream:
+    """Tests for GET /api/tasks/stream."""
+
+    def test_streams_events_and_heartbeats(self, monkeypatch):
+        """Test published events become SSE frames and idle time becomes pings."""
+        monkeypatch.setattr(tasks_router.settings, "stream_heartbeat", 0.01)
+
+        async def run():
+            body = await open_stream(1)
+            chunks = [await anext(body)]
+            task_events.publish(1, "created", {"task": {"id": 1}})
+            task_events.publish(1, "deleted", {"id": 1})
+            chunks += [await anext(body), await anext(body)]
+            await body.aclose()
+            return chunks
+
+        connected, events, ping = asyncio.run(run())
+
+        assert connected == b"retry: 3000\n: connected\n\n"
+        assert events == (
+            b'event: created\ndata: {"type":"created","task":{"id":1}}\n\n'
+            b'event: deleted\ndata: {"type":"deleted","id":1}\n\n'
+        )
+        assert ping == b": ping\n\n"
+        assert not task_events.has_subscribers(1)
+
+    def test_unsent_stream_does_not_subscribe(self):
+        """Test a response dropped before its body is sent leaves no subscriber."""
+
+        async def run():
+            body = await open_stream(1)
+            subscribed = task_events.has_subscribers(1)
+            await body.aclose()
+            return subscribed
+
+        assert not asyncio.run(run())
+        assert not task_events.has_subscribers(1)
+
+    def test_requires_a_token(self, client):
+        """Test the stream is refused without a header or query token."""
+        assert client.get("/api/tasks/stream").status_code == 401
+        assert client.get(
+            "/api/tasks/stream", params={"access_token": "bogus"}
+        ).status_code == 401
+
+    def test_overflow_ends_the_stream(self, client, auth_headers, monkeypatch):
+        """Test a client too far behind gets an overflow event and is cut off.
+
+        Also covers the access_token query parameter, since EventSource
+        cannot send an Authorization header.
+        """
+        monkeypatch.setattr(task_events, "max_queue", 0)
+        token = auth_headers["Authorization"].removeprefix("Bearer ")
+        responses = []
+        reader = threading.Thread(target=lambda: responses.append(
+            client.get("/api/tasks/stream", params={"access_token": token})
+        ))
+        reader.start()
+        while reader.is_alive() and not task_events.stats()["subscriptions"]:
+            reader.join(0.01)
+        client.post("/api/tasks", json={"title": "Task"}, headers=auth_headers)
+        reader.join(5)
+
+        assert responses[0].status_code == 200
+        assert responses[0].headers["cache-control"] == "no-cache"
+        assert responses[0].text.endswith("event: overflow\ndata: {}\n\n")
+
+    def test_idle_connections_stay_small(self):
+        """Test memory per idle stream with thousands of subscribers."""
+        count = 5000
+
+        async def run():
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                consumers = []
+                for index in range(count):
+                    body = await open_stream(index % 100)
+
+                    async def consume(body=body):
+                        async for _ in body:
+                            pass
+
+                    consumers.append(asyncio.ensure_future(consume()))
+                await asyncio.sleep(0.05)
+                per_stream = (tracemalloc.get_traced_memory()[0] - before) / count
+                subscriptions = task_events.stats()["subscriptions"]
+            finally:
+                tracemalloc.stop()
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            return per_stream, subscriptions
+
+        per_stream, subscriptions = asyncio.run(run())
+
+        assert subscriptions == count
+        assert per_stream < 8 * 1024
+        assert task_events.stats()["subscriptions"] == 0
+
+
+class TestWebSocketStream:
+    """Tests for the /api/tasks/stream/ws WebSocket."""
+
+    def test_receives_the_users_changes(self, client, auth_headers):
+        """Test each change arrives as one JSON message, in order."""
+        other = signup(client, "other@example.com")
+        token = auth_headers["Authorization"].removeprefix("Bearer ")
+
+        with client.websocket_connect(f"/api/tasks/stream/ws?access_token={token}") as ws:
+            client.post("/api/tasks", json={"title": "Theirs"}, headers=other)
+            task_id = client.post(
+                "/api/tasks", json={"title": "Mine"}, headers=auth_headers
+            ).json()["id"]
+            client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"}, headers=auth_headers)
+            client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+            client.request(
+                "DELETE", "/api/tasks/batch", json={"ids": [task_id]}, headers=auth_headers
+            )
+            received = [ws.receive_json() for _ in range(4)]
+
+        assert [event["type"] for event in received] == ["created", "updated", "toggled", "deleted"]
+        assert received[0]["task"]["title"] == "Mine"
+        assert received[1]["task"]["title"] == "Renamed"
+        assert received[2]["task"]["is_complete"] is True
+        assert received[3] == {"type": "deleted", "id": task_id}
+
+    def test_batch_complete_sends_only_flipped_tasks(self, client, auth_headers):
+        """Test tasks already in the requested state produce no event."""
+        response = client.post(
+            "/api/tasks/batch", json={"tasks": [{"title": "A"}, {"title": "B"}]},
+            headers=auth_headers,
+        )
+        first, second = [item["id"] for item in response.json()["results"]]
+        client.patch(f"/api/tasks/{first}/complete", headers=auth_headers)
+
+        with client.websocket_connect("/api/tasks/stream/ws", headers=auth_headers) as ws:
+            client.patch(
+                "/api/tasks/batch/complete", json={"ids": [first, second], "is_complete": True},
+                headers=auth_headers,
+            )
+            client.delete(f"/api/tasks/{first}", headers=auth_headers)
+            received = [ws.receive_json() for _ in range(2)]
+
+        assert [(event["type"], event.get("id")) for event in received] == [
+            ("toggled", None), ("deleted", first)
+        ]
+        assert received[0]["task"]["id"] == second
+
+    def test_rejects_missing_token(self, client):
+        """Test the socket is closed with a policy violation."""
+        with pytest.raises(WebSocketDisconnect) as error:
+            with client.websocket_connect("/api/tasks/stream/ws"):
+                pass
+
+        assert error.value.code == 1008
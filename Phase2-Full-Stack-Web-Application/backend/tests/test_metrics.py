@@ -0,0 +1,186 @@
+"""Tests for request metrics, Server-Timing and the request profiler."""
+
+import re
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.metrics import LATENCY_BUCKETS, MetricsMiddleware, RequestMetrics, RequestTimings, request_metrics
+from src.profiling import SamplingProfiler
+
+
+@pytest.fixture
+def metrics(client):
+    """The app's metrics, emptied for the test."""
+    request_metrics.clear()
+    return request_metrics
+
+
+def metric_lines(client, name):
+    """The /metrics lines for one metric name."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return [line for line in response.text.splitlines() if line.startswith(name)]
+
+
+class TestServerTiming:
+    """Tests for the Server-Timing response header."""
+
+    def test_reports_queries_for_the_request(self, client, auth_headers):
+        """Test a task list reports its own SQL statements and JSON encoding."""
+        client.post("/api/tasks", json={"title": "Task"}, headers=auth_headers)
+
+        response = client.get("/api/tasks", headers=auth_headers)
+
+        timing = response.headers["server-timing"]
+        assert re.fullmatch(
+            r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries", ser;dur=[\d.]+', timing
+        )
+        assert int(re.search(r'"(\d+) queries"', timing).group(1)) > 0
+
+    def test_present_on_errors(self, client):
+        """Test error responses carry the header too."""
+        response = client.get("/api/tasks")
+
+        assert response.status_code == 401
+        assert 'db;dur=0.00;desc="0 queries"' in response.headers["server-timing"]
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_latency_by_route_template(self, client, auth_headers, metrics):
+        """Test requests are counted by route template, not raw path."""
+        for _ in range(2):
+            task_id = client.post(
+                "/api/tasks", json={"title": "Task"}, headers=auth_headers
+            ).json()["id"]
+            client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"}, headers=auth_headers)
+        client.get("/no/such/path")
+
+        lines = metric_lines(client, "todo_http_request_duration_seconds_count")
+
+        assert 'todo_http_request_duration_seconds_count{method="PUT",route="/api/tasks/{task_id}",status="200"} 2' in lines
+        assert 'todo_http_request_duration_seconds_count{method="POST",route="/api/tasks",status="201"} 2' in lines
+        assert 'todo_http_request_duration_seconds_count{method="GET",route="<unmatched>",status="404"} 1' in lines
+
+    def test_sql_statements_by_route(self, client, auth_headers, metrics):
+        """Test statements run by a route are added up."""
+        client.get("/api/tasks", headers=auth_headers)
+
+        lines = metric_lines(client, "todo_db_statements_total")
+
+        [line] = [line for line in lines if 'route="/api/tasks"' in line]
+        assert int(line.split()[-1]) > 0
+
+    def test_serialization_by_route(self, client, auth_headers, metrics):
+        """Test routes answering with a response model are charged for encoding."""
+        client.post("/api/tasks", json={"title": "Task"}, headers=auth_headers)
+
+        lines = metric_lines(client, "todo_serialization_seconds_total")
+
+        [line] = [line for line in lines if 'method="POST",route="/api/tasks"' in line]
+        assert float(line.split()[-1]) > 0
+
+    def test_in_flight_gauge(self, client, metrics):
+        """Test the scrape itself is the request in flight."""
+        assert metric_lines(client, "todo_http_requests_in_flight") == [
+            "todo_http_requests_in_flight 1"
+        ]
+
+
+class TestRequestMetrics:
+    """Tests for the histogram rendering."""
+
+    def test_buckets_are_cumulative(self):
+        """Test each bucket counts every observation at or below its bound."""
+        metrics = RequestMetrics()
+        for seconds in (0.0005, 0.001, 0.003, 20.0):
+            metrics.observe("GET", "/x", 200, seconds, RequestTimings())
+
+        buckets = {
+            line.split('le="')[1].split('"')[0]: int(line.split()[-1])
+            for line in metrics.render().splitlines()
+            if line.startswith("todo_http_request_duration_seconds_bucket")
+        }
+
+        assert buckets["0.001"] == 2
+        assert buckets["0.005"] == 3
+        assert buckets[str(LATENCY_BUCKETS[-1])] == 3
+        assert buckets["+Inf"] == 4
+
+
+def profiled_app(token="secret"):
+    """A small app behind a MetricsMiddleware with profiling enabled."""
+    app = FastAPI()
+
+    @app.get("/busy")
+    def busy():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"done": True}
+
+    app.add_middleware(MetricsMiddleware, metrics=RequestMetrics(), profile_token=token)
+    return TestClient(app)
+
+
+class TestProfiling:
+    """Tests for ?profile=1."""
+
+    def test_returns_folded_stacks(self):
+        """Test the response is replaced by the request's samples."""
+        response = profiled_app().get(
+            "/busy", params={"profile": "1"}, headers={"X-Profile-Token": "secret"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "busy (test_metrics.py:" in response.text
+        assert all(re.fullmatch(r".+ \d+", line) for line in response.text.splitlines())
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Profile-Token": "wrong"}])
+    def test_needs_the_token(self, headers):
+        """Test requests without the right token are answered normally."""
+        response = profiled_app().get("/busy", params={"profile": "1"}, headers=headers)
+
+        assert response.json() == {"done": True}
+
+    def test_disabled_without_a_token(self):
+        """Test profiling is off when no token is configured."""
+        response = profiled_app(token="").get(
+            "/busy", params={"profile": "1"}, headers={"X-Profile-Token": ""}
+        )
+
+        assert response.json() == {"done": True}
+
+
+class TestSamplingProfiler:
+    """Tests for the sampler itself."""
+
+    def test_samples_busy_threads_only(self):
+        """Test a working thread is sampled and a waiting one is not."""
+
+        def spin():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        idle = threading.Event()
+        waiter = threading.Thread(target=idle.wait)
+        waiter.start()
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        try:
+            spin()
+        finally:
+            folded = profiler.stop()
+            idle.set()
+            waiter.join()
+
+        assert "spin (test_metrics.py:" in folded
+        assert "(threading.py:" not in folded
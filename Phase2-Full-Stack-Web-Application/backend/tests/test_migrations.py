@@ -0,0 +1,253 @@
+"""Tests for schema migrations and the indexes they create."""
+
+import os
+from datetime import date
+from functools import partial
+
+import pytest
+from sqlalchemy import func, inspect, text
+from sqlmodel import Session, create_engine, select
+
+from src.migrations import MIGRATIONS, current_version, migrate
+from src.models.task import Task
+from src.models.user import User
+from src.pagination import encode_cursor
+from src.services.task_service import TaskService
+
+from conftest import captured_sql
+
+
+LATEST = MIGRATIONS[-1][0]
+
+# List queries for each sort mode: the index each should walk, and its options.
+SORTED_LISTS = {
+    "date_asc": ("ix_tasks_user_created", {"order": "asc"}),
+    "pending": ("ix_tasks_user_status_created", {"status": "pending"}),
+    "completed_asc": ("ix_tasks_user_status_created", {"status": "completed", "order": "asc"}),
+    "priority": ("ix_tasks_user_priority", {"sort": "priority"}),
+    "priority_asc": ("ix_tasks_user_priority", {"sort": "priority", "order": "asc"}),
+    "title": ("ix_tasks_user_title", {"sort": "title"}),
+    "title_desc": ("ix_tasks_user_title", {"sort": "title", "order": "desc"}),
+}
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """An engine on an empty SQLite database file."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def seed(engine, tasks_per_user: int = 50) -> int:
+    """Add two users with tasks and return the first user's ID."""
+    with Session(engine) as session:
+        users = [User(email=f"user{i}@example.com", password_hash="x") for i in range(2)]
+        session.add_all(users)
+        session.commit()
+        for user in users:
+            for i in range(tasks_per_user):
+                session.add(Task(
+                    user_id=user.id, title=f"Task {i}", is_complete=i % 2 == 0, priority=i % 3
+                ))
+        session.commit()
+        return users[0].id
+
+
+def hot_queries(engine, user_id: int) -> dict[str, tuple[str, object]]:
+    """Run the service's hot paths and return the SQL each one sent."""
+    queries = {}
+    with Session(engine) as session:
+        first = session.exec(select(Task).where(Task.user_id == user_id)).first()
+        cursor = encode_cursor(first.created_at, first.id)
+        calls = {
+            "list": lambda: TaskService.get_user_tasks(session, user_id),
+            "page": lambda: TaskService.get_user_tasks(session, user_id, 10, cursor),
+            "get": lambda: TaskService.get_task(session, first.id, user_id),
+            **{
+                name: partial(TaskService.get_user_tasks, session, user_id, 10, **options)
+                for name, (_index, options) in SORTED_LISTS.items()
+            },
+            "count_complete": lambda: session.exec(
+                select(func.count()).select_from(Task)
+                .where(Task.user_id == user_id, Task.is_complete == True)  # noqa: E712
+            ).one(),
+        }
+        for name, call in calls.items():
+            with captured_sql(engine) as sql:
+                call()
+            queries[name] = sql[-1]
+    return queries
+
+
+class TestMigrate:
+    """Tests for applying migrations."""
+
+    def test_fresh_database(self, sqlite_engine):
+        """Test a new database gets every table, index and version."""
+        assert migrate(sqlite_engine) == LATEST
+
+        inspector = inspect(sqlite_engine)
+        assert {"users", "tasks", "schema_version"} <= set(inspector.get_table_names())
+        index_names = {index["name"] for index in inspector.get_indexes("tasks")}
+        assert {index.name for index in Task.__table__.indexes} <= index_names
+        assert not {"ix_tasks_user_id", "ix_tasks_user_status"} & index_names
+
+    def test_migrate_is_idempotent(self, sqlite_engine):
+        """Test running migrations again changes nothing."""
+        migrate(sqlite_engine)
+
+        assert migrate(sqlite_engine) == LATEST
+        with sqlite_engine.connect() as connection:
+            rows = connection.execute(text("SELECT COUNT(*) FROM schema_version")).scalar()
+        assert rows == len(MIGRATIONS)
+
+    def test_search_index_is_rebuilt_per_user(self, sqlite_engine):
+        """Test a shared full-text index from before migration 9 is replaced."""
+        migrate(sqlite_engine)
+        user_id = seed(sqlite_engine, tasks_per_user=5)
+        with sqlite_engine.begin() as connection:
+            connection.execute(text("DROP TABLE tasks_fts"))
+            connection.execute(text(
+                "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+                "title, description, content='tasks', content_rowid='id')"
+            ))
+            connection.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+            connection.execute(text("DELETE FROM schema_version WHERE version = 9"))
+
+        assert migrate(sqlite_engine) == LATEST
+
+        with Session(sqlite_engine) as session:
+            results = TaskService.search_tasks(session, user_id, "task", limit=20)
+        assert len(results) == 5
+        assert {result["user_id"] for result in results} == {user_id}
+
+    def test_upgrades_pre_migration_database(self, sqlite_engine):
+        """Test a database made by the old create_all is upgraded in place."""
+        with sqlite_engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, "
+                "password_hash VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+                "updated_at DATETIME NOT NULL)"
+            ))
+            connection.execute(text(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, "
+                "description VARCHAR NOT NULL, user_id INTEGER NOT NULL REFERENCES users (id), "
+                "is_complete BOOLEAN NOT NULL, created_at DATETIME NOT NULL, "
+                "updated_at DATETIME NOT NULL)"
+            ))
+            connection.execute(text("CREATE INDEX ix_tasks_user_id ON tasks (user_id)"))
+            connection.execute(text(
+                "INSERT INTO users VALUES (1, 'a@example.com', 'x', '2024-01-01', '2024-01-01')"
+            ))
+            connection.execute(text(
+                "INSERT INTO tasks VALUES (1, 'Old', '', 1, 0, '2024-01-01', '2024-01-01'), "
+                "(2, 'Done', '', 1, 1, '2024-01-01', '2024-01-03')"
+            ))
+            assert current_version(connection) == 0
+
+        migrate(sqlite_engine)
+
+        index_names = {index["name"] for index in inspect(sqlite_engine).get_indexes("tasks")}
+        assert "ix_tasks_user_created" in index_names
+        assert "ix_tasks_user_id" not in index_names
+        user_columns = {column["name"] for column in inspect(sqlite_engine).get_columns("users")}
+        task_columns = {column["name"] for column in inspect(sqlite_engine).get_columns("tasks")}
+        assert {"data_version", "sync_floor"} <= user_columns
+        assert {"priority", "change_seq", "insert_sentinel"} <= task_columns
+        with Session(sqlite_engine) as session:
+            tasks, _cursor = TaskService.get_user_tasks(session, 1)
+            stats = TaskService.get_stats(session, 1, days=3, today=date(2024, 1, 3))
+        assert [task.title for task in tasks] == ["Done", "Old"]
+        # Counters are filled in, and old completions dated by their last update.
+        assert (stats.total, stats.completed) == (2, 1)
+        assert [bucket.completed for bucket in stats.completed_by_day] == [0, 0, 1]
+
+
+class TestSqliteQueryPlans:
+    """EXPLAIN QUERY PLAN checks for the hot queries on SQLite."""
+
+    @pytest.fixture
+    def plans(self, sqlite_engine):
+        migrate(sqlite_engine)
+        user_id = seed(sqlite_engine)
+        with sqlite_engine.connect() as connection:
+            connection.execute(text("ANALYZE"))
+        plans = {}
+        with sqlite_engine.connect() as connection:
+            for name, (statement, parameters) in hot_queries(sqlite_engine, user_id).items():
+                rows = connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).all()
+                plans[name] = " | ".join(row[-1] for row in rows)
+        return plans
+
+    @pytest.mark.parametrize("query", ["list", "page"])
+    def test_list_uses_composite_index_without_sorting(self, plans, query):
+        """Test listing walks ix_tasks_user_created in order."""
+        assert "ix_tasks_user_created" in plans[query]
+        assert "TEMP B-TREE" not in plans[query]
+
+    @pytest.mark.parametrize("query", SORTED_LISTS)
+    def test_sorts_walk_their_index_without_sorting(self, plans, query):
+        """Test every sort mode and status filter reads its index in order."""
+        assert SORTED_LISTS[query][0] in plans[query]
+        assert "TEMP B-TREE" not in plans[query]
+
+    def test_get_uses_primary_key(self, plans):
+        """Test single-task lookups go through the primary key."""
+        assert "INTEGER PRIMARY KEY" in plans["get"]
+
+    def test_status_count_is_covered(self, plans):
+        """Test counting by status never touches the table."""
+        assert "COVERING INDEX ix_tasks_user_status_created" in plans["count_complete"]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"),
+    reason="set TEST_POSTGRES_URL to a scratch PostgreSQL database"
+)
+class TestPostgresQueryPlans:
+    """EXPLAIN checks for the hot queries on PostgreSQL."""
+
+    @pytest.fixture
+    def plans(self):
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        with engine.begin() as connection:
+            connection.execute(text(
+                "DROP TABLE IF EXISTS tasks, users, schema_version CASCADE"
+            ))
+        migrate(engine)
+        user_id = seed(engine)
+        plans = {}
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("ANALYZE"))
+                # Tiny test tables would otherwise be read sequentially.
+                connection.execute(text("SET enable_seqscan = off"))
+                for name, (statement, parameters) in hot_queries(engine, user_id).items():
+                    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+                    plans[name] = "\n".join(row[0] for row in rows)
+        finally:
+            engine.dispose()
+        return plans
+
+    @pytest.mark.parametrize("query", ["list", "page"])
+    def test_list_uses_composite_index_without_sorting(self, plans, query):
+        """Test listing scans ix_tasks_user_created backwards, unsorted."""
+        assert "ix_tasks_user_created" in plans[query]
+        assert "Sort" not in plans[query]
+
+    @pytest.mark.parametrize("query", SORTED_LISTS)
+    def test_sorts_walk_their_index_without_sorting(self, plans, query):
+        """Test every sort mode and status filter scans its index, unsorted."""
+        assert SORTED_LISTS[query][0] in plans[query]
+        assert "Sort" not in plans[query]
+
+    def test_get_uses_primary_key(self, plans):
+        """Test single-task lookups go through the primary key."""
+        assert "tasks_pkey" in plans["get"]
+
+    def test_status_count_uses_index(self, plans):
+        """Test counting by status uses ix_tasks_user_status_created."""
+        assert "ix_tasks_user_status_created" in plans["count_complete"]
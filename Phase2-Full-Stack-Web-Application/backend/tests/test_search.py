@@ -0,0 +1,201 @@
+"""Tests for full-text task search."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src import search
+from src.services import task_service
+from src.search import make_snippet, search_terms
+
+from conftest import signup
+
+
+def create(client, headers, title, description=""):
+    """Create a task and return its id."""
+    response = client.post(
+        "/api/tasks", json={"title": title, "description": description}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def search_titles(client, headers, q, **params):
+    """Search and return the titles of the results in order."""
+    response = client.get("/api/tasks/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [task["title"] for task in response.json()]
+
+
+class TestSearchEndpoint:
+    """Tests for GET /api/tasks/search."""
+
+    def test_every_word_matches_as_prefix(self, client, auth_headers):
+        """Test each query word is a prefix and all of them must match."""
+        create(client, auth_headers, "Buy groceries", "and milk")
+        create(client, auth_headers, "Groceries only")
+
+        assert search_titles(client, auth_headers, "gro mil") == ["Buy groceries"]
+        assert search_titles(client, auth_headers, "GRO") == ["Groceries only", "Buy groceries"]
+
+    def test_title_matches_rank_first(self, client, auth_headers):
+        """Test a match in the title outranks one in the description."""
+        create(client, auth_headers, "Errands", "call the dentist")
+        create(client, auth_headers, "Dentist appointment")
+        create(client, auth_headers, "Unrelated")
+
+        response = client.get(
+            "/api/tasks/search", params={"q": "dentist"}, headers=auth_headers
+        )
+
+        results = response.json()
+        assert [task["title"] for task in results] == ["Dentist appointment", "Errands"]
+        assert results[0]["rank"] > results[1]["rank"]
+        assert results[0]["priority"] == "medium"
+
+    def test_snippet_marks_matches_and_escapes_html(self, client, auth_headers):
+        """Test matched words are marked and task text cannot inject markup."""
+        create(client, auth_headers, "Shopping", "<b>milk</b> & eggs")
+
+        response = client.get("/api/tasks/search", params={"q": "milk"}, headers=auth_headers)
+
+        assert response.json()[0]["snippet"] == (
+            "&lt;b&gt;<mark>milk</mark>&lt;/b&gt; &amp; eggs"
+        )
+
+    def test_diacritics_are_ignored(self, client, auth_headers):
+        """Test an unaccented query finds accented words."""
+        create(client, auth_headers, "Café visit")
+
+        response = client.get("/api/tasks/search", params={"q": "cafe"}, headers=auth_headers)
+
+        assert response.json()[0]["snippet"] == "<mark>Café</mark> visit"
+
+    def test_index_follows_updates_and_deletes(self, client, auth_headers):
+        """Test the index sees edited and deleted tasks straight away."""
+        task_id = create(client, auth_headers, "Water plants")
+        client.put(f"/api/tasks/{task_id}", json={"title": "Feed cat"}, headers=auth_headers)
+
+        assert search_titles(client, auth_headers, "water") == []
+        assert search_titles(client, auth_headers, "feed") == ["Feed cat"]
+
+        client.delete(f"/api/tasks/{task_id}", headers=auth_headers)
+
+        assert search_titles(client, auth_headers, "feed") == []
+
+    def test_batch_created_tasks_are_indexed(self, client, auth_headers):
+        """Test tasks inserted in one statement are searchable too."""
+        client.post(
+            "/api/tasks/batch",
+            json={"tasks": [{"title": "Pack bags"}, {"title": "Pack lunch"}]},
+            headers=auth_headers,
+        )
+
+        assert search_titles(client, auth_headers, "pack") == ["Pack lunch", "Pack bags"]
+
+    def test_only_searches_own_tasks(self, client, auth_headers):
+        """Test another user's matching tasks are never returned."""
+        create(client, signup(client, "other@example.com"), "Secret plan")
+        create(client, auth_headers, "My plan")
+
+        assert search_titles(client, auth_headers, "plan") == ["My plan"]
+
+    def test_limit(self, client, auth_headers):
+        """Test limit caps the number of results."""
+        for i in range(3):
+            create(client, auth_headers, f"Report {i}")
+
+        assert len(search_titles(client, auth_headers, "report", limit=2)) == 2
+
+    def test_query_without_words_finds_nothing(self, client, auth_headers):
+        """Test punctuation and FTS operators are not passed to the database."""
+        create(client, auth_headers, "Anything")
+
+        assert search_titles(client, auth_headers, '"*(^)-') == []
+
+    def test_query_is_required(self, client, auth_headers):
+        """Test a missing or empty query is rejected."""
+        response = client.get("/api/tasks/search", params={"q": ""}, headers=auth_headers)
+
+        assert response.status_code == 422
+
+    def test_ranks_only_newest_candidates(self, client, auth_headers, monkeypatch):
+        """Test ranking considers only the newest SEARCH_CANDIDATES matches."""
+        create(client, auth_headers, "Budget", "budget review")
+        create(client, auth_headers, "Plan", "mention budget")
+        create(client, auth_headers, "Notes", "budget")
+        monkeypatch.setattr(search, "SEARCH_CANDIDATES", 2)
+
+        assert search_titles(client, auth_headers, "budget") == ["Notes", "Plan"]
+
+    def test_skips_matches_deleted_before_loading(self, client, auth_headers, monkeypatch):
+        """Test a match whose task is gone by the second query is left out."""
+        task_id = create(client, auth_headers, "Keep this")
+        ranked_matches = search.ranked_matches
+
+        def with_missing_match(session, user_id, terms, limit):
+            rows = ranked_matches(session, user_id, terms, limit)
+            return [SimpleNamespace(id=task_id + 1, rank=1.0), *rows]
+
+        monkeypatch.setattr(task_service, "ranked_matches", with_missing_match)
+
+        assert search_titles(client, auth_headers, "keep") == ["Keep this"]
+
+    def test_other_users_match_is_not_loaded(self, client, auth_headers, monkeypatch):
+        """Test a match the index wrongly gives the user is dropped on load."""
+        theirs = create(client, signup(client, "other@example.com"), "Their plan")
+        create(client, auth_headers, "My plan")
+        ranked_matches = search.ranked_matches
+
+        def with_foreign_match(session, user_id, terms, limit):
+            rows = ranked_matches(session, user_id, terms, limit)
+            return [SimpleNamespace(id=theirs, rank=1.0), *rows]
+
+        monkeypatch.setattr(task_service, "ranked_matches", with_foreign_match)
+
+        assert search_titles(client, auth_headers, "plan") == ["My plan"]
+
+    def test_substring_fallback(self, client, auth_headers, monkeypatch):
+        """Test databases without a full-text index still search, newest first."""
+        create(client, auth_headers, "Buy groceries")
+        create(client, auth_headers, "Grocery run")
+        monkeypatch.setattr(search, "search_backend", lambda engine: "like")
+
+        response = client.get("/api/tasks/search", params={"q": "gro"}, headers=auth_headers)
+
+        results = response.json()
+        assert [task["title"] for task in results] == ["Grocery run", "Buy groceries"]
+        assert {task["rank"] for task in results} == {0.0}
+        assert results[0]["snippet"] == "<mark>Grocery</mark> run"
+
+
+class TestSnippets:
+    """Tests for search_terms and make_snippet."""
+
+    def test_terms_drop_operators(self):
+        """Test only lower-cased words survive."""
+        assert search_terms('Buy "MILK" OR eggs*') == ["buy", "milk", "or", "eggs"]
+
+    def test_long_text_is_windowed(self):
+        """Test a long description is cut around the first match."""
+        words = [f"w{i}" for i in range(30)]
+        words[20] = "target"
+
+        snippet = make_snippet("Title", " ".join(words), ["target"])
+
+        assert snippet == (
+            "…w18 w19 <mark>target</mark> w21 w22 w23 w24 w25 w26 w27 w28 w29"
+        )
+
+    def test_falls_back_to_title(self):
+        """Test the title is used when the description does not match."""
+        assert make_snippet("Call Bob", "", ["call"]) == "<mark>Call</mark> Bob"
+        assert make_snippet("A < B", None, ["zzz"]) == "A &lt; B"
+
+    @pytest.mark.parametrize("terms, expected", [
+        (["gro", "mil"], "<mark>groceries</mark> and <mark>milk</mark>"),
+        (["and"], "groceries <mark>and</mark> milk"),
+    ])
+    def test_marks_every_match(self, terms, expected):
+        """Test all words starting with any term are marked."""
+        assert make_snippet("T", "groceries and milk", terms) == expected
@@ -0,0 +1,83 @@
+"""Tests for the fast JSON response path."""
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import select
+
+from src import serialization
+from src.models.task import Task, TaskRead, TaskStats
+from src.serialization import dumps
+
+from conftest import signup
+
+
+SAMPLE = [
+    {"title": "Café ☕", "stamp": datetime(2024, 1, 2, 3, 4, 5)},
+    {"title": "x", "stamp": datetime(2024, 1, 2, 3, 4, 5, 60)},
+]
+
+
+def fastapi_body(content) -> bytes:
+    """Encode content the way FastAPI's default JSONResponse does."""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class TestDumps:
+    """Tests for dumps."""
+
+    def test_matches_fastapi_encoding(self):
+        """Test orjson output is byte-identical to FastAPI's encoder."""
+        assert dumps(SAMPLE) == fastapi_body(SAMPLE)
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Test the fallback without orjson produces the same bytes."""
+        expected = dumps(SAMPLE)
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        assert dumps(SAMPLE) == expected
+
+    def test_rejects_unknown_types(self, monkeypatch):
+        """Test unsupported values fail loudly instead of being stringified."""
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+
+class TestTaskListWireFormat:
+    """Tests that the fast list path keeps the documented format."""
+
+    def test_list_body_matches_response_model(self, client, session):
+        """Test GET /api/tasks returns exactly what TaskRead validation gave."""
+        headers = signup(client)
+        for title in ("Ünïcode", "Plain", "Quote \" and \\ slash"):
+            client.post("/api/tasks", json={"title": title}, headers=headers)
+
+        response = client.get("/api/tasks", headers=headers)
+
+        tasks = session.exec(
+            select(Task).order_by(Task.created_at.desc(), Task.id.desc())
+        ).all()
+        expected = [TaskRead.model_validate(task) for task in tasks]
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == fastapi_body(expected)
+
+    def test_model_routes_match_response_model(self, client, session):
+        """Test routes encoding one model return what FastAPI would have."""
+        headers = signup(client)
+
+        created = client.post("/api/tasks", json={"title": "Café ☕"}, headers=headers)
+        toggled = client.patch(f"/api/tasks/{created.json()['id']}/complete", headers=headers)
+        stats = client.get("/api/tasks/stats", params={"days": 2}, headers=headers)
+
+        task = session.exec(select(Task)).one()
+        assert created.status_code == 201
+        assert created.json()["title"] == "Café ☕"
+        assert toggled.content == fastapi_body(TaskRead.model_validate(task).model_dump())
+        assert TaskStats.model_validate_json(stats.content).completed == 1
+        assert stats.content == fastapi_body(TaskStats.model_validate_json(stats.content))
@@ -0,0 +1,179 @@
+"""Tests for the task statistics counters and their reconciliation."""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import select
+
+from src.database import engine
+from src.models.task import Task
+from src.models.user import User
+from src.reconcile import StatsDrift, main, reconcile_all
+from src.services.task_service import TaskService, completion_changes
+
+from conftest import signup
+
+
+def create(client, headers, title="Task"):
+    """Create a task and return its id."""
+    response = client.post("/api/tasks", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def get_stats(client, headers, **params):
+    """Fetch the stats and check the response."""
+    response = client.get("/api/tasks/stats", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestStatsEndpoint:
+    """Tests for GET /api/tasks/stats."""
+
+    def test_new_user(self, client, auth_headers):
+        """Test a user without tasks gets zeros and a bucket per day."""
+        stats = get_stats(client, auth_headers)
+
+        assert (stats["total"], stats["completed"], stats["pending"]) == (0, 0, 0)
+        assert len(stats["completed_by_day"]) == 30
+        assert {bucket["completed"] for bucket in stats["completed_by_day"]} == {0}
+        assert stats["completed_by_day"][-1]["date"] == datetime.utcnow().date().isoformat()
+
+    def test_counts_follow_single_task_changes(self, client, auth_headers):
+        """Test create, toggle, reopen and delete keep the counts right."""
+        ids = [create(client, auth_headers, f"Task {i}") for i in range(4)]
+        for task_id in ids[:3]:
+            client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        client.patch(f"/api/tasks/{ids[0]}/complete", headers=auth_headers)
+        client.delete(f"/api/tasks/{ids[1]}", headers=auth_headers)
+        client.put(f"/api/tasks/{ids[2]}", json={"title": "Renamed"}, headers=auth_headers)
+
+        stats = get_stats(client, auth_headers, days=1)
+
+        assert (stats["total"], stats["completed"], stats["pending"]) == (3, 1, 2)
+        assert [bucket["completed"] for bucket in stats["completed_by_day"]] == [1]
+
+    def test_counts_follow_batches(self, client, auth_headers):
+        """Test batch create, complete, toggle and delete keep the counts right."""
+        response = client.post(
+            "/api/tasks/batch",
+            json={"tasks": [{"title": "A"}, {"title": ""}, {"title": "B"}, {"title": "C"}]},
+            headers=auth_headers,
+        )
+        ids = [item["id"] for item in response.json()["results"] if item["status"] == 201]
+        complete = {"ids": ids[:2], "is_complete": True}
+        client.patch("/api/tasks/batch/complete", json=complete, headers=auth_headers)
+        # Completing them again changes nothing.
+        response = client.patch("/api/tasks/batch/complete", json=complete, headers=auth_headers)
+        assert [item["status"] for item in response.json()["results"]] == [200, 200]
+        client.patch("/api/tasks/batch/complete", json={"ids": ids[1:]}, headers=auth_headers)
+
+        assert get_stats(client, auth_headers, days=1)["completed"] == 2
+
+        client.request("DELETE", "/api/tasks/batch", json={"ids": ids[:2]}, headers=auth_headers)
+
+        stats = get_stats(client, auth_headers, days=1)
+        assert (stats["total"], stats["completed"], stats["pending"]) == (1, 1, 0)
+        assert stats["completed_by_day"] == [
+            {"date": datetime.utcnow().date().isoformat(), "completed": 1}
+        ]
+
+    def test_scoped_to_user(self, client, auth_headers):
+        """Test another user's tasks are not counted."""
+        create(client, signup(client, "other@example.com"))
+
+        assert get_stats(client, auth_headers)["total"] == 0
+
+    @pytest.mark.parametrize("days, status_code", [(7, 200), (0, 422), (367, 422)])
+    def test_days(self, client, auth_headers, days, status_code):
+        """Test days sets the number of buckets, within bounds."""
+        response = client.get(
+            "/api/tasks/stats", params={"days": days}, headers=auth_headers
+        )
+
+        assert response.status_code == status_code
+        if status_code == 200:
+            assert len(response.json()["completed_by_day"]) == days
+
+    def test_completions_land_on_their_day(self, client, auth_headers, session):
+        """Test buckets are keyed by the day the task was completed."""
+        task_id = create(client, auth_headers)
+        client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        user_id = session.exec(select(User)).one().id
+        today = datetime.utcnow().date()
+
+        stats = TaskService.get_stats(session, user_id, days=3, today=today + timedelta(days=1))
+
+        assert [(bucket.date, bucket.completed) for bucket in stats.completed_by_day] == [
+            (today - timedelta(days=1), 0), (today, 1), (today + timedelta(days=1), 0)
+        ]
+
+
+class TestCompletionChanges:
+    """Tests for completion_changes."""
+
+    def row(self, is_complete, day):
+        return SimpleNamespace(is_complete=is_complete, completed_at=datetime(2024, 1, day, 9))
+
+    def test_flipped_rows(self):
+        """Test completions count on their day and reopenings come off theirs."""
+        rows = [self.row(True, 2), self.row(True, 2), self.row(False, 1)]
+
+        assert completion_changes(rows) == {date(2024, 1, 2): 2, date(2024, 1, 1): -1}
+
+    def test_deleted_rows(self):
+        """Test only deleted tasks that were complete count."""
+        rows = [self.row(True, 2), self.row(False, 1)]
+
+        assert completion_changes(rows, deleted=True) == {date(2024, 1, 2): -1}
+
+
+class TestReconcile:
+    """Tests for the statistics reconciliation job."""
+
+    @pytest.fixture
+    def tasks(self, client, auth_headers):
+        """Create a mix of tasks through the API and return their ids."""
+        ids = [create(client, auth_headers, f"Task {i}") for i in range(5)]
+        for task_id in ids[:3]:
+            client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        client.delete(f"/api/tasks/{ids[0]}", headers=auth_headers)
+        return ids
+
+    def test_api_changes_leave_no_drift(self, tasks):
+        """Test counters maintained by the service match a full count."""
+        assert reconcile_all(engine) == []
+
+    def test_finds_and_fixes_drift(self, tasks, client, auth_headers, session):
+        """Test writes that bypass the service are found and repaired."""
+        user = session.exec(select(User)).one()
+        session.add(Task(
+            user_id=user.id, title="Direct", is_complete=True,
+            completed_at=datetime(2024, 1, 2, 12)
+        ))
+        session.exec(update(Task).where(Task.id == tasks[1]).values(is_complete=False))
+        session.commit()
+
+        # The completed count still adds up; the tasks behind it do not.
+        assert reconcile_all(engine) == [
+            StatsDrift(user.id, "task_count", 4, 5),
+            StatsDrift(user.id, "completed on 2024-01-02", 0, 1),
+            StatsDrift(user.id, f"completed on {datetime.utcnow().date()}", 2, 1),
+        ]
+
+        assert len(reconcile_all(engine, fix=True, batch_size=1)) == 3
+        assert reconcile_all(engine) == []
+        stats = get_stats(client, auth_headers, days=1)
+        assert (stats["total"], stats["completed"]) == (5, 2)
+
+    def test_command_exit_status(self, tasks, session, capsys):
+        """Test the command exits non-zero while drift exists."""
+        session.exec(update(User).values(task_count=0))
+        session.commit()
+
+        assert main(["--fix"]) == 1
+        assert "task_count is 0, counted 4" in capsys.readouterr().out
+        assert main([]) == 0
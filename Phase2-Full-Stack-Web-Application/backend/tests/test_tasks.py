@@ -0,0 +1,553 @@
+"""Tests for the task routes."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from src.database import engine
+from src.models.task import Task, TaskCreate, TaskUpdate
+from src.models.user import User
+from src.pagination import decode_cursor, encode_cursor
+from src.services.task_service import TaskService
+
+from conftest import app_engine, captured_sql, signup
+
+
+def create_tasks(client, headers, count):
+    """Create ``count`` tasks through the API and return their IDs."""
+    return [
+        client.post("/api/tasks", json={"title": f"Task {i}"}, headers=headers).json()["id"]
+        for i in range(count)
+    ]
+
+
+class TestTaskCrud:
+    """Tests for the basic task routes."""
+
+    def test_create_update_toggle_delete(self, client, auth_headers):
+        """Test a task's full life cycle."""
+        created = client.post(
+            "/api/tasks", json={"title": "Buy milk", "description": "2L"}, headers=auth_headers
+        )
+        assert created.status_code == 201
+        task_id = created.json()["id"]
+
+        updated = client.put(
+            f"/api/tasks/{task_id}", json={"title": "Buy oat milk"}, headers=auth_headers
+        )
+        assert updated.json()["title"] == "Buy oat milk"
+        assert updated.json()["description"] == "2L"
+
+        toggled = client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+        assert toggled.json()["is_complete"] is True
+
+        assert client.delete(f"/api/tasks/{task_id}", headers=auth_headers).status_code == 200
+        assert client.get("/api/tasks", headers=auth_headers).json() == []
+
+    def test_tasks_are_scoped_to_user(self, client, auth_headers):
+        """Test users cannot see or change each other's tasks."""
+        task_id = create_tasks(client, auth_headers, 1)[0]
+        other = signup(client, "other@example.com")
+
+        assert client.get("/api/tasks", headers=other).json() == []
+        assert client.delete(f"/api/tasks/{task_id}", headers=other).status_code == 404
+
+    def test_requires_authentication(self, client):
+        """Test task routes reject anonymous requests."""
+        assert client.get("/api/tasks").status_code in (401, 403)
+
+
+class TestTaskPagination:
+    """Tests for keyset pagination of GET /api/tasks."""
+
+    def test_without_limit_returns_everything_newest_first(self, client, auth_headers):
+        """Test the unpaginated list is unchanged apart from its tie-break."""
+        ids = create_tasks(client, auth_headers, 5)
+
+        response = client.get("/api/tasks", headers=auth_headers)
+
+        assert [t["id"] for t in response.json()] == ids[::-1]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_pages_cover_every_task_once(self, client, auth_headers):
+        """Test following cursors visits every task exactly once, in order."""
+        ids = create_tasks(client, auth_headers, 7)
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/tasks", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            page = [t["id"] for t in response.json()]
+            assert len(page) <= 3
+            seen.extend(page)
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert seen == ids[::-1]
+        assert pages == 3
+
+    def test_exact_final_page_has_no_cursor(self, client, auth_headers):
+        """Test no cursor is sent when the last page is exactly full."""
+        create_tasks(client, auth_headers, 2)
+
+        response = client.get("/api/tasks", params={"limit": 2}, headers=auth_headers)
+
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_tasks_with_equal_timestamps_are_not_skipped(self, client, auth_headers, session):
+        """Test the ID tie-break keeps pages stable for identical created_at."""
+        user_id = session.exec(select(User)).one().id
+        stamp = datetime(2024, 1, 1, 12, 0, 0)
+        session.add_all(
+            Task(user_id=user_id, title=f"Same {i}", created_at=stamp, updated_at=stamp)
+            for i in range(5)
+        )
+        session.commit()
+
+        first = client.get("/api/tasks", params={"limit": 2}, headers=auth_headers)
+        rest = client.get(
+            "/api/tasks",
+            params={"cursor": first.headers["X-Next-Cursor"]},
+            headers=auth_headers
+        )
+
+        ids = [t["id"] for t in first.json() + rest.json()]
+        assert ids == [5, 4, 3, 2, 1]
+
+    def test_invalid_cursor(self, client, auth_headers):
+        """Test malformed cursors are rejected with 400."""
+        response = client.get(
+            "/api/tasks", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_limit_bounds(self, client, auth_headers):
+        """Test page sizes outside 1..500 are rejected."""
+        for limit in (0, 501):
+            response = client.get("/api/tasks", params={"limit": limit}, headers=auth_headers)
+            assert response.status_code == 422
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the values they were built from."""
+        stamp = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+        assert decode_cursor(encode_cursor(stamp, 42)) == (stamp, 42)
+        assert decode_cursor(encode_cursor(stamp + timedelta(days=1), 1))[1] == 1
+        assert decode_cursor(
+            encode_cursor(2, stamp, 7, sort="priority", order="asc"), "priority", "asc"
+        ) == (2, stamp, 7)
+
+
+class TestTaskFilters:
+    """Tests for filtering, searching and sorting GET /api/tasks."""
+
+    @pytest.fixture
+    def titles(self, client, auth_headers, session):
+        """Seed four tasks and return a function mapping a response to titles."""
+        user_id = session.exec(select(User)).one().id
+        stamp = datetime(2024, 1, 1, 12, 0, 0)
+        seeds = [
+            ("banana", "", 2, True),
+            ("Apple pie", "with 100% butter", 0, False),
+            ("cherry", "", 2, False),
+            ("date_fruit", "", 1, True),
+        ]
+        session.add_all(
+            Task(
+                user_id=user_id, title=title, description=description, priority=priority,
+                is_complete=done, created_at=stamp + timedelta(minutes=i), updated_at=stamp
+            )
+            for i, (title, description, priority, done) in enumerate(seeds)
+        )
+        session.commit()
+
+        def fetch(**params):
+            response = client.get("/api/tasks", params=params, headers=auth_headers)
+            assert response.status_code == 200, response.text
+            return [task["title"] for task in response.json()]
+
+        return fetch
+
+    @pytest.mark.parametrize("status, expected", [
+        ("pending", ["cherry", "Apple pie"]),
+        ("completed", ["date_fruit", "banana"]),
+        ("all", ["date_fruit", "cherry", "Apple pie", "banana"]),
+    ])
+    def test_status_filter(self, titles, status, expected):
+        """Test status keeps only pending or completed tasks."""
+        assert titles(status=status) == expected
+
+    @pytest.mark.parametrize("q, expected", [
+        ("APPLE", ["Apple pie"]),
+        ("butter", ["Apple pie"]),
+        ("%", ["Apple pie"]),
+        ("_", ["date_fruit"]),
+        ("missing", []),
+    ])
+    def test_search(self, titles, q, expected):
+        """Test q matches title or description, ignoring case and wildcards."""
+        assert titles(q=q) == expected
+
+    @pytest.mark.parametrize("sort, order, expected", [
+        ("date", None, ["date_fruit", "cherry", "Apple pie", "banana"]),
+        ("date", "asc", ["banana", "Apple pie", "cherry", "date_fruit"]),
+        ("priority", None, ["cherry", "banana", "date_fruit", "Apple pie"]),
+        ("priority", "asc", ["Apple pie", "date_fruit", "banana", "cherry"]),
+        ("title", None, ["Apple pie", "banana", "cherry", "date_fruit"]),
+        ("title", "desc", ["date_fruit", "cherry", "banana", "Apple pie"]),
+    ])
+    def test_sorts_and_their_pages(self, titles, client, auth_headers, sort, order, expected):
+        """Test each sort's order, and that its cursors page through it exactly."""
+        params = {"sort": sort, **({"order": order} if order else {})}
+        assert titles(**params) == expected
+
+        seen, cursor = [], None
+        while True:
+            page_params = {**params, "limit": 1, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/api/tasks", params=page_params, headers=auth_headers)
+            seen.extend(task["title"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        assert seen == expected
+
+    def test_filters_combine(self, titles):
+        """Test status, search and sort apply together."""
+        assert titles(status="pending", q="e", sort="title") == ["Apple pie", "cherry"]
+
+    def test_cursor_is_tied_to_its_sort(self, titles, client, auth_headers):
+        """Test a cursor from one sort or order is rejected by another."""
+        first = client.get("/api/tasks", params={"limit": 1}, headers=auth_headers)
+        cursor = first.headers["X-Next-Cursor"]
+
+        for params in ({"sort": "title"}, {"order": "asc"}):
+            response = client.get(
+                "/api/tasks", params={"cursor": cursor, **params}, headers=auth_headers
+            )
+            assert response.status_code == 400
+
+    def test_unknown_values_are_rejected(self, client, auth_headers):
+        """Test unsupported status, sort and order values get 422."""
+        for params in ({"status": "done"}, {"sort": "due_date"}, {"order": "up"}):
+            response = client.get("/api/tasks", params=params, headers=auth_headers)
+            assert response.status_code == 422
+
+    def test_priority_round_trip(self, client, auth_headers):
+        """Test priorities are set, changed and returned by name."""
+        created = client.post(
+            "/api/tasks", json={"title": "Urgent", "priority": "high"}, headers=auth_headers
+        ).json()
+        default = client.post("/api/tasks", json={"title": "Normal"}, headers=auth_headers).json()
+        updated = client.put(
+            f"/api/tasks/{created['id']}", json={"priority": "low"}, headers=auth_headers
+        ).json()
+        invalid = client.post(
+            "/api/tasks", json={"title": "Bad", "priority": "urgent"}, headers=auth_headers
+        )
+
+        assert (created["priority"], default["priority"], updated["priority"]) == (
+            "high", "medium", "low"
+        )
+        assert invalid.status_code == 422
+
+
+class TestTaskListEtag:
+    """Tests for conditional GETs of the task list."""
+
+    def etag(self, client, headers):
+        return client.get("/api/tasks", headers=headers).headers["ETag"]
+
+    def test_unchanged_list_is_not_modified(self, client, auth_headers):
+        """Test a matching If-None-Match gets an empty 304 without reading tasks."""
+        create_tasks(client, auth_headers, 3)
+        etag = self.etag(client, auth_headers)
+
+        with captured_sql() as sql:
+            response = client.get(
+                "/api/tasks", headers={**auth_headers, "If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert not [statement for statement, _ in sql if "FROM tasks" in statement]
+
+    def test_every_change_bumps_the_etag(self, client, auth_headers):
+        """Test each kind of mutation produces a new ETag."""
+        task_id = create_tasks(client, auth_headers, 1)[0]
+        changes = [
+            lambda: client.post("/api/tasks", json={"title": "New"}, headers=auth_headers),
+            lambda: client.put(
+                f"/api/tasks/{task_id}", json={"title": "Renamed"}, headers=auth_headers
+            ),
+            lambda: client.patch(f"/api/tasks/{task_id}/complete", headers=auth_headers),
+            lambda: client.patch(
+                "/api/tasks/batch/complete", json={"ids": [task_id]}, headers=auth_headers
+            ),
+            lambda: client.delete(f"/api/tasks/{task_id}", headers=auth_headers),
+        ]
+        etags = [self.etag(client, auth_headers)]
+        for change in changes:
+            change()
+            etags.append(self.etag(client, auth_headers))
+
+        assert len(set(etags)) == len(etags)
+
+    def test_no_op_and_other_users_keep_the_etag(self, client, auth_headers):
+        """Test 404 mutations and other users' changes leave the ETag alone."""
+        etag = self.etag(client, auth_headers)
+        other = signup(client, "other@example.com")
+
+        client.patch("/api/tasks/999/complete", headers=auth_headers)
+        client.request("DELETE", "/api/tasks/batch", json={"ids": [999]}, headers=auth_headers)
+        create_tasks(client, other, 2)
+
+        assert self.etag(client, auth_headers) == etag
+
+    @pytest.mark.parametrize("header", ['"x", {etag}', "W/{etag}", "*"])
+    def test_if_none_match_forms(self, client, auth_headers, header):
+        """Test lists of ETags, weak ETags and * all match."""
+        etag = self.etag(client, auth_headers)
+
+        response = client.get(
+            "/api/tasks", headers={**auth_headers, "If-None-Match": header.format(etag=etag)}
+        )
+
+        assert response.status_code == 304
+
+
+class TestTaskBatch:
+    """Tests for the batch task routes."""
+
+    def test_batch_create_is_one_insert(self, client, auth_headers):
+        """Test valid items are inserted together and invalid ones reported."""
+        items = [{"title": f"Task {i}"} for i in range(20)] + [{"title": "  "}]
+
+        with captured_sql() as sql:
+            response = client.post(
+                "/api/tasks/batch", json={"tasks": items}, headers=auth_headers
+            )
+
+        results = response.json()["results"]
+        assert response.status_code == 200
+        assert [r["status"] for r in results] == [201] * 20 + [400]
+        assert results[-1]["error"] == "Title is required"
+        assert results[3]["task"]["title"] == "Task 3"
+        inserts = [statement for statement, _ in sql if statement.startswith("INSERT INTO tasks")]
+        assert len(inserts) == 1
+        listed = client.get("/api/tasks", headers=auth_headers).json()
+        assert len(listed) == 20
+
+    def test_batch_complete_sets_and_toggles(self, client, auth_headers):
+        """Test one UPDATE marks found tasks and reports missing ones."""
+        ids = create_tasks(client, auth_headers, 3)
+
+        with captured_sql() as sql:
+            response = client.patch(
+                "/api/tasks/batch/complete",
+                json={"ids": [ids[0], 999, ids[1], ids[0]], "is_complete": True},
+                headers=auth_headers
+            )
+
+        results = response.json()["results"]
+        assert [(r["id"], r["status"]) for r in results] == [
+            (ids[0], 200), (999, 404), (ids[1], 200)
+        ]
+        assert all(r["task"]["is_complete"] for r in results if r["status"] == 200)
+        assert len([s for s, _ in sql if s.startswith("UPDATE tasks")]) == 1
+
+        toggled = client.patch(
+            "/api/tasks/batch/complete", json={"ids": ids}, headers=auth_headers
+        ).json()["results"]
+        assert [r["task"]["is_complete"] for r in toggled] == [False, False, True]
+
+    def test_batch_delete(self, client, auth_headers):
+        """Test deleting several tasks reports each one."""
+        ids = create_tasks(client, auth_headers, 3)
+
+        response = client.request(
+            "DELETE", "/api/tasks/batch", json={"ids": [ids[0], ids[2], 999]},
+            headers=auth_headers
+        )
+
+        assert [r["status"] for r in response.json()["results"]] == [200, 200, 404]
+        remaining = client.get("/api/tasks", headers=auth_headers).json()
+        assert [t["id"] for t in remaining] == [ids[1]]
+
+    def test_batch_is_scoped_to_user(self, client, auth_headers):
+        """Test batches cannot touch another user's tasks."""
+        ids = create_tasks(client, auth_headers, 2)
+        other = signup(client, "other@example.com")
+
+        completed = client.patch(
+            "/api/tasks/batch/complete", json={"ids": ids}, headers=other
+        ).json()["results"]
+        deleted = client.request(
+            "DELETE", "/api/tasks/batch", json={"ids": ids}, headers=other
+        ).json()["results"]
+
+        assert {r["status"] for r in completed + deleted} == {404}
+        assert len(client.get("/api/tasks", headers=auth_headers).json()) == 2
+
+    def test_multi_get(self, client, auth_headers):
+        """Test ?ids= returns just the requested tasks that exist."""
+        ids = create_tasks(client, auth_headers, 4)
+
+        response = client.get(
+            "/api/tasks", params={"ids": f"{ids[1]},{ids[3]},999"}, headers=auth_headers
+        )
+
+        assert [t["id"] for t in response.json()] == [ids[3], ids[1]]
+        bad = client.get("/api/tasks", params={"ids": "1,x"}, headers=auth_headers)
+        assert bad.status_code == 400
+
+    def test_batch_limits(self, client, auth_headers, monkeypatch):
+        """Test empty and oversized batches are rejected."""
+        from src.routers import tasks as tasks_router
+        monkeypatch.setattr(tasks_router.settings, "batch_max_items", 2)
+
+        empty = client.post("/api/tasks/batch", json={"tasks": []}, headers=auth_headers)
+        large = client.request(
+            "DELETE", "/api/tasks/batch", json={"ids": [1, 2, 3]}, headers=auth_headers
+        )
+
+        assert empty.status_code == 422
+        assert large.status_code == 400
+
+    def test_fallback_without_returning(self, client, auth_headers, monkeypatch):
+        """Test batches still work on databases without RETURNING."""
+        dialect = app_engine().dialect
+        for flag in ("insert_returning", "update_returning", "delete_returning"):
+            monkeypatch.setattr(dialect, flag, False)
+
+        created = client.post(
+            "/api/tasks/batch", json={"tasks": [{"title": "A"}, {"title": "B"}]},
+            headers=auth_headers
+        ).json()["results"]
+        ids = [r["id"] for r in created]
+        completed = client.patch(
+            "/api/tasks/batch/complete", json={"ids": ids}, headers=auth_headers
+        ).json()["results"]
+        deleted = client.request(
+            "DELETE", "/api/tasks/batch", json={"ids": ids + [999]}, headers=auth_headers
+        ).json()["results"]
+
+        assert [r["task"]["title"] for r in created] == ["A", "B"]
+        assert all(r["task"]["is_complete"] for r in completed)
+        assert [r["status"] for r in deleted] == [200, 200, 404]
+
+
+class TestSingleStatementMutations:
+    """Tests that each mutation is one atomic statement."""
+
+    @pytest.fixture
+    def user_id(self, auth_headers, session):
+        return session.exec(select(User)).one().id
+
+    def count_statements(self, call) -> tuple[object, list[str]]:
+        with captured_sql(engine) as sql:
+            result = call()
+        return result, [statement.split()[0] for statement, _ in sql]
+
+    def test_one_statement_per_mutation(self, session, user_id):
+        """Test create, update, toggle and delete each write with one statement."""
+        task, created = self.count_statements(
+            lambda: TaskService.create_task(session, user_id, TaskCreate(title="One"))
+        )
+        updated_task, updated = self.count_statements(
+            lambda: TaskService.update_task(session, task.id, user_id, TaskUpdate(title="Two"))
+        )
+        toggled_task, toggled = self.count_statements(
+            lambda: TaskService.toggle_complete(session, task.id, user_id)
+        )
+        deleted_ok, deleted = self.count_statements(
+            lambda: TaskService.delete_task(session, task.id, user_id)
+        )
+
+        # Each write is followed by the user's data version and counters
+        # bump and, when a completion changes, an upsert of its day bucket.
+        # A delete also leaves a tombstone for delta sync.
+        assert (created, updated, toggled, deleted) == (
+            ["INSERT", "UPDATE"],
+            ["UPDATE", "UPDATE"],
+            ["UPDATE", "UPDATE", "INSERT"],
+            ["DELETE", "INSERT", "UPDATE", "INSERT"],
+        )
+        assert updated_task.title == "Two"
+        assert toggled_task.is_complete is True
+        assert deleted_ok is True
+
+    def test_missing_task_is_one_statement(self, session, user_id):
+        """Test mutations of unknown tasks report them without extra queries."""
+        result, sql = self.count_statements(
+            lambda: TaskService.toggle_complete(session, 999, user_id)
+        )
+
+        assert result is None
+        assert sql == ["UPDATE"]
+        assert TaskService.delete_task(session, 999, user_id) is False
+
+    def test_fallback_without_returning(self, session, user_id, monkeypatch):
+        """Test backends without RETURNING write then read in one transaction."""
+        for flag in ("insert_returning", "update_returning"):
+            monkeypatch.setattr(engine.dialect, flag, False)
+
+        task = TaskService.create_task(session, user_id, TaskCreate(title="One"))
+        toggled, sql = self.count_statements(
+            lambda: TaskService.toggle_complete(session, task.id, user_id)
+        )
+
+        assert task.id is not None
+        assert toggled.is_complete is True
+        assert sql == ["UPDATE", "SELECT", "UPDATE", "INSERT"]
+
+    def test_deletes_lock_the_user_first(self, session, user_id, monkeypatch):
+        """Test deletes read the user's row before touching task rows.
+        
+        Stands in for a database with row locks, where the SELECT is ``FOR
+        UPDATE``: every write then locks the user before its tasks.
+        """
+        ids = [
+            TaskService.create_task(session, user_id, TaskCreate(title=title)).id
+            for title in ("One", "Two", "Three")
+        ]
+        monkeypatch.setattr(engine.dialect, "name", "postgresql")
+
+        deleted, single = self.count_statements(
+            lambda: TaskService.delete_task(session, ids[0], user_id)
+        )
+        results, batch = self.count_statements(
+            lambda: TaskService.delete_many(session, user_id, ids[1:])
+        )
+
+        assert deleted is True
+        assert [r.status for r in results] == [200, 200]
+        assert single == batch == ["SELECT", "DELETE", "INSERT", "UPDATE"]
+        assert session.exec(select(User.data_version).where(User.id == user_id)).one() == 5
+
+    def test_concurrent_toggles_are_not_lost(self, session, user_id):
+        """Test an even number of concurrent toggles leaves the task as it was."""
+        task = TaskService.create_task(session, user_id, TaskCreate(title="Racy"))
+
+        def toggle_many():
+            with Session(engine) as own_session:
+                for _ in range(10):
+                    TaskService.toggle_complete(own_session, task.id, user_id)
+
+        threads = [threading.Thread(target=toggle_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert TaskService.get_task(session, task.id, user_id).is_complete is False